@@ -52,6 +52,10 @@ This API provides core features to your charm, including:
 
 from __future__ import annotations
 
+import importlib as _importlib
+import typing as _typing
+from typing import Literal as _Literal
+
 # The "from .X import Y" imports below don't explicitly tell Pyright (or MyPy)
 # that those symbols are part of the public API, so we have to add __all__.
 __all__ = [  # noqa: RUF022 `__all__` is not sorted
@@ -194,9 +198,6 @@ __all__ = [  # noqa: RUF022 `__all__` is not sorted
 # just skip it for this file.
 # isort:skip_file
 
-# Import pebble explicitly. It's the one module we don't import names from below.
-from . import pebble
-
 # Also import charm explicitly. This is not strictly necessary as the
 # "from .charm" import automatically does that, but be explicit since this
 # import was here previously
@@ -345,19 +346,56 @@ from .model import (
 
 from .version import version as __version__
 
-try:
-    # Note that ops_tracing vendors charm libs that depend on ops.
-    # We import it last, after all re-exported symbols.
-    import ops_tracing as tracing
-except ImportError:
-    tracing = None
+if _typing.TYPE_CHECKING:
+    # At runtime, these are imported on first use by __getattr__ below.
+    from . import pebble
+
+    try:
+        import ops_tracing as tracing
+    except ImportError:
+        tracing = None
+
+
+def __getattr__(name: str) -> _typing.Any:
+    # Pebble and tracing are slow to import, and many dispatches don't need
+    # them, so they're imported the first time that ops.pebble or ops.tracing
+    # is used.
+    if name == 'pebble':
+        module = _importlib.import_module('ops.pebble')
+    elif name == 'tracing':
+        try:
+            # Note that ops_tracing vendors charm libs that depend on ops.
+            import ops_tracing as module
+        except ImportError:
+            module = None
+        else:
+            # A dispatch that didn't need tracing at the start needs it now.
+            _main.setup_deferred_tracing(module)
+    else:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    globals()[name] = module
+    return module
 
 
 class _Main:
     def __call__(
-        self, charm_class: type[charm.CharmBase], use_juju_for_storage: bool | None = None
+        self,
+        charm_class: type[charm.CharmBase],
+        use_juju_for_storage: bool | None = None,
+        *,
+        storage_profile: _Literal['default', 'performance'] = 'default',
+        background_logging: bool = False,
+        buffer_relation_data: bool = False,
+        defer_status: bool = False,
     ):
-        return _main.main(charm_class=charm_class, use_juju_for_storage=use_juju_for_storage)
+        return _main.main(
+            charm_class=charm_class,
+            use_juju_for_storage=use_juju_for_storage,
+            storage_profile=storage_profile,
+            background_logging=background_logging,
+            buffer_relation_data=buffer_relation_data,
+            defer_status=defer_status,
+        )
 
     def main(self, charm_class: type[charm.CharmBase], use_juju_for_storage: bool | None = None):
         return _legacy_main.main(
@@ -386,4 +424,28 @@ Args:
         Podspec charms that haven't previously used local storage and that
         are running on a new enough Juju default to controller-side storage,
         and local storage otherwise.
+    storage_profile: how to configure local storage. With ``'performance'``,
+        the local database uses write-ahead logging, which makes committing
+        the charm's state at the end of each event much cheaper on slow disks,
+        and is compacted on upgrade-charm. Committed state survives the charm
+        process being killed, but the most recent changes may be lost if the
+        machine loses power.
+    background_logging: whether to send logs to juju-log from a background
+        thread, combining consecutive logs at the same level into one
+        multi-line message. This avoids running a juju-log process for each
+        log record. Logs are written out when the event has been handled, so
+        may be lost if the charm process is killed.
+    buffer_relation_data: whether to collect changes to relation data and
+        write them when the framework commits, with one ``relation-set`` for
+        each databag, rather than one for each change. Writes are still
+        checked when they are made, and reads of the charm's own databags give
+        the buffered values. Changes to a relation that's gone away by the time
+        they're written are logged and dropped. Use
+        :meth:`Model.flush_relation_data` to write the changes sooner.
+    defer_status: whether to set the unit and app status only once, when the
+        framework commits, using the last status that the charm set, rather
+        than every time the status is changed. If the charm read the status
+        earlier in the dispatch, the status isn't set at all when it's
+        unchanged; otherwise it's always set.
+        Use :meth:`Model.flush_status` to set the status sooner.
 """
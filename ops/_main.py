@@ -16,6 +16,7 @@
 
 from __future__ import annotations
 
+import contextlib
 import logging
 import os
 import shutil
@@ -23,7 +24,7 @@ import subprocess
 import sys
 import warnings
 from pathlib import Path
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, Literal, cast
 
 import opentelemetry.trace
 
@@ -31,15 +32,56 @@ from . import charm as _charm
 from . import framework as _framework
 from . import model as _model
 from . import storage as _storage
-from ._private import tracer
+from ._private import loaded_tracing, tracer
 from .jujucontext import JujuContext
-from .log import setup_root_logging
+from .log import JujuLogHandler, setup_root_logging
 from .version import version
 
+if TYPE_CHECKING:
+    from ._private.profiler import DispatchProfiler
+
 CHARM_STATE_FILE = '.unit-state.db'
+CHARM_META_CACHE_FILE = '.unit-meta.pickle'
+TRACING_BUFFER_FILE = '.tracing-data.db'  # The BUFFER_FILENAME of ops_tracing.
+
+PROFILE_ENV = 'JUJU_OPS_PROFILE'
+"""If this environment variable is set to a non-empty value, dispatches are profiled."""
+
+PROFILE_FILE = '.unit-profile.json'
+"""The name of the file, in the charm directory, that the last profile is written to."""
 
 logger = logging.getLogger()
 
+_deferred_tracing_setup: tuple[JujuContext, str] | None = None
+"""The arguments for setting up tracing once the charm uses ops.tracing, if deferred."""
+
+
+def _tracing_in_use(charm_dir: Path) -> bool:
+    """Whether to set up tracing at the start of the dispatch.
+
+    ops_tracing is slow to import, so it's only imported up front if something
+    has already imported it, or if an earlier dispatch buffered trace data.
+    Otherwise, tracing is set up when the charm first uses ops.tracing. The
+    root span has already started by then and isn't recorded, so in that
+    first dispatch the spans from before that point are lost, and the later
+    ones have no parent. Later dispatches find the buffer and trace it all.
+    """
+    return (
+        'tracing' in vars(sys.modules['ops'])
+        or 'ops_tracing' in sys.modules
+        or (charm_dir / TRACING_BUFFER_FILE).exists()
+    )
+
+
+def setup_deferred_tracing(tracing: Any) -> None:
+    """Set up tracing, if ops.main deferred that until ops.tracing was first used."""
+    global _deferred_tracing_setup
+    if _deferred_tracing_setup is None or not tracing:
+        return
+    juju_context, charm_class_name = _deferred_tracing_setup
+    _deferred_tracing_setup = None
+    tracing._setup(juju_context, charm_class_name)
+
 
 def _exe_path(path: Path) -> Path | None:
     """Find and return the full path to the given binary.
@@ -280,8 +322,19 @@ class _Manager:
         use_juju_for_storage: bool | None = None,
         charm_state_path: str = CHARM_STATE_FILE,
         juju_context: JujuContext | None = None,
+        storage_profile: Literal['default', 'performance'] = 'default',
+        background_logging: bool = False,
+        buffer_relation_data: bool = False,
+        defer_status: bool = False,
     ):
-        from . import tracing  # break circular import
+        global _deferred_tracing_setup
+
+        self._profiler: DispatchProfiler | None = None
+        if os.environ.get(PROFILE_ENV):
+            # Only imported when profiling, as it loads cProfile and pstats.
+            from ._private.profiler import DispatchProfiler
+
+            self._profiler = DispatchProfiler()
 
         if juju_context is None:
             juju_context = JujuContext._from_dict(os.environ)
@@ -292,41 +345,65 @@ class _Manager:
             name = str(charm_class)
 
         self._juju_context = juju_context
-        if tracing:
-            tracing._setup(juju_context, name)
+        if _tracing_in_use(juju_context.charm_dir):
+            from . import tracing  # break circular import
+
+            if tracing:
+                tracing._setup(juju_context, name)
+        else:
+            _deferred_tracing_setup = (juju_context, name)
         self._tracing_context = tracer.start_as_current_span('ops.main')
-        self._tracing_context.__enter__()
+        self._span = self._tracing_context.__enter__()
         self._charm_state_path = charm_state_path
         self._charm_class = charm_class
         if model_backend is None:
             model_backend = _model._ModelBackend(juju_context=self._juju_context)
+        model_backend._buffer_relation_data = buffer_relation_data
+        model_backend._defer_status = defer_status
         self._model_backend = model_backend
 
         # Do this as early as possible to be sure to catch the most logs.
+        self._background_logging = background_logging
+        self._juju_log_handler: JujuLogHandler | None = None
         self._setup_root_logging()
 
         self._charm_root = self._juju_context.charm_dir
-        self._charm_meta = self._load_charm_meta()
+        # Set up dispatcher, metadata, framework and charm objects.
+        self.dispatcher = _Dispatcher(self._charm_root, self._juju_context)
+        with self._phase('meta'):
+            self._charm_meta = self._load_charm_meta()
         self._use_juju_for_storage = use_juju_for_storage
+        self._storage_profile: Literal['default', 'performance'] = storage_profile
 
-        # Set up dispatcher, framework and charm objects.
-        self.dispatcher = _Dispatcher(self._charm_root, self._juju_context)
         self.dispatcher.run_any_legacy_hook()
 
         self.framework = self._make_framework(self.dispatcher)
-        with self.framework._event_context('__init__'):
+        with self._phase('charm_init'), self.framework._event_context('__init__'):
             self.charm = self._charm_class(self.framework)
 
+    def _phase(self, name: str) -> contextlib.AbstractContextManager[None]:
+        """Time a phase of the dispatch, if profiling."""
+        if self._profiler is None:
+            return contextlib.nullcontext()
+        return self._profiler.phase(name)
+
     def _load_charm_meta(self):
-        return _charm.CharmMeta.from_charm_root(self._charm_root)
+        cache_path = self._charm_root / CHARM_META_CACHE_FILE
+        if self.dispatcher.event_name == 'upgrade_charm':
+            # The charm's files have been replaced, so always parse them again.
+            cache_path.unlink(missing_ok=True)
+        return _charm.CharmMeta.from_charm_root(self._charm_root, cache_path=cache_path)
 
     def _setup_root_logging(self):
         # For actions, there is a communication channel with the user running the
         # action, so we want to send exception details through stderr, rather than
         # only to juju-log as normal.
         handling_action = self._juju_context.action_name is not None
-        setup_root_logging(
-            self._model_backend, debug=self._juju_context.debug, exc_stderr=handling_action
+        self._juju_log_handler = setup_root_logging(
+            self._model_backend,
+            debug=self._juju_context.debug,
+            exc_stderr=handling_action,
+            background=self._background_logging,
         )
 
         logger.debug('ops %s up and running.', version)
@@ -367,7 +444,9 @@ class _Manager:
         if self._use_juju_for_storage:
             store = _storage.JujuStorage()
         else:
-            store = _storage.SQLiteStorage(charm_state_path)
+            store = _storage.SQLiteStorage(charm_state_path, profile=self._storage_profile)
+            if self._storage_profile == 'performance' and dispatcher.event_name == 'upgrade_charm':
+                store.compact()
         return store
 
     def _make_framework(self, dispatcher: _Dispatcher):
@@ -398,15 +477,17 @@ class _Manager:
             broken_relation_id=broken_relation_id,
             remote_unit_name=remote_unit_name,
         )
-        store = self._make_storage(dispatcher)
-        framework = self._framework_class(
-            store,
-            self._charm_root,
-            self._charm_meta,
-            model,
-            event_name=dispatcher.event_name,
-            juju_debug_at=self._juju_context.debug_at,
-        )
+        with self._phase('storage'):
+            store = self._make_storage(dispatcher)
+        with self._phase('framework'):
+            framework = self._framework_class(
+                store,
+                self._charm_root,
+                self._charm_meta,
+                model,
+                event_name=dispatcher.event_name,
+                juju_debug_at=self._juju_context.debug_at,
+            )
         framework.set_breakpointhook()
         return framework
 
@@ -420,15 +501,18 @@ class _Manager:
         # they do not have the full access to all hook commands.
         if not self.dispatcher.is_restricted_context():
             # Re-emit any deferred events from the previous run.
-            self.framework.reemit()
+            with self._phase('reemit'):
+                self.framework.reemit()
 
         # Emit the Juju event.
-        self._emit_charm_event(self.dispatcher.event_name)
+        with self._phase('emit'):
+            self._emit_charm_event(self.dispatcher.event_name)
         # Emit collect-status events. In a restricted context, we can't run
         # is-leader, so can't do the full evaluation. Skip it rather than
         # only running the unit status.
         if not self.dispatcher.is_restricted_context():
-            _charm._evaluate_status(self.charm)
+            with self._phase('collect_status'):
+                _charm._evaluate_status(self.charm)
 
     def _get_event_to_emit(self, event_name: str) -> _framework.BoundEvent | None:
         try:
@@ -463,15 +547,23 @@ class _Manager:
         logger.debug('Emitting Juju event %s.', event_name)
         # If tracing is set up, log the trace id so that tools like jhack can pick it up.
         # If tracing is not set up, span is non-recording and trace is zero.
-        trace_id = opentelemetry.trace.get_current_span().get_span_context().trace_id
-        if trace_id:
+        # If the dispatch is sampled out, the span is non-recording too.
+        span = opentelemetry.trace.get_current_span()
+        trace_id = span.get_span_context().trace_id
+        if trace_id and span.is_recording():
             # Note that https://github.com/canonical/jhack depends on exact string format.
             logger.debug("Starting root trace with id='%s'.", hex(trace_id)[2:])
         event_to_emit.emit(*args, **kwargs)
 
     def _commit(self):
         """Commit the framework and gracefully teardown."""
-        self.framework.commit()
+        with self._phase('commit'):
+            self.framework.commit()
+        self._flush_logs()
+
+    def _flush_logs(self):
+        if self._juju_log_handler is not None:
+            self._juju_log_handler.flush()
 
     def _close(self):
         """Perform any necessary cleanup before the framework is closed."""
@@ -479,11 +571,28 @@ class _Manager:
 
     def destroy(self):
         """Finalise the manager."""
-        from . import tracing  # break circular import
+        global _deferred_tracing_setup
 
+        _deferred_tracing_setup = None
+        tracing = loaded_tracing()
+        if self._profiler is not None:
+            self._write_profile(self._profiler.stop())
         self._tracing_context.__exit__(*sys.exc_info())
         if tracing:
             tracing._shutdown()
+        self._flush_logs()
+
+    def _write_profile(self, report: dict[str, Any]):
+        from ._private.profiler import DispatchProfiler
+
+        self._span.set_attributes(DispatchProfiler.span_attributes(report))
+        path = self._charm_root / PROFILE_FILE
+        try:
+            DispatchProfiler.write(report, path)
+        except OSError as e:
+            logger.debug('Could not write dispatch profile to %s: %s', path, e)
+        else:
+            logger.debug('Dispatch took %.0fms; profile written to %s.', report['total_ms'], path)
 
     def run(self):
         """Emit and then commit the framework."""
@@ -495,14 +604,29 @@ class _Manager:
             self.framework.close()
 
 
-def main(charm_class: type[_charm.CharmBase], use_juju_for_storage: bool | None = None):
+def main(
+    charm_class: type[_charm.CharmBase],
+    use_juju_for_storage: bool | None = None,
+    *,
+    storage_profile: Literal['default', 'performance'] = 'default',
+    background_logging: bool = False,
+    buffer_relation_data: bool = False,
+    defer_status: bool = False,
+):
     """Set up the charm and dispatch the observed event.
 
     See `ops.main() <#ops-main-entry-point>`_ for details.
     """
     manager = None
     try:
-        manager = _Manager(charm_class, use_juju_for_storage=use_juju_for_storage)
+        manager = _Manager(
+            charm_class,
+            use_juju_for_storage=use_juju_for_storage,
+            storage_profile=storage_profile,
+            background_logging=background_logging,
+            buffer_relation_data=buffer_relation_data,
+            defer_status=defer_status,
+        )
 
         manager.run()
     except _Abort as e:
@@ -14,8 +14,55 @@
 
 from __future__ import annotations
 
+import importlib.util
+import sys
+import types
+
 import opentelemetry.trace
 
 from ..version import version
 
 tracer = opentelemetry.trace.get_tracer('ops', version)
+
+
+_lazy_modules: list[types.ModuleType] = []
+"""The modules returned by lazy_import, which may not have been executed yet."""
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """Import a module, but only execute it when one of its attributes is first used.
+
+    This is for modules that are slow to import and not needed in most
+    dispatches. If the module has already been imported, it's returned as is.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    assert spec is not None and spec.loader is not None
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    _lazy_modules.append(module)
+    return module
+
+
+def load_lazy_modules() -> None:
+    """Execute the modules from lazy_import that haven't been used yet.
+
+    Before Python 3.12, the lazy loader isn't thread-safe, so this must be
+    called before starting threads that might use those modules.
+    """
+    if sys.version_info >= (3, 12):
+        return
+    while _lazy_modules:
+        _lazy_modules.pop().__dict__  # noqa: B018 (accessing any attribute executes it)
+
+
+def loaded_tracing() -> types.ModuleType | None:
+    """Return ops.tracing if it has already been resolved, without importing it.
+
+    Tests may also set ops.tracing to None to turn tracing off.
+    """
+    return vars(sys.modules['ops']).get('tracing')
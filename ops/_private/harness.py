@@ -19,6 +19,7 @@ from __future__ import annotations
 import dataclasses
 import datetime
 import fnmatch
+import hashlib
 import http
 import inspect
 import io
@@ -2403,6 +2404,9 @@ class _TestingModelBackend:
         self._running_action: _RunningAction | None = None
         self._cloud_spec: model.CloudSpec | None = None
 
+    def _invalidate(self, *key: Any):
+        """Nothing is cached, so there's nothing to forget."""
+
     def _can_connect(self, pebble_client: _TestingPebbleClient) -> bool:
         """Returns whether the mock client is active and can support API calls with no errors."""
         return self._pebble_clients_can_connect[pebble_client]
@@ -2471,6 +2475,14 @@ class _TestingModelBackend:
             else:
                 raw_data[key] = value
 
+    def flush_relation_data(self) -> None:
+        # Relation data changes are always applied immediately.
+        pass
+
+    def flush_status(self) -> None:
+        # Status changes are always applied immediately.
+        pass
+
     def relation_set(self, relation_id: int, data: Mapping[str, str], is_app: bool) -> None:
         if not isinstance(is_app, bool):
             raise TypeError('is_app parameter to relation_set must be a boolean')
@@ -2493,7 +2505,7 @@ class _TestingModelBackend:
         # For Harness, ignore relation_id and assume relation is never cross-model.
         return {'uuid': self.model_uuid}
 
-    def config_get(self) -> _TestingConfig:
+    def config_get(self, *, use_cache: bool = True) -> _TestingConfig:
         return self._config
 
     def is_leader(self):
@@ -2523,7 +2535,7 @@ class _TestingModelBackend:
     def pod_spec_set(self, spec: model.K8sSpec, k8s_resources: Any):  # fixme: any
         self._pod_spec = (spec, k8s_resources)
 
-    def status_get(self, *, is_app: bool = False):
+    def status_get(self, *, is_app: bool = False, use_cache: bool = True):
         if is_app:
             return self._app_status
         else:
@@ -2681,7 +2693,9 @@ class _TestingModelBackend:
         # If fail is called multiple times, Juju only retains the most recent failure message.
         self._running_action.failure_message = message
 
-    def network_get(self, endpoint_name: str, relation_id: int | None = None) -> _NetworkDict:
+    def network_get(
+        self, endpoint_name: str, relation_id: int | None = None, *, use_cache: bool = True
+    ) -> _NetworkDict:
         data = self._networks.get((endpoint_name, relation_id))
         if data is not None:
             return data
@@ -2723,7 +2737,7 @@ class _TestingModelBackend:
         self._pebble_clients_can_connect[client] = False
         return client
 
-    def planned_units(self) -> int:
+    def planned_units(self, *, use_cache: bool = True) -> int:
         """Simulate fetching the number of planned application units from the model.
 
         If self._planned_units is None, then we simulate what the Juju controller will do, which is
@@ -2981,6 +2995,9 @@ class _TestingModelBackend:
         remote_app_name = self._relation_app_and_units[relation_id]['app']
         secret.grants[relation_id].discard(unit or remote_app_name)
 
+    def secret_ids(self) -> list[str]:
+        return [s.id for s in self._secrets if s.owner_name in (self.app_name, self.unit_name)]
+
     def secret_remove(self, id: str, *, revision: int | None = None) -> None:
         secret = self._ensure_secret(id)
         if not self._has_secret_owner_permission(secret):
@@ -3010,7 +3027,7 @@ class _TestingModelBackend:
         protocol_lit = cast('Literal["tcp", "udp", "icmp"]', protocol)
         self._opened_ports.discard(model.Port(protocol_lit, port))
 
-    def opened_ports(self) -> set[model.Port]:
+    def opened_ports(self, *, use_cache: bool = True) -> set[model.Port]:
         return set(self._opened_ports)
 
     def _check_protocol_and_port(self, protocol: str, port: int | None):
@@ -3606,6 +3623,62 @@ class _TestingPebbleClient:
                 'generic-file-error', f'open {path}.~: not a directory'
             ) from None
 
+    def pull_stream(
+        self, path: str | pathlib.PurePath, *, encoding: str | None = 'utf-8'
+    ) -> BinaryIO | TextIO:
+        return self.pull(path, encoding=encoding)
+
+    def pull_to(self, path: str | pathlib.PurePath, dest: str | os.PathLike[str] | BinaryIO):
+        with cast('BinaryIO', self.pull(path, encoding=None)) as src:
+            if not isinstance(dest, (str, os.PathLike)):
+                shutil.copyfileobj(src, dest)
+                return
+            with open(dest, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+
+    def pull_many(
+        self, paths: Iterable[str | pathlib.PurePath], *, encoding: str | None = 'utf-8'
+    ) -> dict[str, BinaryIO | TextIO | pebble.PathError]:
+        self._check_connection()
+        results: dict[str, BinaryIO | TextIO | pebble.PathError] = {}
+        for path in paths:
+            try:
+                results[str(path)] = self.pull(path, encoding=encoding)
+            except pebble.PathError as e:  # noqa: PERF203
+                results[str(path)] = e
+        return results
+
+    def push_many(
+        self,
+        files: Iterable[tuple[str | pathlib.PurePath, ReadableBuffer]],
+        *,
+        encoding: str = 'utf-8',
+        make_dirs: bool = False,
+        permissions: int | None = None,
+        user_id: int | None = None,
+        user: str | None = None,
+        group_id: int | None = None,
+        group: str | None = None,
+    ) -> dict[str, pebble.PathError]:
+        self._check_connection()
+        errors: dict[str, pebble.PathError] = {}
+        for path, source in files:
+            try:
+                self.push(
+                    path,
+                    source,
+                    encoding=encoding,
+                    make_dirs=make_dirs,
+                    permissions=permissions,
+                    user_id=user_id,
+                    user=user,
+                    group_id=group_id,
+                    group=group,
+                )
+            except pebble.PathError as e:  # noqa: PERF203
+                errors[str(path)] = e
+        return errors
+
     def list_files(
         self, path: str | pathlib.PurePath, *, pattern: str | None = None, itself: bool = False
     ) -> list[pebble.FileInfo]:
@@ -3708,6 +3781,31 @@ class _TestingPebbleClient:
                 return self._exec_handlers[command_prefix]
         return None
 
+    def _handle_sha256sum(self, args: ExecArgs) -> ExecResult:
+        return self._sha256sum(args.command)
+
+    def _sha256sum(self, command: Sequence[str]) -> ExecResult:
+        """Simulate running ``sha256sum`` on files in the simulated filesystem."""
+        paths = list(command[1:])
+        if paths[:1] == ['--']:
+            paths = paths[1:]
+        stdout: list[str] = []
+        stderr: list[str] = []
+        for path in paths:
+            try:
+                digest = hashlib.sha256((self._root / path.lstrip('/')).read_bytes()).hexdigest()
+            except OSError as e:
+                stderr.append(f'sha256sum: {path}: {e.strerror}\n')
+                continue
+            if '\\' in path or '\n' in path or '\r' in path:
+                escaped = path.replace('\\', '\\\\').replace('\n', '\\n').replace('\r', '\\r')
+                stdout.append(f'\\{digest}  {escaped}\n')
+            else:
+                stdout.append(f'{digest}  {path}\n')
+        return ExecResult(
+            exit_code=1 if stderr else 0, stdout=''.join(stdout), stderr=''.join(stderr)
+        )
+
     def _transform_exec_handler_output(
         self, data: str | bytes, encoding: str | None
     ) -> io.BytesIO | io.StringIO:
@@ -3745,6 +3843,9 @@ class _TestingPebbleClient:
     ) -> ExecProcess[Any]:
         self._check_connection()
         handler = self._find_exec_handler(command)
+        if handler is None and command[:1] == ['sha256sum']:
+            # Container.push and Container.sync_path run this to compare files.
+            handler = self._handle_sha256sum
         if handler is None:
             message = 'execution handler not found, please register one using Harness.handle_exec'
             raise self._api_error(500, message)
@@ -0,0 +1,116 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Timing of the phases of a dispatch, for finding where the time goes."""
+
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import json
+import os
+import pstats
+import sys
+import time
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any, cast
+
+
+def process_age() -> float | None:
+    """Return the number of seconds since this process started, if known.
+
+    This is only available on Linux, and has the resolution of the kernel's
+    clock ticks (usually 10ms).
+    """
+    try:
+        with open('/proc/self/stat') as f:
+            # The command name is in parentheses and may contain spaces.
+            fields = f.read().rsplit(')', 1)[1].split()
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        start_time = int(fields[19]) / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return None
+    return max(uptime - start_time, 0.0)
+
+
+class DispatchProfiler:
+    """Records how long each phase of a dispatch takes, and the slowest functions.
+
+    The phases are timed with wall clock time, and the functions are profiled
+    with :mod:`cProfile`, which slows down the code somewhat.
+    """
+
+    def __init__(self, top: int = 20):
+        self.top = top
+        # Interpreter startup and imports, before ops.main was called.
+        startup = process_age()
+        self.phases: dict[str, float] = {} if startup is None else {'startup': startup}
+        self._start = time.perf_counter()
+        self._profile: cProfile.Profile | None = cProfile.Profile()
+        try:
+            self._profile.enable()
+        except ValueError:
+            # Another profiler is already active.
+            self._profile = None
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Generator[None]:
+        """Time a phase of the dispatch. Phases with the same name are added together."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def stop(self) -> dict[str, Any]:
+        """Stop profiling, and return the report."""
+        total = time.perf_counter() - self._start
+        functions: list[dict[str, Any]] = []
+        if self._profile is not None:
+            self._profile.disable()
+            stats = pstats.Stats(self._profile)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE)
+            entries = cast('dict[Any, tuple[int, int, float, float, Any]]', stats.stats)  # type: ignore
+            for func in stats.fcn_list[: self.top]:  # type: ignore
+                _, calls, _, cumulative, _ = entries[func]
+                functions.append({
+                    'function': pstats.func_std_string(func),  # type: ignore
+                    'calls': calls,
+                    'cumulative_ms': round(cumulative * 1000, 3),
+                })
+            self._profile = None
+        return {
+            'total_ms': round(total * 1000, 3),
+            'phases_ms': {name: round(t * 1000, 3) for name, t in self.phases.items()},
+            'modules': len(sys.modules),
+            'functions': functions,
+        }
+
+    @staticmethod
+    def write(report: dict[str, Any], path: Path):
+        """Write the report to a file as compact JSON, replacing any previous report."""
+        path.write_text(json.dumps(report, separators=(',', ':')))
+
+    @staticmethod
+    def span_attributes(report: dict[str, Any]) -> dict[str, float | int]:
+        """Return the phase timings in the report as span attributes."""
+        attributes: dict[str, float | int] = {
+            'ops.profile.total_ms': report['total_ms'],
+            'ops.profile.modules': report['modules'],
+        }
+        for name, ms in report['phases_ms'].items():
+            attributes[f'ops.profile.{name}_ms'] = ms
+        return attributes
@@ -18,9 +18,11 @@ from __future__ import annotations
 
 import dataclasses
 import enum
+import hashlib
 import logging
 import os
 import pathlib
+import pickle
 import warnings
 from collections.abc import Mapping
 from typing import (
@@ -47,6 +49,7 @@ from .framework import (
     ObjectEvents,
 )
 from .jujuversion import JujuVersion
+from .version import version
 
 if TYPE_CHECKING:
     from typing_extensions import Required
@@ -91,6 +94,9 @@ class _ContainerBaseDict(TypedDict):
 
 logger = logging.getLogger(__name__)
 
+# The files that CharmMeta.from_charm_root loads the charm's metadata from.
+_META_FILES = ('metadata.yaml', 'actions.yaml', 'config.yaml')
+
 
 class HookEvent(EventBase):
     """Events raised by Juju to progress a charm's lifecycle.
@@ -1890,9 +1896,24 @@ class CharmMeta:
         }
 
     @staticmethod
-    def from_charm_root(charm_root: pathlib.Path | str):
-        """Initialise CharmMeta from the path to a charm repository root folder."""
+    def from_charm_root(
+        charm_root: pathlib.Path | str, *, cache_path: pathlib.Path | str | None = None
+    ):
+        """Initialise CharmMeta from the path to a charm repository root folder.
+
+        Args:
+            charm_root: the charm's root directory, containing ``metadata.yaml``
+                and optionally ``actions.yaml`` and ``config.yaml``.
+            cache_path: if provided, the parsed metadata is saved to this file,
+                and loaded from it instead of parsing the YAML files again, as
+                long as the files haven't changed. The cache is only used if it
+                was written by the same version of ops. Errors writing the
+                cache are ignored.
+        """
         charm_root = pathlib.Path(charm_root)
+        if cache_path is not None:
+            return CharmMeta._from_cache(charm_root, pathlib.Path(cache_path))
+
         metadata_path = charm_root / 'metadata.yaml'
 
         with metadata_path.open() as f:
@@ -1912,6 +1933,67 @@ class CharmMeta:
 
         return CharmMeta(meta, actions, options)
 
+    @staticmethod
+    def _from_cache(charm_root: pathlib.Path, cache_path: pathlib.Path) -> CharmMeta:
+        stats: dict[str, tuple[int, int] | None] = {}
+        for name in _META_FILES:
+            try:
+                stat = (charm_root / name).stat()
+            except FileNotFoundError:  # noqa: PERF203
+                stats[name] = None
+            else:
+                stats[name] = (stat.st_mtime_ns, stat.st_size)
+
+        cached: dict[str, Any] | None = None
+        try:
+            with cache_path.open('rb') as f:
+                cached = pickle.load(f)  # noqa: S301
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            # The cache is corrupt, or refers to classes that no longer exist.
+            logger.debug('Ignoring charm metadata cache %s: %s', cache_path, e)
+        if not isinstance(cached, dict) or cached.get('version') != version:
+            cached = None
+        # If the files look the same, trust them, without reading them.
+        if cached is not None and cached['stats'] == stats:
+            return cached['meta']
+
+        contents: dict[str, bytes | None] = {}
+        for name, stat in stats.items():
+            # metadata.yaml is required, so let reading it raise if it's missing.
+            if stat is None and name != 'metadata.yaml':
+                contents[name] = None
+            else:
+                contents[name] = (charm_root / name).read_bytes()
+        hashes = {
+            name: None if data is None else hashlib.sha256(data).hexdigest()
+            for name, data in contents.items()
+        }
+        if cached is not None and cached['hashes'] == hashes:
+            meta = cast('CharmMeta', cached['meta'])
+        else:
+            raw = {
+                name: None if data is None else yaml.safe_load(data.decode())
+                for name, data in contents.items()
+            }
+            meta = CharmMeta(raw['metadata.yaml'], raw['actions.yaml'], raw['config.yaml'])
+
+        cached = {'version': version, 'stats': stats, 'hashes': hashes, 'meta': meta}
+        # Write the cache atomically, so that a concurrent or interrupted
+        # dispatch never sees a partial file.
+        tmp_path = cache_path.with_name(f'{cache_path.name}.{os.getpid()}.tmp')
+        try:
+            with tmp_path.open('wb') as f:
+                pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except (OSError, pickle.PicklingError, TypeError) as e:
+            logger.debug('Unable to write charm metadata cache %s: %s', cache_path, e)
+        finally:
+            # Only still there if writing or renaming it failed.
+            tmp_path.unlink(missing_ok=True)
+        return meta
+
     def _load_links(self, raw: dict[str, Any]):
         websites = raw.get('website', [])
         if not websites and 'links' in raw:
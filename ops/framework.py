@@ -36,9 +36,9 @@ from typing import TYPE_CHECKING, Any, Literal, NoReturn, Protocol, TypeVar
 import opentelemetry.trace
 
 from . import charm
-from ._private import tracer
+from ._private import loaded_tracing, tracer
 from .model import Model, _ModelBackend
-from .storage import JujuStorage, NoSnapshotError, SQLiteStorage
+from .storage import JujuStorage, NoSnapshotError, SQLiteStorage, _scan_for_equivalent_notice
 
 
 class Serializable(typing.Protocol):
@@ -62,7 +62,7 @@ StoredObject = 'StoredList | StoredSet | StoredDict'
 
 _Path = _Kind = _MethodName = _EventKey = str
 # used to type Framework Attributes
-_ObserverPath = list[tuple[_Path, _MethodName, _Path, _EventKey]]
+_ObserverRegistry = dict[tuple[_Path, _Kind], list[tuple[_Path, _MethodName]]]
 _ObjectPath = tuple[_Path | None, _Kind]
 _PathToObjectMapping = dict[_Path, 'Object']
 _PathToSerializableMapping = dict[_Path, Serializable]
@@ -617,8 +617,8 @@ class Framework(Object):
         self.meta = meta
         self.model = model
         self.skip_duplicate_events = skip_duplicate_events
-        # [(observer_path, method_name, parent_path, event_key)]
-        self._observers: _ObserverPath = []
+        # {(parent_path, event_kind): [(observer_path, method_name)]}
+        self._observers: _ObserverRegistry = {}
         # {observer_path: observing Object}
         self._observer: _PathToObjectMapping = weakref.WeakValueDictionary()  # type: ignore
         # {object_path: object}
@@ -691,6 +691,12 @@ class Framework(Object):
         # Make sure snapshots are saved by instances of StoredStateData. Any possible state
         # modifications in on_commit handlers of instances of other classes will not be persisted.
         self.on.commit.emit()
+        # Write any buffered relation data and deferred status, so that a
+        # failure to write them means that the state of the dispatch isn't
+        # saved either.
+        if self.model is not None:
+            self.model.flush_relation_data()
+            self.model.flush_status()
         # Save our event count after all events have been emitted.
         self.save_snapshot(self._stored)
         self._storage.commit()
@@ -817,7 +823,8 @@ class Framework(Object):
         # TODO Prevent the exact same parameters from being registered more than once.
 
         self._observer[observer_obj.handle.path] = observer_obj
-        self._observers.append((observer_obj.handle.path, method_name, emitter_path, event_kind))
+        observers = self._observers.setdefault((emitter_path, event_kind), [])
+        observers.append((observer_obj.handle.path, method_name))
 
     def _next_event_key(self) -> str:
         """Return the next event key that should be used, incrementing the internal counter."""
@@ -830,30 +837,14 @@ class Framework(Object):
         self, observer_path: str, method_name: str, event_path: str, event_data: dict[str, Any]
     ) -> bool:
         """Check if there is already a notice with the same snapshot in the storage."""
-        # Check all the notices to see if there is one that is the same other
-        # than the event ID.
-        for (
-            existing_event_path,
-            existing_observer_path,
-            existing_method_name,
-        ) in self._storage.notices():
-            if (
-                existing_observer_path != observer_path
-                or existing_method_name != method_name
-                # The notices all have paths that include [id] at the end. If one
-                # was somehow missing, then the split would be the empty string and
-                # match anyway.
-                or existing_event_path.split('[')[0] != event_path.split('[')[0]
-            ):
-                continue
-            # Check if the snapshot for this notice is the same.
-            try:
-                existing_event_data = self._storage.load_snapshot(existing_event_path)
-            except NoSnapshotError:
-                existing_event_data = {}
-            if event_data == existing_event_data:
-                return True
-        return False
+        if not hasattr(self._storage, 'has_equivalent_notice'):
+            # A custom storage that predates the method.
+            return _scan_for_equivalent_notice(
+                self._storage, event_path, observer_path, method_name, event_data
+            )
+        return self._storage.has_equivalent_notice(
+            event_path, observer_path, method_name, event_data
+        )
 
     def _emit(self, event: EventBase):
         """See BoundEvent.emit for the public way to call this."""
@@ -869,13 +860,7 @@ class Framework(Object):
         parent_path = parent.path
         this_event_data = event.snapshot()
         self._validate_snapshot_data(event, this_event_data)
-        # TODO Track observers by (parent_path, event_kind) rather than as a list of
-        # all observers. Avoiding linear search through all observers for every event
-        for observer_path, method_name, _parent_path, _event_kind in self._observers:
-            if _parent_path != parent_path:
-                continue
-            if _event_kind and _event_kind != event_kind:
-                continue
+        for observer_path, method_name in self._observers.get((parent_path, event_kind), ()):
             if self.skip_duplicate_events and self._event_is_in_storage(
                 observer_path, method_name, event_path, this_event_data
             ):
@@ -896,8 +881,8 @@ class Framework(Object):
             # Again, only commit this after all notices are saved.
             self._storage.save_notice(event_path, observer_path, method_name)
         if saved:
-            from . import tracing  # break circular import
-
+            # If ops.tracing hasn't been used in this dispatch, there's nothing to mark.
+            tracing = loaded_tracing()
             if tracing:
                 # To ensure that the trace data collected during the processing of early events
                 # (such as install or start) are not evicted from the tracing buffer before the
@@ -1010,12 +995,16 @@ class Framework(Object):
                         event_type = 'custom'
                     obs_class = observer.__class__.__qualname__
                     with tracer.start_as_current_span(f'{event_handle.kind}: {obs_class}') as span:
-                        span.set_attribute('deferred', single_event_path is None)
-                        span.set_attribute('event', repr(event))
-                        span.set_attribute('event_type', event_type)
-                        span.set_attribute('event_class', event.__class__.__qualname__)
-                        span.set_attribute('event_name', event_handle.kind)
-                        span.set_attribute('handler', f'{observer_path}.{method_name}')
+                        # Skip formatting the attributes if the span is sampled out.
+                        if span.is_recording():
+                            span.set_attributes({
+                                'deferred': single_event_path is None,
+                                'event': repr(event),
+                                'event_type': event_type,
+                                'event_class': event.__class__.__qualname__,
+                                'event_name': event_handle.kind,
+                                'handler': f'{observer_path}.{method_name}',
+                            })
                         with self._event_context(event_handle.kind):
                             if (
                                 event_is_from_juju or event_is_action
@@ -21,7 +21,10 @@ import enum
 import functools
 import json
 import logging
+import queue
 import sys
+import threading
+import traceback
 import types
 import typing
 import warnings
@@ -31,11 +34,43 @@ if typing.TYPE_CHECKING:
 
 
 class JujuLogHandler(logging.Handler):
-    """A handler for sending logs and warnings to Juju via juju-log."""
+    """A handler for sending logs and warnings to Juju via juju-log.
 
-    def __init__(self, model_backend: _ModelBackend, level: int = logging.DEBUG):
+    Each juju-log call runs a new process. With ``background=True``, records
+    are instead put on a queue and sent by a worker thread, which combines
+    consecutive records with the same level into a single multi-line message,
+    so that many records are sent with a few calls. Records are always sent
+    in the order they were logged. The queue is written out by :meth:`flush`
+    and :meth:`close`. If the queue is full, records are dropped and counted
+    in :attr:`dropped`.
+
+    Args:
+        model_backend: The backend used to run juju-log.
+        level: The minimum level of records to send.
+        background: Whether to send records from a worker thread.
+        max_queue: The maximum number of records waiting to be sent, when
+            sending in the background.
+    """
+
+    def __init__(
+        self,
+        model_backend: _ModelBackend,
+        level: int = logging.DEBUG,
+        *,
+        background: bool = False,
+        max_queue: int = 10_000,
+    ):
         super().__init__(level)
         self.model_backend = model_backend
+        self.dropped = 0
+        """The number of records dropped because the queue was full."""
+        self._dropped_lock = threading.Lock()
+        self._queue: queue.Queue[tuple[str, str] | None] | None = None
+        self._worker: threading.Thread | None = None
+        if background:
+            self._queue = queue.Queue(max_queue)
+            self._worker = threading.Thread(target=self._run, name='juju-log', daemon=True)
+            self._worker.start()
 
     def emit(self, record: logging.LogRecord):
         """Send the specified logging record to the Juju backend.
@@ -43,12 +78,88 @@ class JujuLogHandler(logging.Handler):
         This method is not used directly by the ops library, but by
         :class:`logging.Handler` itself as part of the logging machinery.
         """
-        self.model_backend.juju_log(record.levelname, self.format(record))
+        self._juju_log(record.levelname, self.format(record))
+
+    def _juju_log(self, level: str, message: str):
+        # Anything logged while sending is sent directly, to avoid a loop.
+        if self._queue is None or threading.current_thread() is self._worker:
+            self.model_backend.juju_log(level, message)
+            return
+        try:
+            self._queue.put_nowait((level, message))
+        except queue.Full:
+            # Records can be logged from several threads at once.
+            with self._dropped_lock:
+                self.dropped += 1
+
+    def flush(self):
+        """Wait until all queued records have been sent."""
+        if self._queue is not None and self._worker is not None and self._worker.is_alive():
+            self._queue.join()
+
+    def close(self):
+        """Send any queued records, and stop the worker thread."""
+        if self._queue is not None and self._worker is not None and self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join()
+        super().close()
+
+    def _run(self):
+        assert self._queue is not None
+        from .model import MAX_LOG_LINE_LEN  # break circular import
+
+        reported_dropped = 0
+        while True:
+            items = [self._queue.get()]
+            # Take everything else that is already waiting, to send together.
+            while items[-1] is not None:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:  # noqa: PERF203
+                    break
+            entries = [item for item in items if item is not None]
+            dropped = self.dropped - reported_dropped
+            if dropped:
+                reported_dropped += dropped
+                entries.append(('WARNING', f'{dropped} log messages dropped (queue full).'))
+            for level, message in self._coalesce(entries, MAX_LOG_LINE_LEN):
+                try:
+                    self.model_backend.juju_log(level, message)
+                except Exception:  # noqa: PERF203
+                    # There's nowhere else to report this.
+                    traceback.print_exc(file=sys.stderr)
+            for _ in items:
+                self._queue.task_done()
+            if items[-1] is None:
+                return
+
+    @staticmethod
+    def _coalesce(entries: list[tuple[str, str]], max_len: int):
+        """Join consecutive messages with the same level, up to max_len characters."""
+        level = ''
+        lines: list[str] = []
+        length = 0
+        for entry_level, message in entries:
+            if lines and (entry_level != level or length + 1 + len(message) > max_len):
+                yield level, '\n'.join(lines)
+                lines = []
+            if not lines:
+                level = entry_level
+                length = len(message)
+            else:
+                length += 1 + len(message)
+            lines.append(message)
+        if lines:
+            yield level, '\n'.join(lines)
 
 
 def setup_root_logging(
-    model_backend: _ModelBackend, debug: bool = False, exc_stderr: bool = False
-):
+    model_backend: _ModelBackend,
+    debug: bool = False,
+    exc_stderr: bool = False,
+    *,
+    background: bool = False,
+) -> JujuLogHandler:
     """Setup Python logging to forward messages to juju-log.
 
     By default, logging is set to DEBUG level, and messages will be filtered by Juju.
@@ -63,10 +174,16 @@ def setup_root_logging(
         model_backend: a ModelBackend to use for juju-log
         debug: if true, write logs to stderr as well as to juju-log.
         exc_stderr: if true, write uncaught exceptions to stderr as well as to juju-log.
+        background: if true, send logs to juju-log from a worker thread; see
+            :class:`JujuLogHandler`.
+
+    Returns:
+        The handler that sends logs to juju-log.
     """
     logger = logging.getLogger()
     logger.setLevel(logging.DEBUG)
-    logger.addHandler(JujuLogHandler(model_backend))
+    juju_handler = JujuLogHandler(model_backend, background=background)
+    logger.addHandler(juju_handler)
 
     def custom_showwarning(
         message: Warning | str,
@@ -100,8 +217,11 @@ def setup_root_logging(
             etype.__name__,
             description=f'Uncaught exception in charm code: {value!r}.',
         )
+        # The process is about to exit, so make sure that the logs are sent.
+        juju_handler.flush()
 
     sys.excepthook = except_hook
+    return juju_handler
 
 
 class _SecurityEvent(enum.Enum):
@@ -136,7 +256,9 @@ def _get_juju_log_and_app_id():
             model_backend = juju_handler.model_backend
             juju_context = model_backend._juju_context
             app_id = f'{juju_context.model_uuid}-{juju_context.unit_name}'
-            juju_log = model_backend.juju_log
+            # Go through the handler so that the event is sent in order with
+            # other logs.
+            juju_log = juju_handler._juju_log
             return juju_log, app_id
 
     warnings.warn(
@@ -16,12 +16,16 @@
 
 from __future__ import annotations
 
+import collections
+import concurrent.futures
 import contextlib
 import contextvars
 import copy
 import dataclasses
 import datetime
 import enum
+import hashlib
+import io
 import ipaddress
 import json
 import logging
@@ -32,12 +36,13 @@ import shutil
 import stat
 import sys
 import tempfile
+import threading
 import time
 import typing
 import warnings
 import weakref
 from abc import ABC, abstractmethod
-from collections.abc import Callable, Generator, Iterable, Mapping, MutableMapping
+from collections.abc import Callable, Generator, Iterable, Mapping, MutableMapping, Sequence
 from pathlib import Path, PurePath
 from typing import (
     Any,
@@ -53,15 +58,19 @@ from typing import (
 )
 
 from . import charm as _charm
-from . import hookcmds, pebble
-from ._private import timeconv, tracer, yaml
+from . import hookcmds
+from ._private import lazy_import, load_lazy_modules, timeconv, tracer, yaml
 from .jujucontext import JujuContext
 from .jujuversion import JujuVersion
 from .log import _log_security_event, _SecurityEvent, _SecurityEventLevel
 
 if typing.TYPE_CHECKING:
+    from . import pebble
     from .hookcmds._types import AddressDict as _AddressDict
     from .hookcmds._types import BindAddressDict as _BindAddressDict
+else:
+    # Only containers need pebble, so don't load it for every dispatch.
+    pebble = lazy_import('ops.pebble')
 
 
 # JujuVersion is not used in this file, but there are charms that are importing JujuVersion
@@ -103,6 +112,17 @@ logger = logging.getLogger(__name__)
 
 MAX_LOG_LINE_LEN = 131071  # Max length of strings to pass to subshell.
 
+# Maximum number of hook commands that are run at the same time when prefetching.
+_MAX_CONCURRENT_HOOK_COMMANDS = 8
+
+# Limits on the files sent or received in a single Pebble request by
+# Container.push_path and Container.pull_path.
+_MAX_BATCH_FILES = 100
+_MAX_BATCH_BYTES = 8 * 1024 * 1024
+_SHA256_HEX = re.compile(r'[0-9a-f]{64}')
+_SHA256SUM_ESCAPE = re.compile(r'\\(.)')
+_SHA256SUM_UNESCAPE = {'\\': '\\', 'n': '\n', 'r': '\r'}
+
 
 _T = TypeVar('_T')
 
@@ -314,6 +334,61 @@ class Model:
             content=content,
         )
 
+    def prefetch_secrets(self, ids: Iterable[str] | None = None) -> list[Secret]:
+        """Get the content of many secrets at once.
+
+        Getting a secret's content runs a ``secret-get`` hook command. When a
+        charm is going to read many secrets -- for example, one for each of
+        hundreds of certificates -- this runs those hook commands up front, a
+        few at a time in parallel, which is much faster than running them one
+        by one. The content is kept for the rest of the dispatch, so later
+        calls to :meth:`get_secret` with the same IDs don't query the secret
+        storage again.
+
+        .. jujuadded:: 3.0
+
+        Args:
+            ids: The IDs of the secrets to get. The default is all of the
+                secrets that the charm owns.
+
+        Returns:
+            The secrets that the charm can read, with their content loaded.
+            Secrets that can't be read are left out, and the error is logged
+            at debug level; :meth:`get_secret` will raise the error for them.
+        """
+        if ids is None:
+            ids = self._backend.secret_ids()
+        ids = [Secret._canonicalize_id(id, self.uuid) for id in ids]
+
+        def get_content(id: str) -> dict[str, str]:
+            return self._backend.secret_get(id=id)
+
+        results = _run_concurrently(get_content, [(id,) for id in ids])
+        secrets: list[Secret] = []
+        for id, result in zip(ids, results, strict=True):
+            if isinstance(result, Exception):
+                logger.debug('Could not prefetch secret %s: %s', id, result)
+            else:
+                secrets.append(Secret(self._backend, id=id, content=result))
+        return secrets
+
+    def invalidate_cache(self) -> None:
+        """Forget what has been read from Juju in this dispatch, so that it's read again.
+
+        Within a dispatch, the results of read-only hook commands, such as the
+        config, statuses, network bindings, planned units and opened ports, are
+        kept and reused. They're refreshed when the charm changes them, but not
+        if they change some other way during the dispatch. Call this to get
+        fresh values from Juju on the next read.
+        """
+        self._backend._invalidate()
+        self._config._invalidate()
+        for entity in list(self._cache._weakrefs.values()):
+            if entity is not None:
+                entity._invalidate()
+        for binding in self._bindings._data.values():
+            binding._network = None
+
     def get_cloud_spec(self) -> CloudSpec:
         """Get details of the cloud in which the model is deployed.
 
@@ -330,6 +405,40 @@ class Model:
         """
         return self._backend.credential_get()
 
+    def flush_relation_data(self) -> None:
+        """Write any relation data changes that have been buffered.
+
+        When the charm is run with ``ops.main(..., buffer_relation_data=True)``,
+        changes to relation data are collected, and written with one
+        ``relation-set`` for each databag when the framework commits, at the
+        end of the dispatch. Reading this unit's or app's relation data during
+        the dispatch gives the buffered values; the remote units and app
+        don't see the changes until they're written. Call this to write the
+        changes sooner.
+
+        If a relation no longer exists when the changes are written, for
+        example because it's being broken, the changes to it are logged and
+        dropped rather than raising an error.
+
+        If relation data isn't being buffered, this does nothing.
+        """
+        self._backend.flush_relation_data()
+
+    def flush_status(self) -> None:
+        """Set any unit and app status that has been deferred.
+
+        When the charm is run with ``ops.main(..., defer_status=True)``,
+        setting :attr:`Unit.status` or :attr:`Application.status` only records
+        the new status, and the last one is set when the framework commits, at
+        the end of the dispatch. It's not set if the charm read the status
+        earlier in the dispatch and it's unchanged; without that read, there's
+        nothing to compare with, so it's always set. Call this to set the
+        status sooner.
+
+        If status isn't being deferred, this does nothing.
+        """
+        self._backend.flush_status()
+
 
 class _ModelCache:
     def __init__(self, meta: _charm.CharmMeta, backend: _ModelBackend):
@@ -939,23 +1048,96 @@ class RelationMapping(Mapping[str, list['Relation']]):
         return iter(self._data)
 
     def __getitem__(self, relation_name: str) -> list[Relation]:
-        is_peer = relation_name in self._peers
         relation_list: list[Relation] | None = self._data[relation_name]
         if not isinstance(relation_list, list):
-            relation_list = self._data[relation_name] = []
-            for rid in self._backend.relation_ids(relation_name):
-                if rid == self._broken_relation_id:
-                    continue
-                relation = Relation(
+            relation_list = self._data[relation_name] = [
+                self._make_relation(relation_name, rid)
+                for rid in self._relation_ids(relation_name)
+            ]
+        return relation_list
+
+    def _relation_ids(self, relation_name: str) -> list[int]:
+        return [
+            rid
+            for rid in self._backend.relation_ids(relation_name)
+            if rid != self._broken_relation_id
+        ]
+
+    def _make_relation(
+        self,
+        relation_name: str,
+        relation_id: int,
+        unit_names: list[str] | None = None,
+        app_name: str | ModelError | None = None,
+    ) -> Relation:
+        return Relation(
+            relation_name,
+            relation_id,
+            relation_name in self._peers,
+            self._our_unit,
+            self._backend,
+            self._cache,
+            _remote_unit=self._remote_unit,
+            _unit_names=unit_names,
+            # If the lookup failed, let Relation run it again and handle the error.
+            _app_name=None if isinstance(app_name, Exception) else app_name,
+        )
+
+    def prefetch(self, relation_name: str) -> list[Relation]:
+        """Load the units and data of all the relations for an endpoint.
+
+        Relation units and relation data are normally loaded lazily, running
+        one hook command for each relation and each databag the first time
+        that it is accessed. When a charm is going to read most of the data for
+        an endpoint anyway -- for example, a peer relation with many units --
+        this method runs all of those hook commands up front, a few at a time
+        in parallel, which is much faster than running them one by one.
+
+        The local application databag is not loaded if this unit is not the
+        leader. Databags that cannot be loaded are left to be loaded (and raise
+        the usual error) when they are accessed.
+
+        Args:
+            relation_name: The name of the endpoint, as in ``charmcraft.yaml``.
+
+        Returns:
+            The relations for the endpoint, the same as ``self[relation_name]``.
+        """
+        relation_list = self._data[relation_name]
+        if not isinstance(relation_list, list):
+            rids = self._relation_ids(relation_name)
+            all_unit_names = _run_concurrently(
+                self._backend.relation_list, [(rid,) for rid in rids]
+            )
+            # A relation with no remote units gets its remote app name from
+            # "relation-list --app", so look those up together too.
+            is_peer = relation_name in self._peers
+            app_rids = [
+                rid
+                for rid, unit_names in zip(rids, all_unit_names, strict=True)
+                if not is_peer and not unit_names
+            ]
+            app_names = dict(
+                zip(
+                    app_rids,
+                    _run_concurrently(
+                        self._backend.relation_remote_app_name, [(rid,) for rid in app_rids]
+                    ),
+                    strict=True,
+                )
+            )
+            relation_list = self._data[relation_name] = [
+                # If relation-list failed, let Relation run it again and handle the error.
+                self._make_relation(
                     relation_name,
                     rid,
-                    is_peer,
-                    self._our_unit,
-                    self._backend,
-                    self._cache,
-                    _remote_unit=self._remote_unit,
+                    None if isinstance(unit_names, Exception) else unit_names,
+                    app_names.get(rid),
                 )
-                relation_list.append(relation)
+                for rid, unit_names in zip(rids, all_unit_names, strict=True)
+            ]
+
+        _prefetch_relation_data(relation_list, self._backend)
         return relation_list
 
     def _invalidate(self, relation_name: str):
@@ -1694,6 +1876,8 @@ class Relation:
         cache: _ModelCache,
         active: bool = True,
         _remote_unit: Unit | None = None,
+        _unit_names: list[str] | None = None,
+        _app_name: str | None = None,
     ):
         self.name = relation_name
         self.id = relation_id
@@ -1706,7 +1890,9 @@ class Relation:
         app = our_unit.app if is_peer else None
 
         try:
-            for unit_name in backend.relation_list(self.id):
+            if _unit_names is None:
+                _unit_names = backend.relation_list(self.id)
+            for unit_name in _unit_names:
                 unit = cache.get(Unit, unit_name)
                 self.units.add(unit)
                 if app is None:
@@ -1719,7 +1905,7 @@ class Relation:
         # If we didn't get the remote app via our_unit.app or the units list,
         # look it up via JUJU_REMOTE_APP or "relation-list --app".
         if app is None:
-            app_name = backend.relation_remote_app_name(relation_id)
+            app_name = _app_name or backend.relation_remote_app_name(relation_id)
             if app_name is not None:
                 app = cache.get(Application, app_name)
 
@@ -1949,6 +2135,7 @@ class RelationData(Mapping[Unit | Application, 'RelationDataContent']):
         remote_unit: Unit | None = None,
     ):
         self.relation = weakref.proxy(relation)
+        self._backend = backend
         self._data: dict[Unit | Application, RelationDataContent] = {
             our_unit: RelationDataContent(self.relation, our_unit, backend),
             our_unit.app: RelationDataContent(self.relation, our_unit.app, backend),
@@ -1980,6 +2167,24 @@ class RelationData(Mapping[Unit | Application, 'RelationDataContent']):
     def __repr__(self):
         return repr(self._data)
 
+    def prefetch(self) -> None:
+        """Load all the databags of this relation.
+
+        Each databag is normally loaded when it's first accessed, which runs a
+        ``relation-get`` hook command. If the charm is going to read most of
+        the databags anyway -- for example, in a peer relation with many units --
+        this loads them all up front, a few at a time in parallel, which is
+        much faster than loading them one by one.
+
+        The local application databag is not loaded if this unit is not the
+        leader. Databags that cannot be loaded are left to be loaded (and raise
+        the usual error) when they are accessed.
+
+        To do this for all the relations of an endpoint, use
+        :meth:`RelationMapping.prefetch`.
+        """
+        _prefetch_relation_data([self.relation], self._backend)
+
 
 # We mix in MutableMapping here to get some convenience implementations, but whether it's actually
 # mutable or not is controlled by the flag.
@@ -2496,6 +2701,11 @@ class Storage:
         self._location = Path(location)
 
 
+# A file to copy in Container.push_path or Container.pull_path: the source path
+# argument it was found under, its file info, and its destination path.
+_FileToCopy = tuple[str, 'pebble.FileInfo', Path]
+
+
 class MultiPushPullError(Exception):
     """Aggregates multiple push and pull exceptions into one.
 
@@ -2558,6 +2768,8 @@ class Container:
             socket_path = f'/charm/containers/{name}/pebble.socket'
             pebble_client = backend.get_pebble(socket_path)
         self._pebble: pebble.Client = pebble_client
+        # Set if sha256sum couldn't be run in the workload, so that it's not retried.
+        self._no_remote_digests = False
 
     def can_connect(self) -> bool:
         """Report whether the Pebble API is reachable in the container.
@@ -2790,7 +3002,8 @@ class Container:
         user: str | None = None,
         group_id: int | None = None,
         group: str | None = None,
-    ):
+        if_changed: bool = False,
+    ) -> bool:
         """Write content to a given file path on the remote system.
 
         Note that if another process has the file open on the remote system,
@@ -2798,6 +3011,16 @@ class Container:
         :class:`pebble.PathError`. Use :meth:`Container.exec` for full
         control.
 
+        With ``if_changed=True``, the file is only written if it doesn't
+        already exist with the same content, permissions and (if specified)
+        ownership. This avoids triggering anything that watches the file,
+        such as a service that restarts when its configuration changes.
+        The content is compared using a SHA-256 digest computed in the
+        workload container by running ``sha256sum``, so an unchanged file
+        isn't transferred. If the workload doesn't have ``sha256sum``, the
+        existing file is read back to compare it, which saves writing the
+        file but not transferring it.
+
         Args:
             path: Path of the file to write to on the remote system.
             source: Source of data to write. This is either a concrete str or
@@ -2816,7 +3039,31 @@ class Container:
             group_id: Group ID (GID) for file. May only be specified with ``user_id`` or ``user``.
             group: Group name for file. Group's GID must match ``group_id`` if
                 both are specified. May only be specified with ``user_id`` or ``user``.
+            if_changed: If true, compare the content and metadata with the
+                existing file, and skip writing the file if they're the same.
+                The source is read into memory to do this.
+
+        Returns:
+            True if the file was written, or False if ``if_changed`` is true
+            and the file was already up to date.
         """
+        if if_changed:
+            content = self._read_source(source, encoding)
+            expected = pebble.FileInfo(
+                path=str(path),
+                name=PurePath(path).name,
+                type=pebble.FileType.FILE,
+                size=len(content),
+                permissions=permissions if permissions is not None else 0o644,
+                last_modified=datetime.datetime.now(),
+                user_id=user_id,
+                user=user,
+                group_id=group_id,
+                group=group,
+            )
+            if self._is_unchanged(expected, io.BytesIO(content)):
+                return False
+            source = content
         self._pebble.push(
             path,
             source,
@@ -2828,6 +3075,116 @@ class Container:
             group_id=group_id,
             group=group,
         )
+        return True
+
+    @staticmethod
+    def _read_source(source: bytes | str | BinaryIO | TextIO, encoding: str) -> bytes:
+        if not isinstance(source, (str, bytes)):
+            source = source.read()
+        if isinstance(source, str):
+            return source.encode(encoding)
+        return source
+
+    def _is_unchanged(self, expected: pebble.FileInfo, content: BinaryIO) -> bool:
+        """Report whether a remote file has the expected metadata and content.
+
+        Ownership is only compared for the fields that are set in ``expected``.
+        """
+        try:
+            (info,) = self._pebble.list_files(expected.path, itself=True)
+        except pebble.APIError as err:
+            if err.code == 404:
+                return False
+            raise
+        if not self._same_metadata(expected, info):
+            return False
+        digests = self._remote_digests([expected.path])
+        if digests is not None and digests[0] is not None:
+            return digests[0] == self._digest(content)
+        try:
+            with self._pebble.pull_stream(expected.path, encoding=None) as remote:
+                return self._same_content(content, remote)
+        except pebble.PathError:
+            return False
+
+    def _remote_digests(self, paths: Sequence[str]) -> list[str | None] | None:
+        """Get the SHA-256 digests of remote files by running ``sha256sum`` in the workload.
+
+        Returns:
+            The hex digests, in the same order as paths, with None for any file
+            that couldn't be read. None if ``sha256sum`` couldn't be run, for
+            example because the workload image doesn't have it.
+        """
+        if self._no_remote_digests:
+            return None
+        try:
+            stdout, _ = self.exec(['sha256sum', '--', *paths]).wait_output()
+        except pebble.ExecError as e:  # type: ignore
+            err = typing.cast('pebble.ExecError[str]', e)
+            if err.exit_code in (126, 127):
+                # The shell convention for a command that can't be run.
+                logger.debug('Could not compute digests in the workload: %s', err)
+                self._no_remote_digests = True
+                return None
+            # Some of the files couldn't be read, but the others were digested.
+            stdout = err.stdout or ''
+        except pebble.Error as e:
+            logger.debug('Could not compute digests in the workload: %s', e)
+            self._no_remote_digests = True
+            return None
+        digests: dict[str, str] = {}
+        for line in stdout.split('\n'):
+            # Each line is the digest and the path, with a leading backslash
+            # if the path needed escaping.
+            escaped = line.startswith('\\')
+            line = line.removeprefix('\\')
+            digest, path = line[:64], line[66:]
+            if not _SHA256_HEX.fullmatch(digest):
+                continue
+            if escaped:
+                path = _SHA256SUM_ESCAPE.sub(lambda m: _SHA256SUM_UNESCAPE.get(m[1], m[0]), path)
+            digests[path] = digest
+        return [digests.get(path) for path in paths]
+
+    @staticmethod
+    def _digest(content: BinaryIO) -> str:
+        digest = hashlib.sha256()
+        while chunk := content.read(64 * 1024):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _same_metadata(expected: pebble.FileInfo, info: pebble.FileInfo) -> bool:
+        if info.type is not pebble.FileType.FILE:
+            return False
+        if info.size != expected.size or info.permissions != expected.permissions:
+            return False
+        ownership = [
+            (expected.user_id, info.user_id),
+            (expected.user, info.user),
+            (expected.group_id, info.group_id),
+            (expected.group, info.group),
+        ]
+        return all(want is None or want == got for want, got in ownership)
+
+    @staticmethod
+    def _same_content(a: BinaryIO, b: BinaryIO) -> bool:
+        """Compare two binary streams, stopping at the first difference."""
+        chunk_size = 64 * 1024
+        while True:
+            chunk = a.read(chunk_size)
+            # Read exactly as much from the other stream, which may return
+            # less than asked for.
+            other = bytearray()
+            while len(other) < len(chunk):
+                data = b.read(len(chunk) - len(other))
+                if not data:
+                    break
+                other.extend(data)
+            if chunk != other:
+                return False
+            if not chunk:
+                return not b.read(1)
 
     def list_files(
         self, path: str | PurePath, *, pattern: str | None = None, itself: bool = False
@@ -2898,6 +3255,148 @@ class Container:
             dest_dir: Remote destination directory inside which the source
                 dir/files will be placed. This must be an absolute path.
         """
+        errors: list[tuple[str, Exception]] = []
+        files: list[_FileToCopy] = []
+        failed: set[str] = set()
+        for file in self._list_local(source_path, dest_dir, errors):
+            source, info, dstpath = file
+            if source in failed:
+                continue
+            if info.type is not pebble.FileType.DIRECTORY:
+                files.append(file)
+                continue
+            try:
+                self.make_dir(dstpath, make_parents=True)
+            except pebble.Error as err:
+                errors.append((source, err))
+                failed.add(source)
+        errors.extend(self._push_files(files))
+        if errors:
+            raise MultiPushPullError('failed to push one or more files', errors)
+
+    def sync_path(
+        self,
+        source_path: str | Path | Iterable[str | Path],
+        dest_dir: str | PurePath,
+    ) -> list[str]:
+        """Recursively push a local path or files to the remote system, skipping unchanged files.
+
+        This works like :meth:`push_path`, but only pushes the files that are
+        missing on the remote system, or whose size, content, permissions or
+        ownership differ from the local file. Unchanged files aren't written,
+        so anything that watches them (such as a service that restarts when
+        its configuration changes) isn't triggered, and only changed content
+        is transferred. Directories are only created if they don't exist.
+
+        Files whose metadata matches are compared using SHA-256 digests
+        computed in the workload container by running ``sha256sum``, so
+        unchanged files aren't transferred. If the workload doesn't have
+        ``sha256sum``, those files are read back to compare them instead.
+
+        Args:
+            source_path: A single path or list of paths to push to the remote
+                system, as for :meth:`push_path`.
+            dest_dir: Remote destination directory inside which the source
+                dir/files will be placed. This must be an absolute path.
+
+        Returns:
+            The destination paths of the files that were pushed.
+
+        Raises:
+            MultiPushPullError: If there were errors comparing or pushing any
+                of the files. The other files are still synced.
+        """
+        errors: list[tuple[str, Exception]] = []
+        local = self._list_local(source_path, dest_dir, errors)
+
+        # List each destination directory once, rather than each file.
+        listings: dict[Path, dict[str, pebble.FileInfo]] = {}
+
+        def remote_info(path: Path) -> pebble.FileInfo | None:
+            if path.parent not in listings:
+                try:
+                    infos = self.list_files(path.parent)
+                except pebble.APIError as err:
+                    if err.code != 404:
+                        raise
+                    infos = []
+                listings[path.parent] = {info.name: info for info in infos}
+            return listings[path.parent].get(path.name)
+
+        changed: list[_FileToCopy] = []
+        maybe_unchanged: list[_FileToCopy] = []
+        failed: set[str] = set()
+        for file in local:
+            source, info, dstpath = file
+            if source in failed:
+                continue
+            try:
+                remote = remote_info(dstpath)
+                if info.type is pebble.FileType.DIRECTORY:
+                    if remote is None or remote.type is not pebble.FileType.DIRECTORY:
+                        self.make_dir(dstpath, make_parents=True)
+                elif remote is not None and self._same_metadata(info, remote):
+                    maybe_unchanged.append(file)
+                else:
+                    changed.append(file)
+            except pebble.Error as err:
+                errors.append((source, err))
+                failed.add(source)
+
+        # The content of files with matching metadata is compared using
+        # digests computed remotely. If that's not possible, it's compared by
+        # reading it back, in batches. Neither triggers any watchers.
+        unknown: list[_FileToCopy] = []
+        for start in range(0, len(maybe_unchanged), _MAX_BATCH_FILES):
+            batch = maybe_unchanged[start : start + _MAX_BATCH_FILES]
+            digests = self._remote_digests([str(dstpath) for _, _, dstpath in batch])
+            if digests is None:
+                unknown.extend(batch)
+                continue
+            for file, digest in zip(batch, digests, strict=True):
+                _, info, _ = file
+                if digest is None:
+                    unknown.append(file)
+                    continue
+                try:
+                    with open(info.path, 'rb') as f:
+                        if self._digest(f) != digest:
+                            changed.append(file)
+                except OSError:
+                    changed.append(file)
+        for batch in self._batches(unknown):
+            try:
+                remote_files = self._pebble.pull_many(
+                    [str(dstpath) for _, _, dstpath in batch], encoding=None
+                )
+            except pebble.Error:
+                changed.extend(batch)
+                continue
+            for file in batch:
+                _, info, dstpath = file
+                remote = remote_files[str(dstpath)]
+                if isinstance(remote, pebble.PathError):
+                    changed.append(file)
+                    continue
+                with remote, open(info.path, 'rb') as f:
+                    if not self._same_content(f, remote):
+                        changed.append(file)
+
+        errors.extend(self._push_files(changed))
+        if errors:
+            raise MultiPushPullError('failed to sync one or more files', errors)
+        return [str(dstpath) for _, _, dstpath in changed]
+
+    def _list_local(
+        self,
+        source_path: str | Path | Iterable[str | Path],
+        dest_dir: str | PurePath,
+        errors: list[tuple[str, Exception]],
+    ) -> list[_FileToCopy]:
+        """List the local files and directories to push, and where to push them.
+
+        Errors listing a source path are added to ``errors``.
+        """
         if hasattr(source_path, '__iter__') and not isinstance(source_path, str):
             source_paths = typing.cast('Iterable[str | Path]', source_path)
         else:
@@ -2910,29 +3409,63 @@ class Container:
             files = [self._build_fileinfo(f) for f in paths]
             return files
 
+        files: list[_FileToCopy] = []
+        for path in source_paths:
+            try:
+                for info in Container._list_recursive(local_list, path):
+                    dstpath = self._build_destpath(info.path, path, dest_dir)
+                    files.append((str(path), info, dstpath))
+            except OSError as err:  # noqa: PERF203
+                errors.append((str(path), err))
+        return files
+
+    def _push_files(self, files: list[_FileToCopy]) -> list[tuple[str, Exception]]:
+        """Push local files in batches, returning any errors."""
+        # Files to push are grouped by ownership and permissions, so that each
+        # group can be pushed in batches with the same options.
+        groups: dict[tuple[Any, ...], list[_FileToCopy]] = {}
+        for file in files:
+            info = file[1]
+            key = (info.permissions, info.user_id, info.user, info.group_id, info.group)
+            groups.setdefault(key, []).append(file)
         errors: list[tuple[str, Exception]] = []
-        for source_path in source_paths:
+        for group in groups.values():
+            for batch in self._batches(group):
+                errors.extend(self._push_batch(batch))
+        return errors
+
+    def _push_batch(self, batch: list[_FileToCopy]) -> list[tuple[str, Exception]]:
+        """Push a batch of local files that have the same ownership and permissions."""
+        errors: list[tuple[str, Exception]] = []
+        source_paths: dict[str, str] = {}
+        with contextlib.ExitStack() as stack:
+            sources: list[tuple[str | PurePath, BinaryIO]] = []
+            for source_path, info, dstpath in batch:
+                try:
+                    src = stack.enter_context(open(info.path, 'rb'))
+                except OSError as err:
+                    errors.append((source_path, err))
+                    continue
+                sources.append((dstpath, src))
+                source_paths[str(dstpath)] = source_path
+            if not sources:
+                return errors
+            info = batch[0][1]
             try:
-                for info in Container._list_recursive(local_list, source_path):
-                    dstpath = self._build_destpath(info.path, source_path, dest_dir)
-                    if info.type is pebble.FileType.DIRECTORY:
-                        self.make_dir(dstpath, make_parents=True)
-                        continue
-                    with open(info.path, 'rb') as src:
-                        self.push(
-                            dstpath,
-                            src,
-                            make_dirs=True,
-                            permissions=info.permissions,
-                            user_id=info.user_id,
-                            user=info.user,
-                            group_id=info.group_id,
-                            group=info.group,
-                        )
+                path_errors = self._pebble.push_many(
+                    sources,
+                    make_dirs=True,
+                    permissions=info.permissions,
+                    user_id=info.user_id,
+                    user=info.user,
+                    group_id=info.group_id,
+                    group=info.group,
+                )
             except (OSError, pebble.Error) as err:
-                errors.append((str(source_path), err))
-        if errors:
-            raise MultiPushPullError('failed to push one or more files', errors)
+                errors.extend((path, err) for path in dict.fromkeys(source_paths.values()))
+            else:
+                errors.extend((source_paths[path], err) for path, err in path_errors.items())
+        return errors
 
     def pull_path(
         self,
@@ -2994,6 +3527,7 @@ class Container:
         dest_dir = Path(dest_dir)
 
         errors: list[tuple[str, Exception]] = []
+        files: list[_FileToCopy] = []
         for source_path in source_paths:
             try:
                 for info in Container._list_recursive(self.list_files, source_path):
@@ -3001,15 +3535,69 @@ class Container:
                     if info.type is pebble.FileType.DIRECTORY:
                         dstpath.mkdir(parents=True, exist_ok=True)
                         continue
-                    dstpath.parent.mkdir(parents=True, exist_ok=True)
-                    with self.pull(info.path, encoding=None) as src:
-                        with dstpath.open(mode='wb') as dst:
-                            shutil.copyfileobj(src, dst)
+                    files.append((str(source_path), info, dstpath))
             except (OSError, pebble.Error) as err:
                 errors.append((str(source_path), err))
+        for batch in self._batches(files):
+            errors.extend(self._pull_batch(batch))
         if errors:
             raise MultiPushPullError('failed to pull one or more files', errors)
 
+    def _pull_batch(self, batch: list[_FileToCopy]) -> list[tuple[str, Exception]]:
+        """Pull a batch of remote files to their local destinations."""
+        try:
+            results = self._pebble.pull_many([info.path for _, info, _ in batch], encoding=None)
+        except (OSError, pebble.Error) as err:
+            return [(path, err) for path in dict.fromkeys(path for path, _, _ in batch)]
+        errors: list[tuple[str, Exception]] = []
+        for source_path, info, dstpath in batch:
+            result = results[info.path]
+            if isinstance(result, pebble.PathError):
+                errors.append((source_path, result))
+                continue
+            try:
+                with result as src:
+                    dstpath.parent.mkdir(parents=True, exist_ok=True)
+                    with dstpath.open(mode='wb') as dst:
+                        shutil.copyfileobj(src, dst)
+            except OSError as err:
+                errors.append((source_path, err))
+        return errors
+
+    @staticmethod
+    def _batches(
+        files: Iterable[_FileToCopy],
+    ) -> Generator[list[_FileToCopy], None, None]:
+        """Split files to copy into batches that can each be sent in a single Pebble request.
+
+        A batch has at most ``_MAX_BATCH_FILES`` files, and at most
+        ``_MAX_BATCH_BYTES`` bytes of content unless it's a single larger file.
+        A source or destination path only appears once in each batch.
+        """
+        batch: list[_FileToCopy] = []
+        size = 0
+        src_paths: set[str] = set()
+        dst_paths: set[Path] = set()
+        for file in files:
+            _, info, dstpath = file
+            file_size = info.size or 0
+            if batch and (
+                len(batch) >= _MAX_BATCH_FILES
+                or size + file_size > _MAX_BATCH_BYTES
+                or info.path in src_paths
+                or dstpath in dst_paths
+            ):
+                yield batch
+                batch, size = [], 0
+                src_paths.clear()
+                dst_paths.clear()
+            batch.append(file)
+            size += file_size
+            src_paths.add(info.path)
+            dst_paths.add(dstpath)
+        if batch:
+            yield batch
+
     @staticmethod
     def _build_fileinfo(path: str | Path) -> pebble.FileInfo:
         """Constructs a FileInfo object by stat'ing a local path."""
@@ -3355,7 +3943,7 @@ class ContainerMapping(Mapping[str, Container]):
         return repr(self._containers)
 
 
-class ServiceInfoMapping(Mapping[str, pebble.ServiceInfo]):
+class ServiceInfoMapping(Mapping[str, 'pebble.ServiceInfo']):
     """Map of service names to :class:`pebble.ServiceInfo` objects.
 
     This is done as a mapping object rather than a plain dictionary so that we
@@ -3378,7 +3966,7 @@ class ServiceInfoMapping(Mapping[str, pebble.ServiceInfo]):
         return repr(self._services)
 
 
-class CheckInfoMapping(Mapping[str, pebble.CheckInfo]):
+class CheckInfoMapping(Mapping[str, 'pebble.CheckInfo']):
     """Map of check names to :class:`ops.pebble.CheckInfo` objects.
 
     This is done as a mapping object rather than a plain dictionary so that we
@@ -3516,6 +4104,73 @@ def _format_action_result_dict(
     return output_
 
 
+def _prefetch_relation_data(relations: Iterable[Relation], backend: _ModelBackend):
+    """Load all the databags of the relations that haven't been loaded yet."""
+    has_app_data = backend._juju_context.version.has_app_data()
+    is_leader: bool | None = None
+    contents: list[RelationDataContent] = []
+    for relation in relations:
+        for content in relation.data.values():
+            if content._lazy_data is not None or (content._is_app and not has_app_data):
+                continue
+            # Only the leader can read the local application databag, except in
+            # peer relations; don't even try, since failures are logged as
+            # security events.
+            if (
+                content._is_app
+                and content._entity.name == backend.app_name
+                and relation.app is not content._entity
+            ):
+                if is_leader is None:
+                    is_leader = backend.is_leader()
+                if not is_leader:
+                    continue
+            contents.append(content)
+    results = _run_concurrently(
+        backend.relation_get,
+        [(content.relation.id, content._entity.name, content._is_app) for content in contents],
+    )
+    for content, result in zip(contents, results, strict=True):
+        if isinstance(result, RelationNotFoundError):
+            # Dead relations tell no tales (and have no data).
+            content._lazy_data = {}
+        elif not isinstance(result, Exception):
+            content._lazy_data = result
+
+
+def _run_concurrently(
+    func: Callable[..., _T], args_list: Sequence[tuple[Any, ...]]
+) -> list[_T | ModelError]:
+    """Call func once with each of the argument tuples, running some of the calls in parallel.
+
+    Each hook command runs in its own process, so running several at once
+    overlaps their start-up costs. At most ``_MAX_CONCURRENT_HOOK_COMMANDS``
+    calls run at the same time.
+
+    Returns:
+        The results, in the same order as args_list. If a call raises a
+        :class:`ModelError`, the exception is returned in place of its result.
+    """
+
+    def call(args: tuple[Any, ...]) -> _T | ModelError:
+        try:
+            return func(*args)
+        except ModelError as e:
+            return e
+
+    if len(args_list) <= 1:
+        return [call(args) for args in args_list]
+    max_workers = min(_MAX_CONCURRENT_HOOK_COMMANDS, len(args_list))
+    load_lazy_modules()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Run each call in a copy of the current context, so that the spans
+        # for the hook commands are children of the current span.
+        futures = [
+            executor.submit(contextvars.copy_context().run, call, args) for args in args_list
+        ]
+        return [future.result() for future in futures]
+
+
 class _ModelBackend:
     """Represents the connection between the Model representation and talking to Juju.
 
@@ -3551,6 +4206,50 @@ class _ModelBackend:
         self._hook_is_running = ''
         self._is_recursive = contextvars.ContextVar('_is_recursive', default=False)
 
+        # Results of read-only hook commands, which don't change during a
+        # dispatch unless the charm changes them. The backend only lives for
+        # one dispatch, so nothing is cached across dispatches.
+        self._cache: dict[tuple[Any, ...], Any] = {}
+        self.cache_hits: collections.Counter[str] = collections.Counter()
+        """The number of calls, by hook command, that were answered from the cache."""
+        self.cache_misses: collections.Counter[str] = collections.Counter()
+        """The number of calls, by hook command, that ran the hook command."""
+        # Hook commands can be run from worker threads, see _run_concurrently.
+        self._cache_lock = threading.Lock()
+
+        # If set, relation_set only records the changes, keyed by relation ID
+        # and whether it's the app databag, until flush_relation_data is called.
+        self._buffer_relation_data = False
+        self._pending_relation_data: dict[tuple[int, bool], dict[str, str]] = {}
+
+        # If set, status_set only records the latest status, keyed by whether
+        # it's the app status, until flush_status is called.
+        self._defer_status = False
+        self._pending_status: dict[bool, tuple[_SettableStatusName, str]] = {}
+
+    def _cached(self, key: tuple[Any, ...], fetch: Callable[[], _T], use_cache: bool) -> _T:
+        """Return the cached result for key, or fetch and cache it.
+
+        A copy is returned, so that callers can't change what's cached.
+        """
+        cmd = key[0]
+        with self._cache_lock:
+            if use_cache and key in self._cache:
+                self.cache_hits[cmd] += 1
+                return copy.deepcopy(self._cache[key])
+            self.cache_misses[cmd] += 1
+        result = fetch()
+        with self._cache_lock:
+            self._cache[key] = result
+        return copy.deepcopy(result)
+
+    def _invalidate(self, *key: Any):
+        """Remove the cached results for keys that start with the given values."""
+        with self._cache_lock:
+            for cached_key in list(self._cache):
+                if cached_key[: len(key)] == key:
+                    del self._cache[cached_key]
+
     @contextlib.contextmanager
     def _prevent_recursion(self):
         token = self._is_recursive.set(True)
@@ -3569,7 +4268,7 @@ class _ModelBackend:
         mgr = self._prevent_recursion() if cmd == 'juju-log' else tracer.start_as_current_span(cmd)
         try:
             with mgr as span:
-                if span is not None:
+                if span is not None and span.is_recording():
                     span.set_attribute('call', 'subprocess.run')
                     if args:
                         span.set_attribute('args', args)
@@ -3652,7 +4351,17 @@ class _ModelBackend:
         with self._wrap_hookcmd(
             'relation-get', relation_id=relation_id, unit=member_name, app=is_app
         ):
-            return hookcmds.relation_get(relation_id, unit=member_name, app=is_app)
+            data = hookcmds.relation_get(relation_id, unit=member_name, app=is_app)
+        pending = self._pending_relation_data.get((relation_id, is_app))
+        if pending and member_name == (self.app_name if is_app else self.unit_name):
+            # Juju returns what was set earlier in the hook, so include the
+            # changes that haven't been written yet.
+            for key, value in pending.items():
+                if value == '':
+                    data.pop(key, None)
+                else:
+                    data[key] = value
+        return data
 
     def relation_set(self, relation_id: int, data: Mapping[str, str], is_app: bool) -> None:
         if not data:
@@ -3666,15 +4375,42 @@ class _ModelBackend:
                 f'{self._juju_context.version}'
             )
 
+        if self._buffer_relation_data:
+            self._pending_relation_data.setdefault((relation_id, is_app), {}).update(data)
+            return
         with self._wrap_hookcmd('relation-set', relation_id=relation_id, data=data, app=is_app):
             hookcmds.relation_set(data, relation_id, app=is_app)
 
+    def flush_relation_data(self) -> None:
+        """Write the buffered relation data changes, with one relation-set per databag.
+
+        Changes to a relation that has gone away since they were made are
+        logged and dropped, as there's no longer anywhere to write them.
+        """
+        while self._pending_relation_data:
+            (relation_id, is_app), data = next(iter(self._pending_relation_data.items()))
+            try:
+                with self._wrap_hookcmd(
+                    'relation-set', relation_id=relation_id, data=data, app=is_app
+                ):
+                    hookcmds.relation_set(data, relation_id, app=is_app)
+            except RelationNotFoundError:
+                logger.warning(
+                    'Dropping buffered changes to relation %d, which no longer exists: %s',
+                    relation_id,
+                    sorted(data),
+                )
+            del self._pending_relation_data[relation_id, is_app]
+
     def relation_model_get(self, relation_id: int) -> dict[str, Any]:
         with self._wrap_hookcmd('relation-model-get', relation_id=relation_id):
             raw = hookcmds.relation_model_get(relation_id)
         return {'uuid': raw.uuid}
 
-    def config_get(self) -> dict[str, bool | int | float | str]:
+    def config_get(self, *, use_cache: bool = True) -> dict[str, bool | int | float | str]:
+        return self._cached(('config-get',), self._config_get, use_cache)
+
+    def _config_get(self) -> dict[str, bool | int | float | str]:
         with self._wrap_hookcmd('config-get'):
             return hookcmds.config_get()
 
@@ -3722,13 +4458,26 @@ class _ModelBackend:
         finally:
             shutil.rmtree(str(tmpdir))
 
-    def status_get(self, *, is_app: bool = False) -> _StatusDict:
+    def status_get(self, *, is_app: bool = False, use_cache: bool = True) -> _StatusDict:
         """Get a status of a unit or an application.
 
         Args:
             is_app: A boolean indicating whether the status should be retrieved for a unit
                 or an application.
+            use_cache: whether to use the status from an earlier call in this dispatch,
+                if there has been one and the status hasn't been set since. If
+                status is being deferred, this also gives the status that will
+                be set; otherwise Juju is asked, and the status it has now is
+                returned, even if a different one is waiting to be set.
         """
+        pending = self._pending_status.get(is_app)
+        if pending is not None and use_cache:
+            return {'status': pending[0], 'message': pending[1]}
+        return self._cached(
+            ('status-get', is_app), lambda: self._status_get(is_app=is_app), use_cache
+        )
+
+    def _status_get(self, *, is_app: bool) -> _StatusDict:
         with self._wrap_hookcmd('status-get', app=is_app):
             content = hookcmds.status_get(app=is_app)
 
@@ -3756,9 +4505,36 @@ class _ModelBackend:
             raise TypeError('message parameter must be a string')
         if status not in _SETTABLE_STATUS_NAMES:
             raise InvalidStatusError(f'status must be in {_SETTABLE_STATUS_NAMES}, not {status!r}')
+        if self._defer_status:
+            with self._cache_lock:
+                self._pending_status[is_app] = (status, message)
+            return
+        self._invalidate('status-get', is_app)
         with self._wrap_hookcmd('status-set', status=status, message=message, app=is_app):
             hookcmds.status_set(status, message, app=is_app)
 
+    def flush_status(self) -> None:
+        """Set the deferred unit and app statuses.
+
+        Only the last status set for each is sent. It's skipped only if it's
+        the same as the status known from a :meth:`status_get` or an earlier
+        flush in this dispatch; if the status hasn't been read, it's always set.
+        """
+        while self._pending_status:
+            is_app, (status, message) = next(iter(self._pending_status.items()))
+            key = ('status-get', is_app)
+            pending = {'status': status, 'message': message}
+            with self._cache_lock:
+                known = self._cache.get(key)
+            if known != pending:
+                with self._wrap_hookcmd('status-set', status=status, message=message, app=is_app):
+                    hookcmds.status_set(status, message, app=is_app)
+                # Juju now has exactly this status, so a later flush can skip it.
+                with self._cache_lock:
+                    self._cache[key] = pending
+            with self._cache_lock:
+                del self._pending_status[is_app]
+
     def storage_list(self, name: str) -> list[int]:
         with self._wrap_hookcmd('storage-list', name=name):
             storages = hookcmds.storage_list(name)
@@ -3839,13 +4615,24 @@ class _ModelBackend:
                 self._check_for_security_event('juju-log', e.returncode, e.stderr)
                 raise ModelError(e.stderr) from e
 
-    def network_get(self, binding_name: str, relation_id: int | None = None) -> _NetworkDict:
+    def network_get(
+        self, binding_name: str, relation_id: int | None = None, *, use_cache: bool = True
+    ) -> _NetworkDict:
         """Return network info provided by network-get for a given binding.
 
         Args:
             binding_name: A name of a binding (relation name or extra-binding name).
             relation_id: An optional relation id to get network info for.
+            use_cache: whether to use the network info from an earlier call in
+                this dispatch, if there has been one.
         """
+        return self._cached(
+            ('network-get', binding_name, relation_id),
+            lambda: self._network_get(binding_name, relation_id),
+            use_cache,
+        )
+
+    def _network_get(self, binding_name: str, relation_id: int | None) -> _NetworkDict:
         with self._wrap_hookcmd('network-get', binding_name=binding_name, relation_id=relation_id):
             raw = hookcmds.network_get(binding_name, relation_id=relation_id)
         return {
@@ -3889,13 +4676,19 @@ class _ModelBackend:
         """Create a pebble.Client instance from given socket path."""
         return pebble.Client(socket_path=socket_path)
 
-    def planned_units(self) -> int:
+    def planned_units(self, *, use_cache: bool = True) -> int:
         """Count of "planned" units that will run this application.
 
         This will include the current unit, any units that are alive, units that are in the process
         of being started, but will not include units that are being shut down.
 
+        Args:
+            use_cache: whether to use the count from an earlier call in this
+                dispatch, if there has been one.
         """
+        return self._cached(('goal-state',), self._planned_units, use_cache)
+
+    def _planned_units(self) -> int:
         # The goal-state will return the information that we need. Goal state as a general
         # concept is being deprecated, however, in favor of approaches such as the one that we use
         # here.
@@ -3921,6 +4714,35 @@ class _ModelBackend:
         label: str | None = None,
         refresh: bool = False,
         peek: bool = False,
+    ) -> dict[str, str]:
+        if peek:
+            # The latest revision may not be the tracked one, so peeked content
+            # is never cached, and never served from the cache.
+            return self._secret_get(id=id, label=label, peek=True)
+        # Revisions are immutable, and the tracked revision only changes during
+        # a dispatch if the charm refreshes it, so its content can be cached
+        # until then.
+        if refresh:
+            self._invalidate('secret-get')
+        content = self._cached(
+            ('secret-get', id, label),
+            lambda: self._secret_get(id=id, label=label, refresh=refresh),
+            use_cache=True,
+        )
+        if id is not None and label is not None:
+            # Getting by ID also sets the label, so either can be used to look it up now.
+            with self._cache_lock:
+                self._cache['secret-get', id, None] = content
+                self._cache['secret-get', None, label] = copy.deepcopy(content)
+        return content
+
+    def _secret_get(
+        self,
+        *,
+        id: str | None = None,
+        label: str | None = None,
+        refresh: bool = False,
+        peek: bool = False,
     ) -> dict[str, str]:
         # The type: ignore here is because the type checker can't tell that
         # we will always have refresh or peek but not both, and either id or
@@ -3934,6 +4756,13 @@ class _ModelBackend:
             )
 
     def secret_info_get(self, *, id: str | None = None, label: str | None = None) -> SecretInfo:
+        return self._cached(
+            ('secret-info-get', id, label),
+            lambda: self._secret_info_get(id=id, label=label),
+            use_cache=True,
+        )
+
+    def _secret_info_get(self, *, id: str | None, label: str | None) -> SecretInfo:
         if id is not None:
             with self._wrap_hookcmd('secret-info-get', id=id):
                 raw = hookcmds.secret_info_get(id=id)
@@ -3978,6 +4807,9 @@ class _ModelBackend:
                 rotate = rotate or info.rotation
                 # The label fix is needed for Juju < 3.5
                 label = label or info.label
+        # The label and the latest revision may change.
+        self._invalidate('secret-get')
+        self._invalidate('secret-info-get')
         with self._wrap_hookcmd(
             'secret-set',
             id=id,
@@ -4033,19 +4865,30 @@ class _ModelBackend:
         with self._wrap_hookcmd('secret-revoke', id=id, relation_id=relation_id, unit=unit):
             hookcmds.secret_revoke(id, relation_id=relation_id, unit=unit)
 
+    def secret_ids(self) -> list[str]:
+        with self._wrap_hookcmd('secret-ids'):
+            return hookcmds.secret_ids()
+
     def secret_remove(self, id: str, *, revision: int | None = None):
+        self._invalidate('secret-get')
+        self._invalidate('secret-info-get')
         with self._wrap_hookcmd('secret-remove', id=id, revision=revision):
             hookcmds.secret_remove(id, revision=revision)
 
     def open_port(self, protocol: str, port: int | None = None):
+        self._invalidate('opened-ports')
         with self._wrap_hookcmd('open-port', protocol=protocol, port=port):
             hookcmds.open_port(protocol, port)
 
     def close_port(self, protocol: str, port: int | None = None):
+        self._invalidate('opened-ports')
         with self._wrap_hookcmd('close-port', protocol=protocol, port=port):
             hookcmds.close_port(protocol, port)
 
-    def opened_ports(self) -> set[Port]:
+    def opened_ports(self, *, use_cache: bool = True) -> set[Port]:
+        return self._cached(('opened-ports',), self._opened_ports, use_cache)
+
+    def _opened_ports(self) -> set[Port]:
         with self._wrap_hookcmd('opened-ports'):
             results = hookcmds.opened_ports()
         ports: set[Port] = set()
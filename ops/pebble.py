@@ -33,6 +33,7 @@ from __future__ import annotations
 
 import binascii
 import builtins
+import contextlib
 import copy
 import dataclasses
 import datetime
@@ -72,8 +73,6 @@ from typing import (
     TypedDict,
 )
 
-import websocket
-
 from ._private import timeconv, tracer, yaml
 
 # Public as these are used in the Container.add_layer signature
@@ -361,9 +360,31 @@ class _NotProvidedFlag:
 _not_provided = _NotProvidedFlag()
 
 
+class _UnixSocketResponse(http.client.HTTPResponse):
+    """HTTPResponse that hands its connection back to the pool once fully read."""
+
+    _release: Callable[[bool], None] | None = None
+
+    def close(self):
+        if self.fp is not None and self._release is not None:
+            # Closed before the body was read to the end, so there is unread
+            # data on the socket and the connection can't be reused.
+            release, self._release = self._release, None
+            release(False)
+        super().close()
+
+    def _close_conn(self):
+        super()._close_conn()  # type: ignore
+        if self._release is not None:
+            release, self._release = self._release, None
+            release(not self.will_close)
+
+
 class _UnixSocketConnection(http.client.HTTPConnection):
     """Implementation of HTTPConnection that connects to a named Unix socket."""
 
+    response_class = _UnixSocketResponse
+
     def __init__(
         self, host: str, socket_path: str, timeout: _NotProvidedFlag | float = _not_provided
     ):
@@ -383,21 +404,162 @@ class _UnixSocketConnection(http.client.HTTPConnection):
         if self.timeout is not _not_provided:
             self.sock.settimeout(self.timeout)
 
+    def is_dropped(self) -> bool:
+        """Report whether an idle connection can no longer be used.
+
+        An idle keep-alive connection should have nothing to read. If it's
+        readable, the server has closed it (for example, Pebble restarted), or
+        it has sent something we didn't ask for; either way it can't be reused.
+        """
+        if self.sock is None:
+            return True
+        try:
+            readable, _, _ = select.select([self.sock], [], [], 0)
+        except (OSError, ValueError):
+            return True
+        return bool(readable)
+
+
+class _UnixSocketConnectionPool:
+    """Pool of idle keep-alive HTTP connections to a named Unix socket.
+
+    A connection is taken out of the pool for the duration of a request, and
+    returned once its response body has been read to the end. Connections
+    that the server has closed in the meantime (for example, because Pebble
+    restarted) are discarded and replaced by a new connection.
+
+    The ``hits`` and ``misses`` attributes count the requests that reused a
+    pooled connection and the requests that needed a new one, respectively.
+    They're available as :attr:`Client.reused_connections` and
+    :attr:`Client.new_connections`.
+    """
+
+    def __init__(self, socket_path: str, max_idle: int = 4):
+        self.socket_path = socket_path
+        self.max_idle = max_idle
+        self.hits = 0
+        self.misses = 0
+        self._idle: list[_UnixSocketConnection] = []
+        self._lock = threading.Lock()
+
+    def get(
+        self, host: str, timeout: float, reuse: bool = True
+    ) -> tuple[_UnixSocketConnection, bool]:
+        """Return a connection for a request, and whether it's a reused one.
+
+        If reuse is false, always return a new connection.
+        """
+        with self._lock:
+            while reuse and self._idle:
+                conn = self._idle.pop()
+                if conn.is_dropped():
+                    conn.close()
+                    continue
+                self.hits += 1
+                conn.timeout = timeout
+                assert conn.sock is not None
+                conn.sock.settimeout(timeout)
+                return conn, True
+            self.misses += 1
+        return self.new(host, timeout), False
+
+    def new(self, host: str, timeout: float) -> _UnixSocketConnection:
+        """Return a new connection, which will connect when the request is sent."""
+        return _UnixSocketConnection(host, socket_path=self.socket_path, timeout=timeout)
+
+    def put(self, conn: _UnixSocketConnection, reusable: bool):
+        """Return a connection to the pool, or close it if it can't be reused."""
+        with self._lock:
+            if reusable and conn.sock is not None and len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
 
 class _UnixSocketHandler(urllib.request.AbstractHTTPHandler):
-    """Implementation of HTTPHandler that uses a named Unix socket."""
+    """Implementation of HTTPHandler that uses a named Unix socket.
+
+    Unlike urllib's own handlers, connections are kept alive between requests
+    (see :class:`_UnixSocketConnectionPool`).
+    """
 
     def __init__(self, socket_path: str):
         super().__init__()
         self.socket_path = socket_path
+        self.pool = _UnixSocketConnectionPool(socket_path)
+
+    def close(self):
+        """Close any idle connections in the pool."""
+        self.pool.close()
 
     def http_open(self, req: urllib.request.Request):
-        """Override http_open to use a Unix socket connection (instead of TCP)."""
-        return self.do_open(
-            _UnixSocketConnection,  # type:ignore
-            req,
-            socket_path=self.socket_path,
-        )
+        """Override http_open to use a pooled Unix socket connection (instead of TCP)."""
+        host = req.host
+        if not host:
+            raise urllib.error.URLError('no host given')
+
+        headers = dict(req.unredirected_hdrs)
+        headers.update({k: v for k, v in req.headers.items() if k not in headers})
+        headers = {name.title(): val for name, val in headers.items()}
+
+        timeout: float = req.timeout  # type: ignore
+        # The server may close an idle connection just as we send on it, and
+        # then the request is retried on a new connection. A streamed body
+        # (as for push) can't be sent again, so it always gets a new one.
+        resendable = req.data is None or isinstance(req.data, bytes)
+        conn, reused = self.pool.get(host, timeout, reuse=resendable)
+        try:
+            return self._send(conn, req, headers)
+        except urllib.error.URLError as e:
+            # Raised by _send when the request couldn't be sent, so Pebble
+            # hasn't acted on it.
+            if not reused or not isinstance(e.reason, (BrokenPipeError, ConnectionResetError)):
+                raise
+        except ConnectionResetError:
+            # The connection dropped while waiting for the response. Pebble may
+            # already have acted on the request, so only resend it if that's safe.
+            if not reused or req.get_method() != 'GET':
+                raise
+        return self._send(self.pool.new(host, timeout), req, headers)
+
+    def _send(
+        self,
+        conn: _UnixSocketConnection,
+        req: urllib.request.Request,
+        headers: dict[str, str],
+    ) -> _UnixSocketResponse:
+        conn.set_debuglevel(self._debuglevel)  # type: ignore
+        try:
+            try:
+                conn.request(
+                    req.get_method(),
+                    req.selector,
+                    req.data,
+                    headers,
+                    encode_chunked=req.has_header('Transfer-encoding'),
+                )
+            except OSError as err:
+                raise urllib.error.URLError(err) from err
+            response = typing.cast('_UnixSocketResponse', conn.getresponse())
+        except BaseException:
+            conn.close()
+            raise
+
+        if response.fp is None:
+            # No body to read (or it was already empty), so done with the connection.
+            self.pool.put(conn, not response.will_close)
+        else:
+            response._release = lambda reusable: self.pool.put(conn, reusable)
+        response.url = req.get_full_url()
+        response.msg = response.reason  # type: ignore
+        return response
 
 
 def _format_timeout(timeout: float) -> str:
@@ -2131,6 +2293,7 @@ class Client:
     """
 
     _chunk_size = 8192
+    _copy_buffer_size = 1024 * 1024
 
     def __init__(
         self,
@@ -2147,6 +2310,27 @@ class Client:
         self.opener = opener
         self.base_url = base_url
         self.timeout = timeout
+        handlers: list[urllib.request.BaseHandler] = getattr(opener, 'handlers', [])
+        self._pool = next(
+            (h.pool for h in handlers if isinstance(h, _UnixSocketHandler)),
+            None,
+        )
+
+    @property
+    def reused_connections(self) -> int:
+        """The number of requests so far that reused a kept-alive connection.
+
+        This is always zero if the client uses a custom opener.
+        """
+        return self._pool.hits if self._pool is not None else 0
+
+    @property
+    def new_connections(self) -> int:
+        """The number of requests so far that opened a new connection.
+
+        This is always zero if the client uses a custom opener.
+        """
+        return self._pool.misses if self._pool is not None else 0
 
     @classmethod
     def _get_default_opener(cls, socket_path: str) -> urllib.request.OpenerDirector:
@@ -2623,22 +2807,8 @@ class Client:
                 'path': path,
             }
             span.set_attribute('path', path)
-            headers = {'Accept': 'multipart/form-data'}
-            response = self._request_raw('GET', '/v1/files', query, headers)
-
-            options = self._ensure_content_type(response.headers, 'multipart/form-data')
-            boundary = options.get('boundary', '')
-            if not boundary:
-                raise ProtocolError(f'invalid boundary {boundary!r}')
-
-            parser = _FilesParser(boundary)
+            parser = self._read_files(query)
             try:
-                while True:
-                    chunk = response.read(self._chunk_size)
-                    if not chunk:
-                        break
-                    parser.feed(chunk)
-
                 resp = parser.get_response()
                 if resp is None:
                     raise ProtocolError('no "response" field in multipart body')
@@ -2657,15 +2827,189 @@ class Client:
             finally:
                 parser.remove_files()
 
+    @typing.overload
+    def pull_stream(self, path: str | pathlib.PurePath, *, encoding: None) -> BinaryIO: ...
+
+    @typing.overload
+    def pull_stream(self, path: str | pathlib.PurePath, *, encoding: str = 'utf-8') -> TextIO: ...
+
+    def pull_stream(
+        self, path: str | pathlib.PurePath, *, encoding: str | None = 'utf-8'
+    ) -> BinaryIO | TextIO:
+        """Read a file's content from the remote system, as it's received.
+
+        This is like :meth:`pull`, but the file's content is read directly
+        from the connection to Pebble as the returned object is read, rather
+        than first being written to a temporary file. This is more efficient
+        for large files, but the file must be read to the end (or closed)
+        before Pebble has finished sending it.
+
+        Args:
+            path: Path of the file to read from the remote system.
+            encoding: Encoding to use for decoding the file's bytes to str,
+                or ``None`` to specify no decoding.
+
+        Returns:
+            A readable file-like object, whose read() method will return str
+            objects decoded according to the specified encoding, or bytes if
+            encoding is ``None``. The binary object also supports ``readinto``.
+
+        Raises:
+            PathError: If there was an error reading the file at path, for
+                example, if the file doesn't exist or is a directory.
+        """
+        path = str(path)
+        with tracer.start_as_current_span('pebble pull_stream') as span:
+            span.set_attribute('path', path)
+            query = {'action': 'read', 'path': path}
+            headers = {'Accept': 'multipart/form-data'}
+            response = self._request_raw('GET', '/v1/files', query, headers)
+            try:
+                options = self._ensure_content_type(response.headers, 'multipart/form-data')
+                boundary = options.get('boundary', '')
+                if not boundary:
+                    raise ProtocolError(f'invalid boundary {boundary!r}')
+                raw = _FileStream(response, boundary, path, self._chunk_size)
+            except BaseException:
+                response.close()
+                raise
+            stream = io.BufferedReader(raw, buffer_size=self._chunk_size)
+            if encoding is None:
+                return typing.cast('BinaryIO', stream)
+            # As for pull, newline='' serves the line endings as-is.
+            return typing.cast('TextIO', io.TextIOWrapper(stream, encoding=encoding, newline=''))
+
+    def pull_to(self, path: str | pathlib.PurePath, dest: str | os.PathLike[str] | BinaryIO):
+        """Copy a file from the remote system to a local file.
+
+        The file's content is streamed from Pebble straight to the
+        destination (see :meth:`pull_stream`), without an intermediate
+        temporary file.
+
+        Args:
+            path: Path of the file to read from the remote system.
+            dest: Local path to write the content to, or a writable binary
+                file-like object. If it's a path and the copy fails part way,
+                the partially written file is removed.
+
+        Raises:
+            PathError: If there was an error reading the file at path, for
+                example, if the file doesn't exist or is a directory.
+        """
+        with self.pull_stream(path, encoding=None) as src:
+            if not isinstance(dest, (str, os.PathLike)):
+                shutil.copyfileobj(src, dest, self._copy_buffer_size)
+                return
+            try:
+                with open(dest, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, self._copy_buffer_size)
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.remove(dest)
+                raise
+
+    @typing.overload
+    def pull_many(
+        self, paths: Iterable[str | pathlib.PurePath], *, encoding: None
+    ) -> dict[str, BinaryIO | PathError]: ...
+
+    @typing.overload
+    def pull_many(
+        self, paths: Iterable[str | pathlib.PurePath], *, encoding: str = 'utf-8'
+    ) -> dict[str, TextIO | PathError]: ...
+
+    def pull_many(
+        self, paths: Iterable[str | pathlib.PurePath], *, encoding: str | None = 'utf-8'
+    ) -> dict[str, BinaryIO | PathError] | dict[str, TextIO | PathError]:
+        """Read the content of several files from the remote system, in a single request.
+
+        This is like calling :meth:`pull` for each path, but uses a single API
+        call. An error reading one of the files doesn't raise; instead, the
+        :class:`PathError` is returned in place of that file's content.
+
+        Args:
+            paths: Paths of the files to read from the remote system.
+            encoding: Encoding to use for decoding the files' bytes to str,
+                or ``None`` to specify no decoding.
+
+        Returns:
+            A dict mapping each path to either a readable file-like object (as
+            returned by :meth:`pull`), or the :class:`PathError` for that path.
+        """
+        path_list = list(dict.fromkeys(str(path) for path in paths))
+        if not path_list:
+            return {}
+        with tracer.start_as_current_span('pebble pull_many') as span:
+            span.set_attribute('paths', path_list)
+            parser = self._read_files({'action': 'read', 'path': path_list})
+            results: dict[str, _TextOrBinaryIO | PathError] = {}
+            try:
+                resp = parser.get_response()
+                if resp is None:
+                    raise ProtocolError('no "response" field in multipart body')
+                errors = self._path_errors(resp, path_list)
+
+                filenames = set(parser.filenames())
+                unexpected = filenames.difference(path_list)
+                if unexpected:
+                    raise ProtocolError(f'paths not expected: {sorted(unexpected)!r}')
+                for path in path_list:
+                    if path in errors:
+                        results[path] = errors[path]
+                    elif path in filenames:
+                        results[path] = parser.get_file(path, encoding)
+                    else:
+                        raise ProtocolError(f'no file content for {path!r} in multipart response')
+            except BaseException:
+                for result in results.values():
+                    if not isinstance(result, PathError):
+                        result.close()
+                raise
+            finally:
+                parser.remove_files()
+            return results  # type: ignore
+
+    def _read_files(self, query: dict[str, Any]) -> _FilesParser:
+        """Make a files read request and parse the multipart response."""
+        headers = {'Accept': 'multipart/form-data'}
+        response = self._request_raw('GET', '/v1/files', query, headers)
+
+        options = self._ensure_content_type(response.headers, 'multipart/form-data')
+        boundary = options.get('boundary', '')
+        if not boundary:
+            raise ProtocolError(f'invalid boundary {boundary!r}')
+
+        parser = _FilesParser(boundary)
+        try:
+            while True:
+                chunk = response.read(self._chunk_size)
+                if not chunk:
+                    break
+                parser.feed(chunk)
+        except BaseException:
+            parser.remove_files()
+            raise
+        return parser
+
+    @classmethod
+    def _raise_on_path_error(cls, resp: _FilesResponse, path: str):
+        errors = cls._path_errors(resp, [path])
+        if path in errors:
+            raise errors[path]
+
     @staticmethod
-    def _raise_on_path_error(resp: _FilesResponse, path: str):
+    def _path_errors(resp: _FilesResponse, paths: Iterable[str]) -> dict[str, PathError]:
+        """Return the errors for the given paths in a files response, keyed by path."""
         result = resp['result'] or []  # in case it's null instead of []
-        paths = {item['path']: item for item in result}
-        if path not in paths:
-            raise ProtocolError(f'path not found in response metadata: {resp}')
-        error = paths[path].get('error')
-        if error:
-            raise PathError(error['kind'], error['message'])
+        items = {item['path']: item for item in result}
+        errors: dict[str, PathError] = {}
+        for path in paths:
+            if path not in items:
+                raise ProtocolError(f'path not found in response metadata: {resp}')
+            error = items[path].get('error')
+            if error:
+                errors[path] = PathError(error['kind'], error['message'])
+        return errors
 
     def push(
         self,
@@ -2717,7 +3061,7 @@ class Client:
                 'files': [info],
             }
 
-            data, content_type = self._encode_multipart(metadata, path, source, encoding)
+            data, content_type = self._encode_multipart(metadata, [(path, source)], encoding)
 
             headers = {
                 'Accept': 'application/json',
@@ -2729,6 +3073,72 @@ class Client:
             # we need to cast the Dict[Any, Any] to _FilesResponse
             self._raise_on_path_error(typing.cast('_FilesResponse', resp), path)
 
+    def push_many(
+        self,
+        files: Iterable[tuple[str | pathlib.PurePath, _IOSource]],
+        *,
+        encoding: str = 'utf-8',
+        make_dirs: bool = False,
+        permissions: int | None = None,
+        user_id: int | None = None,
+        user: str | None = None,
+        group_id: int | None = None,
+        group: str | None = None,
+    ) -> dict[str, PathError]:
+        """Write content to several files on the remote system, in a single request.
+
+        This is like calling :meth:`push` for each file, with the same options
+        for each, but uses a single API call. An error writing one of the
+        files doesn't raise; the other files are still written, and the
+        errors are returned.
+
+        Args:
+            files: Pairs of (path, source), where source is the source of data
+                to write to the path, as for :meth:`push`. Each path must only
+                be given once.
+            encoding: Encoding to use for encoding source str to bytes, or
+                strings read from source if it is a TextIO type. Ignored if
+                source is bytes or BinaryIO.
+            make_dirs: If true, create parent directories if they don't exist.
+            permissions: Permissions (mode) to create files with (Pebble default
+                is 0o644).
+            user_id: User ID (UID) for files.
+            user: Username for files.
+            group_id: Group ID (GID) for files.
+            group: Group name for files.
+
+        Returns:
+            A dict mapping the path of each file that couldn't be written to the
+            :class:`PathError` for it; empty if all the files were written.
+        """
+        sources = [(str(path), source) for path, source in files]
+        if not sources:
+            return {}
+        paths = [path for path, _ in sources]
+        if len(set(paths)) != len(paths):
+            raise ValueError('each path may only be pushed once per request')
+        with tracer.start_as_current_span('pebble push_many') as span:
+            info = self._make_auth_dict(permissions, user_id, user, group_id, group)
+            if make_dirs:
+                info['make-dirs'] = True
+            span.set_attributes(info)  # type: ignore
+            span.set_attribute('paths', paths)
+            metadata = {
+                'action': 'write',
+                'files': [{**info, 'path': path} for path in paths],
+            }
+
+            data, content_type = self._encode_multipart(metadata, sources, encoding)
+
+            headers = {
+                'Accept': 'application/json',
+                'Content-Type': content_type,
+            }
+            response = self._request_raw('POST', '/v1/files', None, headers, data)
+            self._ensure_content_type(response.headers, 'application/json')
+            resp = json.loads(response.read())
+            return self._path_errors(typing.cast('_FilesResponse', resp), paths)
+
     @staticmethod
     def _make_auth_dict(
         permissions: int | None,
@@ -2751,18 +3161,11 @@ class Client:
         return d
 
     def _encode_multipart(
-        self, metadata: dict[str, Any], path: str, source: _IOSource, encoding: str
+        self, metadata: dict[str, Any], files: Sequence[tuple[str, _IOSource]], encoding: str
     ):
         # Python's stdlib mime/multipart handling is screwy and doesn't handle
         # binary properly, so roll our own.
-        if isinstance(source, str):
-            source_io: _AnyStrFileLikeIO = io.StringIO(source)
-        elif isinstance(source, bytes):
-            source_io: _AnyStrFileLikeIO = io.BytesIO(source)
-        else:
-            source_io: _AnyStrFileLikeIO = source
         boundary = binascii.hexlify(os.urandom(16))
-        path_escaped = path.replace('"', '\\"').encode('utf-8')
         content_type = f'multipart/form-data; boundary="{boundary.decode("utf-8")}"'
 
         def generator() -> Generator[bytes, None, None]:
@@ -2774,23 +3177,34 @@ class Client:
                 b'Content-Disposition: form-data; name="request"\r\n',
                 b'\r\n',
                 json.dumps(metadata).encode('utf-8'),
-                b'\r\n',
-                b'--',
-                boundary,
-                b'\r\n',
-                b'Content-Type: application/octet-stream\r\n',
-                b'Content-Disposition: form-data; name="files"; filename="',
-                path_escaped,
-                b'"\r\n',
-                b'\r\n',
             ])
 
-            content: str | bytes = source_io.read(self._chunk_size)
-            while content:
-                if isinstance(content, str):
-                    content = content.encode(encoding)
-                yield content
-                content = source_io.read(self._chunk_size)
+            for path, source in files:
+                if isinstance(source, str):
+                    source_io: _AnyStrFileLikeIO = io.StringIO(source)
+                elif isinstance(source, bytes):
+                    source_io: _AnyStrFileLikeIO = io.BytesIO(source)
+                else:
+                    source_io: _AnyStrFileLikeIO = source
+                path_escaped = path.replace('"', '\\"').encode('utf-8')
+                yield b''.join([
+                    b'\r\n',
+                    b'--',
+                    boundary,
+                    b'\r\n',
+                    b'Content-Type: application/octet-stream\r\n',
+                    b'Content-Disposition: form-data; name="files"; filename="',
+                    path_escaped,
+                    b'"\r\n',
+                    b'\r\n',
+                ])
+
+                content: str | bytes = source_io.read(self._chunk_size)
+                while content:
+                    if isinstance(content, str):
+                        content = content.encode(encoding)
+                    yield content
+                    content = source_io.read(self._chunk_size)
 
             yield b''.join([
                 b'\r\n',
@@ -3133,6 +3547,9 @@ class Client:
             change_id = resp['change']
             task_id = resp['result']['task-id']
 
+            # Imported here, as only exec needs it, and it's slow to import.
+            import websocket
+
             stderr_ws: _WebSocket | None = None
             try:
                 control_ws = self._connect_websocket(task_id, 'control')
@@ -3226,6 +3643,8 @@ class Client:
         sock.settimeout(self.timeout)
         sock.connect(self.socket_path)
         url = self._websocket_url(task_id, websocket_id)
+        import websocket
+
         ws: _WebSocket = websocket.WebSocket(skip_utf8_validation=True)  # type: ignore
         ws.connect(url, socket=sock)
         # Reset to no timeout so connection can be "long polling" when data is
@@ -3572,6 +3991,124 @@ class _FilesParser:
         return typing.cast('_TextOrBinaryIO', file_io)
 
 
+class _FileStream(io.RawIOBase):
+    """A file's content, read straight from a multipart files response.
+
+    Unlike :class:`_FilesParser`, the content isn't written to a temporary
+    file. Instead, the body of the "files" part is read from the HTTP response
+    into the caller's buffer as the stream is read, watching for the boundary
+    that ends it. The "response" part that follows is checked once the
+    content has been read to the end.
+    """
+
+    def __init__(
+        self, response: http.client.HTTPResponse, boundary: str, path: str, chunk_size: int
+    ):
+        super().__init__()
+        self._http_response = response
+        self._boundary = boundary.encode()
+        self._delimiter = b'\r\n--' + self._boundary
+        self._path = path
+        self._chunk_size = chunk_size
+        self._max_lookahead = 8 * 1024 * 1024
+        # Data received but not yet returned. While reading the file content,
+        # this never contains a complete delimiter. The leading CRLF is missing
+        # from the first delimiter, as explained in _FilesParser.
+        self._buf = bytearray(b'\r\n')
+        self._body_done = False
+        self._checked = False
+        self._read_header()
+
+    def _read_header(self):
+        """Read up to the start of the file content, raising if it's not there."""
+        while True:
+            start = self._buf.find(self._delimiter)
+            if start != -1:
+                end = self._buf.find(b'\r\n\r\n', start + len(self._delimiter))
+                if end != -1:
+                    break
+            if len(self._buf) > self._max_lookahead:
+                raise ProtocolError('header terminator not found')
+            chunk = self._http_response.read(self._chunk_size)
+            if not chunk:
+                raise ProtocolError('no "response" field in multipart body')
+            self._buf.extend(chunk)
+
+        line_end = self._buf.index(b'\r\n', start + len(self._delimiter))
+        parser = email.parser.BytesFeedParser()
+        parser.feed(self._buf[line_end + 2 : end + 4])
+        headers = parser.close()
+        name = headers.get_param('name', header='content-disposition')
+        if name != 'files':
+            # Pebble only sends the response part on its own if there was an
+            # error reading the file.
+            del self._buf[:start]
+            self._check_response()
+            raise ProtocolError('no file content in multipart response')
+        filename = headers.get_filename()
+        if filename != self._path:
+            raise ProtocolError(f'path not expected: {filename!r}')
+        del self._buf[: end + 4]
+
+    def _check_response(self):
+        """Parse the rest of the multipart body, and raise if it reports an error."""
+        parser = _FilesParser(self._boundary)
+        try:
+            # _FilesParser adds the missing CRLF that _buf starts with.
+            parser.feed(bytes(self._buf[2:]))
+            self._buf.clear()
+            while True:
+                chunk = self._http_response.read(self._chunk_size)
+                if not chunk:
+                    break
+                parser.feed(chunk)
+            if parser.filenames():
+                raise ProtocolError('single file request resulted in a multi-file response')
+            resp = parser.get_response()
+            if resp is None:
+                raise ProtocolError('no "response" field in multipart body')
+            Client._raise_on_path_error(resp, self._path)
+        finally:
+            parser.remove_files()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        view = memoryview(buffer).cast('B')
+        if not view:
+            return 0
+        # Up to this many bytes at the end of the data could be the start of
+        # the delimiter, so can't be returned until more has been received.
+        keep = len(self._delimiter) - 1
+        while not self._body_done:
+            index = self._buf.find(self._delimiter)
+            available = index if index != -1 else len(self._buf) - keep
+            if available > 0:
+                n = min(available, len(view))
+                with memoryview(self._buf) as buf:
+                    view[:n] = buf[:n]
+                del self._buf[:n]
+                return n
+            if index == 0:
+                self._body_done = True
+                break
+            chunk = self._http_response.read(max(len(view), self._chunk_size))
+            if not chunk:
+                raise ProtocolError('multipart body ended before the file content')
+            self._buf.extend(chunk)
+
+        if not self._checked:
+            self._checked = True
+            self._check_response()
+        return 0
+
+    def close(self):
+        if not self.closed:
+            self._http_response.close()
+        super().close()
+
+
 class _MultipartParser:
     def __init__(
         self,
@@ -3606,6 +4143,7 @@ class _MultipartParser:
 
         self._buf = bytearray()
         self._pos = 0  # current position in buf
+        self._in_body = False  # whether buf starts part way through a part body
         self._done = False  # whether we have found the terminal boundary and are done parsing
         self._header_terminator = b'\r\n\r\n'
 
@@ -3628,12 +4166,12 @@ class _MultipartParser:
         self._buf.extend(data)
 
         while True:
-            # seek to a boundary if we aren't already on one
-            i, n, self._done = _next_part_boundary(self._buf, self._marker)
-            if i == -1 or self._done:
-                return  # waiting for more data or terminal boundary reached
+            if self._pos == 0 and not self._in_body:
+                # seek to a boundary if we aren't already on one
+                i, n, self._done = _next_part_boundary(self._buf, self._marker)
+                if i == -1 or self._done:
+                    return  # waiting for more data or terminal boundary reached
 
-            if self._pos == 0:
                 # parse the part header
                 if self._max_lookahead and len(self._buf) - self._pos > self._max_lookahead:
                     raise ProtocolError('header terminator not found')
@@ -3656,12 +4194,16 @@ class _MultipartParser:
                     self._handle_body(self._buf[self._pos : ii], done=True)
                     self._buf = self._buf[ii:]
                     self._pos = 0
+                    self._in_body = False
                     if self._done:
                         return  # terminal boundary reached
                 elif safe_bound > self._pos:
-                    # write partial body data
+                    # write partial body data, and drop it from the buffer so
+                    # that memory use doesn't grow with the size of the part
                     partial_data = self._buf[self._pos : safe_bound]
-                    self._pos = safe_bound
+                    del self._buf[:safe_bound]
+                    self._pos = 0
+                    self._in_body = True
                     self._handle_body(partial_data)
                     return  # waiting for more data
                 else:
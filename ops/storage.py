@@ -16,6 +16,8 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
 import os
 import pickle
@@ -26,7 +28,7 @@ import subprocess
 from collections.abc import Callable, Generator
 from datetime import timedelta
 from pathlib import Path
-from typing import Any, cast
+from typing import Any, Literal, cast
 
 import yaml
 
@@ -45,6 +47,66 @@ _TupleRepresenterType = Callable[[Any, tuple[Any, ...]], yaml.Node]
 _NoticeGenerator = Generator['_Notice', None, None]
 
 
+def _event_base_path(event_path: str) -> str:
+    """Return the event path without the trailing ``[id]`` event key."""
+    # The notices all have paths that include [id] at the end. If one
+    # was somehow missing, then the split would be the empty string and
+    # match anyway.
+    return event_path.split('[')[0]
+
+
+def _canonical(value: Any) -> Any:
+    """Return an order-independent representation of (simple type) snapshot data.
+
+    Values that compare equal have the same representation, including numbers
+    of different types, like ``True``, ``1`` and ``1.0``.
+    """
+    if isinstance(value, (bool, int)):
+        return int(value)
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else value
+    if isinstance(value, dict):
+        items = ((_canonical(k), _canonical(v)) for k, v in value.items())  # type: ignore
+        return ('dict', tuple(sorted(items, key=repr)))
+    if isinstance(value, (set, frozenset)):
+        return ('set', tuple(sorted((_canonical(v) for v in value), key=repr)))  # type: ignore
+    if isinstance(value, list):
+        return ('list', tuple(_canonical(v) for v in value))  # type: ignore
+    if isinstance(value, tuple):
+        return ('tuple', tuple(_canonical(v) for v in value))  # type: ignore
+    return value
+
+
+def _snapshot_digest(snapshot_data: Any) -> str:
+    """Return a digest of the snapshot data that is equal for equal snapshots."""
+    return hashlib.sha256(repr(_canonical(snapshot_data)).encode()).hexdigest()
+
+
+def _scan_for_equivalent_notice(
+    storage: Any, event_path: str, observer_path: str, method_name: str, snapshot_data: Any
+) -> bool:
+    """Check every notice in storage for one equivalent to the given one.
+
+    This works with any storage, using only its ``notices`` and
+    ``load_snapshot`` methods.
+    """
+    base_path = _event_base_path(event_path)
+    for existing_event_path, existing_observer_path, existing_method_name in storage.notices():
+        if (
+            existing_observer_path != observer_path
+            or existing_method_name != method_name
+            or _event_base_path(existing_event_path) != base_path
+        ):
+            continue
+        try:
+            existing_snapshot_data = storage.load_snapshot(existing_event_path)
+        except NoSnapshotError:
+            existing_snapshot_data = {}
+        if snapshot_data == existing_snapshot_data:
+            return True
+    return False
+
+
 def _run(args: list[str], **kw: Any):
     cmd: str | None = shutil.which(args[0])
     if cmd is None:
@@ -55,11 +117,28 @@ def _run(args: list[str], **kw: Any):
 
 
 class SQLiteStorage:
-    """Storage using SQLite backend."""
+    """Storage using SQLite backend.
+
+    Changes, including notices, are only stored when :meth:`commit` is
+    called, all in one transaction; the database is always in a transaction
+    between commits. Changes made since the last commit are discarded by
+    :meth:`close`, or if the process dies. (Older versions of ops only did
+    this until the first commit, and after that stored each change as it was
+    made.)
+
+    With the ``'performance'`` profile, the database uses write-ahead logging
+    with ``synchronous=NORMAL``, so that a commit appends to the log rather
+    than syncing a rollback journal and the database file. Committed changes
+    survive the process being killed, but the most recent commits may be
+    rolled back if the machine loses power. Once a database has been opened
+    with this profile, it stays in write-ahead logging mode.
+    """
 
     DB_LOCK_TIMEOUT = timedelta(hours=1)
 
-    def __init__(self, filename: Path | str):
+    def __init__(
+        self, filename: Path | str, *, profile: Literal['default', 'performance'] = 'default'
+    ):
         # The isolation_level argument is set to None such that the implicit
         # transaction management behavior of the sqlite3 module is disabled.
 
@@ -72,6 +151,13 @@ class SQLiteStorage:
         self._db = sqlite3.connect(
             str(filename), isolation_level=None, timeout=self.DB_LOCK_TIMEOUT.total_seconds()
         )
+        # Pickled snapshots (None if there is no snapshot) for the handles that
+        # have been loaded, saved or dropped since the last commit, and what is
+        # currently in the database for them, if known. Changed snapshots are
+        # only written to the database on commit.
+        self._snapshots: dict[str, bytes | None] = {}
+        self._stored: dict[str, bytes | None] = {}
+        self._profile = profile
         self._setup()
 
     def _ensure_db_permissions(self, filename: str):
@@ -95,6 +181,12 @@ class SQLiteStorage:
         # Make sure that the database is locked until the connection is closed,
         # not until the transaction ends.
         self._db.execute('PRAGMA locking_mode=EXCLUSIVE')
+        if self._profile == 'performance':
+            # With the exclusive locking mode set first, the write-ahead log
+            # doesn't need a shared memory file. In this mode, synchronous=NORMAL
+            # only syncs the log when it is checkpointed.
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('PRAGMA synchronous=NORMAL')
         c = self._db.execute('BEGIN')
         c.execute("SELECT count(name) FROM sqlite_master WHERE type='table' AND name='snapshot'")
         if c.fetchone()[0] == 0:
@@ -106,16 +198,111 @@ class SQLiteStorage:
                   sequence INTEGER PRIMARY KEY AUTOINCREMENT,
                   event_path TEXT,
                   observer_path TEXT,
-                  method_name TEXT)
+                  method_name TEXT,
+                  event_base_path TEXT,
+                  snapshot_digest TEXT)
                 """)
+        else:
+            self._migrate_notices()
+        self._db.execute('CREATE INDEX IF NOT EXISTS notice_event_path ON notice (event_path)')
+        self._db.execute("""
+            CREATE INDEX IF NOT EXISTS notice_duplicate
+                ON notice (event_base_path, observer_path, method_name, snapshot_digest)
+            """)
+
+    def _migrate_notices(self):
+        """Add the duplicate-detection columns to a notice table from an older version.
+
+        The existing notices are back-filled so that they are found by
+        :meth:`has_equivalent_notice`. This runs in the setup transaction, so
+        if the process dies part-way through, the migration is simply redone.
+        """
+        columns = {row[1] for row in self._db.execute('PRAGMA table_info(notice)')}
+        if 'snapshot_digest' in columns:
+            return
+        logger.debug('Adding duplicate detection columns to the notice table.')
+        self._db.execute('ALTER TABLE notice ADD COLUMN event_base_path TEXT')
+        self._db.execute('ALTER TABLE notice ADD COLUMN snapshot_digest TEXT')
+        c = self._db.execute('SELECT DISTINCT event_path FROM notice')
+        for event_path in [row[0] for row in c.fetchall()]:
+            self._db.execute(
+                'UPDATE notice SET event_base_path=?, snapshot_digest=? WHERE event_path=?',
+                (_event_base_path(event_path), self._digest_for(event_path), event_path),
+            )
+
+    def _digest_for(self, event_path: str) -> str:
+        """Return the digest of the snapshot stored for event_path, or '' if there is none."""
+        raw_data = self._load_raw(event_path)
+        if raw_data is None:
+            return ''
+        return _snapshot_digest(pickle.loads(raw_data))  # noqa: S301
+
+    def _load_raw(self, handle_path: str) -> bytes | None:
+        """Return the pickled snapshot for handle_path, or None if there is none."""
+        if handle_path in self._snapshots:
+            return self._snapshots[handle_path]
+        c = self._db.execute('SELECT data FROM snapshot WHERE handle=?', (handle_path,))
+        row = c.fetchone()
+        raw_data = None if row is None else row[0]
+        self._snapshots[handle_path] = self._stored[handle_path] = raw_data
+        return raw_data
+
+    def _flush(self) -> None:
+        """Write the changed snapshots to the database, in the current transaction."""
+        changed = [
+            (handle_path, raw_data)
+            for handle_path, raw_data in self._snapshots.items()
+            if handle_path not in self._stored or self._stored[handle_path] != raw_data
+        ]
+        if not changed:
+            return
+        self._db.executemany(
+            'REPLACE INTO snapshot VALUES (?, ?)',
+            [(handle_path, raw_data) for handle_path, raw_data in changed if raw_data is not None],
+        )
+        self._db.executemany(
+            'DELETE FROM snapshot WHERE handle=?',
+            [(handle_path,) for handle_path, raw_data in changed if raw_data is None],
+        )
+        self._stored.update(changed)
 
     def close(self) -> None:
-        """Part of the Storage API, close the storage backend."""
+        """Part of the Storage API, close the storage backend.
+
+        Changes that haven't been committed are discarded.
+        """
+        self._snapshots.clear()
+        self._stored.clear()
         self._db.close()
 
     def commit(self) -> None:
-        """Part of the Storage API, commit latest changes in the storage backend."""
+        """Part of the Storage API, commit latest changes in the storage backend.
+
+        The snapshots that have changed since the last commit are written in
+        the same transaction as the notices, so either all of the changes are
+        stored, or none of them are. A new transaction is then started, so
+        later changes are also only stored by the next commit.
+        """
+        self._flush()
         self._db.commit()
+        self._snapshots.clear()
+        self._stored.clear()
+        # Changes after this are also only stored by the next commit.
+        self._db.execute('BEGIN')
+
+    def compact(self) -> None:
+        """Commit, then rebuild the database file to reclaim unused space.
+
+        With the ``'performance'`` profile, the write-ahead log is also
+        checkpointed into the database file and truncated.
+        """
+        self.commit()
+        # VACUUM can't be run in the transaction that commit() starts.
+        self._db.commit()
+        self._db.execute('VACUUM')
+        if self._profile == 'performance':
+            self._db.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        self._db.execute('BEGIN')
 
     # There's commit but no rollback. For abort to be supported, we'll need logic that
     # can rollback decisions made by third-party code in terms of the internal state
@@ -132,8 +319,7 @@ class SQLiteStorage:
             might be a dict/tuple/int, but must only contain 'simple' Python types.
         """
         # Use pickle for serialization, so the value remains portable.
-        raw_data = pickle.dumps(snapshot_data)
-        self._db.execute('REPLACE INTO snapshot VALUES (?, ?)', (handle_path, raw_data))
+        self._snapshots[handle_path] = pickle.dumps(snapshot_data)
 
     def load_snapshot(self, handle_path: str) -> Any:
         """Part of the Storage API, retrieve a snapshot that was previously saved.
@@ -144,22 +330,21 @@ class SQLiteStorage:
         Raises:
             NoSnapshotError: if there is no snapshot for the given handle_path.
         """
-        c = self._db.cursor()
-        c.execute('SELECT data FROM snapshot WHERE handle=?', (handle_path,))
-        row = c.fetchone()
-        if row:
-            return pickle.loads(row[0])  # noqa: S301
-        raise NoSnapshotError(handle_path)
+        raw_data = self._load_raw(handle_path)
+        if raw_data is None:
+            raise NoSnapshotError(handle_path)
+        return pickle.loads(raw_data)  # noqa: S301
 
     def drop_snapshot(self, handle_path: str):
         """Part of the Storage API, remove a snapshot that was previously saved.
 
         Dropping a snapshot that doesn't exist is treated as a no-op.
         """
-        self._db.execute('DELETE FROM snapshot WHERE handle=?', (handle_path,))
+        self._snapshots[handle_path] = None
 
     def list_snapshots(self) -> Generator[str, None, None]:
         """Return the name of all snapshots that are currently saved."""
+        self._flush()
         c = self._db.cursor()
         c.execute('SELECT handle FROM snapshot')
         while True:
@@ -172,7 +357,14 @@ class SQLiteStorage:
     def save_notice(self, event_path: str, observer_path: str, method_name: str) -> None:
         """Part of the Storage API, record an notice (event and observer)."""
         self._db.execute(
-            'INSERT INTO notice VALUES (NULL, ?, ?, ?)', (event_path, observer_path, method_name)
+            'INSERT INTO notice VALUES (NULL, ?, ?, ?, ?, ?)',
+            (
+                event_path,
+                observer_path,
+                method_name,
+                _event_base_path(event_path),
+                self._digest_for(event_path),
+            ),
         )
 
     def drop_notice(self, event_path: str, observer_path: str, method_name: str) -> None:
@@ -220,30 +412,103 @@ class SQLiteStorage:
             for row in rows:
                 yield cast('_Notice', tuple(row))
 
+    def has_equivalent_notice(
+        self, event_path: str, observer_path: str, method_name: str, snapshot_data: Any
+    ) -> bool:
+        """Part of the Storage API, check if an equivalent notice is already recorded.
+
+        A notice is equivalent if it is for the same kind of event (ignoring the
+        event ID) and the same observer, and its event snapshot equals snapshot_data.
+
+        Args:
+            event_path: The path of the event that is about to be recorded.
+            observer_path: The path of the observer that would be notified.
+            method_name: The name of the observer method that would be called.
+            snapshot_data: The snapshot of the event that is about to be recorded.
+        """
+        # Notices saved before their event snapshot have an empty digest, so
+        # they are always candidates; all candidates are confirmed by comparing
+        # the actual snapshot data.
+        c = self._db.execute(
+            """
+            SELECT event_path
+              FROM notice
+             WHERE event_base_path=?
+               AND observer_path=?
+               AND method_name=?
+               AND snapshot_digest IN (?, '')
+            """,
+            (
+                _event_base_path(event_path),
+                observer_path,
+                method_name,
+                _snapshot_digest(snapshot_data),
+            ),
+        )
+        for (existing_event_path,) in c.fetchall():
+            try:
+                existing_snapshot_data = self.load_snapshot(existing_event_path)
+            except NoSnapshotError:
+                existing_snapshot_data = {}
+            if snapshot_data == existing_snapshot_data:
+                return True
+        return False
+
 
 class JujuStorage:
     """Storing the content tracked by the Framework in Juju.
 
     This uses :class:`_JujuStorageBackend` to interact with state-get/state-set
     as the way to store state for the framework and for components.
+
+    All of the state is loaded with a single state-get the first time it's
+    needed, and is then read and written in memory. The keys that have changed
+    are written back, and the deleted keys removed, with a single state-set on
+    :meth:`commit`. Juju only
+    persists changes to the state when the hook succeeds, so holding the
+    changes until the commit doesn't lose anything that would otherwise have
+    been kept.
     """
 
     NOTICE_KEY = '#notices#'
 
     def __init__(self, backend: _JujuStorageBackend | None = None):
         self._backend: _JujuStorageBackend = backend or _JujuStorageBackend()
+        # The encoded values of all keys, and the encoded values as last
+        # loaded from or saved to Juju, loaded on first use.
+        self._values: dict[str, str] | None = None
+        self._saved: dict[str, str] = {}
+
+    def _state(self) -> dict[str, str]:
+        if self._values is None:
+            self._saved = self._backend.get_all()
+            self._values = dict(self._saved)
+        return self._values
 
     def close(self) -> None:
         """Part of the Storage API, close the storage backend.
 
-        Nothing to be done for Juju backend, as it's transactional.
+        Nothing to be done for Juju backend, as it's transactional. Changes
+        that haven't been committed are discarded.
         """
 
     def commit(self) -> None:
         """Part of the Storage API, commit latest changes in the storage backend.
 
-        Nothing to be done for Juju backend, as it's transactional.
+        The changed keys are saved, and any deleted keys are removed, with a
+        single state-set call.
         """
+        if self._values is None:
+            return
+        changed = {
+            key: value for key, value in self._values.items() if self._saved.get(key) != value
+        }
+        # state-set removes the keys that are set to an empty value. Encoded
+        # values are never empty, so this can't remove a key that's kept.
+        changed.update(dict.fromkeys(self._saved.keys() - self._values.keys(), ''))
+        if changed:
+            self._backend.set_encoded(changed)
+        self._saved = dict(self._values)
 
     def save_snapshot(self, handle_path: str, snapshot_data: Any) -> None:
         """Part of the Storage API, persist a snapshot data under the given handle.
@@ -253,7 +518,7 @@ class JujuStorage:
             snapshot_data: The data to be persisted. (as returned by Object.snapshot()). This
                 might be a dict/tuple/int, but must only contain 'simple' python types.
         """
-        self._backend.set(handle_path, snapshot_data)
+        self._state()[handle_path] = _encode_state_value(snapshot_data)
 
     def load_snapshot(self, handle_path: str):
         """Part of the Storage API, retrieve a snapshot that was previously saved.
@@ -265,17 +530,17 @@ class JujuStorage:
             NoSnapshotError: if there is no snapshot for the given handle_path.
         """
         try:
-            content = self._backend.get(handle_path)
+            content = self._state()[handle_path]
         except KeyError:
             raise NoSnapshotError(handle_path) from None
-        return content
+        return _decode_state_value(content)
 
     def drop_snapshot(self, handle_path: str):
         """Part of the Storage API, remove a snapshot that was previously saved.
 
         Dropping a snapshot that doesn't exist is treated as a no-op.
         """
-        self._backend.delete(handle_path)
+        self._state().pop(handle_path, None)
 
     def save_notice(self, event_path: str, observer_path: str, method_name: str):
         """Part of the Storage API, record a notice (event and observer)."""
@@ -305,16 +570,34 @@ class JujuStorage:
                 continue
             yield tuple(row)
 
+    def has_equivalent_notice(
+        self, event_path: str, observer_path: str, method_name: str, snapshot_data: Any
+    ) -> bool:
+        """Part of the Storage API, check if an equivalent notice is already recorded.
+
+        A notice is equivalent if it is for the same kind of event (ignoring the
+        event ID) and the same observer, and its event snapshot equals snapshot_data.
+
+        Args:
+            event_path: The path of the event that is about to be recorded.
+            observer_path: The path of the observer that would be notified.
+            method_name: The name of the observer method that would be called.
+            snapshot_data: The snapshot of the event that is about to be recorded.
+        """
+        return _scan_for_equivalent_notice(
+            self, event_path, observer_path, method_name, snapshot_data
+        )
+
     def _load_notice_list(self) -> _Notices:
         """Load a notice list from current key.
 
         Returns:
             List of (event_path, observer_path, method_name) tuples; empty if no key or is None.
         """
-        try:
-            notice_list = self._backend.get(self.NOTICE_KEY)
-        except KeyError:
+        content = self._state().get(self.NOTICE_KEY)
+        if content is None:
             return []
+        notice_list = _decode_state_value(content)
         if notice_list is None:
             return []
         return notice_list
@@ -325,7 +608,7 @@ class JujuStorage:
         Args:
             notices: List of (event_path, observer_path, method_name) tuples.
         """
-        self._backend.set(self.NOTICE_KEY, notices)
+        self._state()[self.NOTICE_KEY] = _encode_state_value(notices)
 
 
 # we load yaml.CSafeX if available, falling back to slower yaml.SafeX.
@@ -366,6 +649,18 @@ class _SimpleDumper(_BaseDumper):  # type: ignore
 _SimpleDumper.add_representer(tuple, _SimpleDumper.represent_tuple)  # type: ignore
 
 
+def _encode_state_value(value: Any) -> str:
+    # default_flow_style=None means that it can use Block for
+    # complex types (types that have nested types) but use flow
+    # for simple types (like an array). Not all versions of PyYAML
+    # have the same default style.
+    return yaml.dump(value, Dumper=_SimpleDumper, default_flow_style=None)
+
+
+def _decode_state_value(content: str) -> Any:
+    return yaml.load(content, Loader=_SimpleLoader)  # noqa: S506
+
+
 def juju_backend_available() -> bool:
     """Check if Juju state storage is available."""
     p = shutil.which('state-get')
@@ -385,13 +680,19 @@ class _JujuStorageBackend:
         Raises:
             CalledProcessError: if 'state-set' returns an error code.
         """
-        # default_flow_style=None means that it can use Block for
-        # complex types (types that have nested types) but use flow
-        # for simple types (like an array). Not all versions of PyYAML
-        # have the same default style.
-        encoded_value = yaml.dump(value, Dumper=_SimpleDumper, default_flow_style=None)
+        self.set_encoded({key: _encode_state_value(value)})
+
+    def set_encoded(self, values: dict[str, str]) -> None:
+        """Set many keys to already encoded values, with a single state-set call.
+
+        Args:
+            values: The encoded values (from :func:`_encode_state_value`) to set.
+
+        Raises:
+            CalledProcessError: if 'state-set' returns an error code.
+        """
         content = yaml.dump(
-            {key: encoded_value}, default_style='|', default_flow_style=False, Dumper=_SimpleDumper
+            values, default_style='|', default_flow_style=False, Dumper=_SimpleDumper
         )
         _run(['state-set', '--file', '-'], input=content, check=True)
 
@@ -407,7 +708,18 @@ class _JujuStorageBackend:
         p = _run(['state-get', key], stdout=subprocess.PIPE, check=True)
         if p.stdout == '' or p.stdout == '\n':
             raise KeyError(key)
-        return yaml.load(p.stdout, Loader=_SimpleLoader)  # noqa: S506
+        return _decode_state_value(p.stdout)
+
+    def get_all(self) -> dict[str, str]:
+        """Get the encoded values of all keys, with a single state-get call.
+
+        Raises:
+            CalledProcessError: if 'state-get' returns an error code.
+        """
+        p = _run(['state-get', '--format=json'], stdout=subprocess.PIPE, check=True)
+        if not p.stdout.strip():
+            return {}
+        return json.loads(p.stdout) or {}
 
     def delete(self, key: str) -> None:
         """Remove a key from being tracked.
@@ -0,0 +1,83 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark tests for loading charm metadata."""
+
+from __future__ import annotations
+
+import pathlib
+
+import pytest
+import yaml
+
+import ops
+
+NUM_OPTIONS = 200
+NUM_ACTIONS = 50
+
+
+@pytest.fixture
+def charm_root(tmp_path: pathlib.Path) -> pathlib.Path:
+    """Write metadata for a large charm, with many config options and actions."""
+    meta = {
+        'name': 'big',
+        'summary': 'A charm with lots of metadata.',
+        'requires': {f'req{i}': {'interface': f'iface{i}'} for i in range(10)},
+        'provides': {f'prov{i}': {'interface': f'iface{i}'} for i in range(10)},
+        'peers': {'peer': {'interface': 'peer'}},
+        'containers': {'workload': {'resource': 'image'}},
+        'resources': {'image': {'type': 'oci-image'}},
+    }
+    options = {
+        f'option-{i}': {
+            'type': ('string', 'int', 'boolean', 'float')[i % 4],
+            'default': ('value', i, True, i / 2)[i % 4],
+            'description': f'Option {i}, which configures something about the workload.',
+        }
+        for i in range(NUM_OPTIONS)
+    }
+    actions = {
+        f'action-{i}': {
+            'description': f'Action {i}, which does something to the workload.',
+            'params': {
+                'name': {'type': 'string', 'description': 'The name of the thing.'},
+                'count': {'type': 'integer', 'default': 1},
+            },
+            'required': ['name'],
+            'additionalProperties': False,
+        }
+        for i in range(NUM_ACTIONS)
+    }
+    (tmp_path / 'metadata.yaml').write_text(yaml.safe_dump(meta))
+    (tmp_path / 'config.yaml').write_text(yaml.safe_dump({'options': options}))
+    (tmp_path / 'actions.yaml').write_text(yaml.safe_dump(actions))
+    return tmp_path
+
+
+def _check(meta: ops.CharmMeta):
+    assert len(meta.config) == NUM_OPTIONS
+    assert len(meta.actions) == NUM_ACTIONS
+    assert len(meta.relations) == 21
+
+
+# Note: the 'benchmark' argument here is a fixture that pytest-benchmark
+# automatically makes available to all tests.
+def test_meta_from_charm_root(benchmark, charm_root: pathlib.Path):
+    _check(benchmark(ops.CharmMeta.from_charm_root, charm_root))
+
+
+def test_meta_from_charm_root_cached(benchmark, charm_root: pathlib.Path):
+    cache_path = charm_root / '.unit-meta.pickle'
+    ops.CharmMeta.from_charm_root(charm_root, cache_path=cache_path)
+    _check(benchmark(ops.CharmMeta.from_charm_root, charm_root, cache_path=cache_path))
@@ -0,0 +1,74 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark tests for the ops framework."""
+
+from __future__ import annotations
+
+import pathlib
+
+import ops
+from ops.storage import SQLiteStorage
+
+
+class Events(ops.ObjectEvents):
+    foo = ops.EventSource(ops.EventBase)
+    bar = ops.EventSource(ops.EventBase)
+    baz = ops.EventSource(ops.EventBase)
+
+
+class Emitter(ops.Object):
+    on = Events()  # type: ignore
+
+
+class Observer(ops.Object):
+    def __init__(self, parent: ops.Object, key: str):
+        super().__init__(parent, key)
+        self.seen = 0
+
+    def on_event(self, event: ops.EventBase):
+        self.seen += 1
+
+
+def _setup_observers(framework: ops.Framework):
+    # 50 emitters, each with 5 observers of each of two events: 500 registrations.
+    emitters = [Emitter(framework, str(i)) for i in range(50)]
+    observers: list[Observer] = []
+    for emitter in emitters:
+        for _ in range(5):
+            observer = Observer(framework, str(len(observers)))
+            framework.observe(emitter.on.foo, observer.on_event)
+            framework.observe(emitter.on.bar, observer.on_event)
+            observers.append(observer)
+    return emitters, observers
+
+
+# Note: the 'benchmark' argument here is a fixture that pytest-benchmark
+# automatically makes available to all tests.
+def test_emit_many_observers(benchmark, tmp_path: pathlib.Path):
+    framework = ops.Framework(SQLiteStorage(':memory:'), tmp_path, None, None)  # type: ignore
+    emitters, observers = _setup_observers(framework)
+    benchmark(emitters[-1].on.bar.emit)
+    assert all(observer.seen > 0 for observer in observers[-5:])
+    assert all(observer.seen == 0 for observer in observers[:-5])
+    framework.close()
+
+
+def test_emit_unobserved_many_observers(benchmark, tmp_path: pathlib.Path):
+    framework = ops.Framework(SQLiteStorage(':memory:'), tmp_path, None, None)  # type: ignore
+    emitters, observers = _setup_observers(framework)
+    # This measures the cost of finding the observers, without running any.
+    benchmark(emitters[-1].on.baz.emit)
+    assert all(observer.seen == 0 for observer in observers)
+    framework.close()
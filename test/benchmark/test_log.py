@@ -0,0 +1,69 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark tests for sending logs to Juju, using a fake juju-log command."""
+
+from __future__ import annotations
+
+import logging
+import os
+import pathlib
+
+import pytest
+
+import ops.log
+from ops.model import _ModelBackend
+
+NUM_LINES = 1_000
+
+
+@pytest.fixture
+def juju_log(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> pathlib.Path:
+    """Put a fake juju-log command on the PATH, which appends the message to a file."""
+    log = tmp_path / 'juju.log'
+    path = tmp_path / 'juju-log'
+    path.write_text(f'#!/bin/sh\nshift 3\necho "$@" >>{log}\n')
+    path.chmod(0o755)
+    monkeypatch.setenv('PATH', f'{tmp_path}{os.pathsep}{os.environ["PATH"]}')
+    monkeypatch.setenv('JUJU_VERSION', '3.6.8')
+    return log
+
+
+# Note: the 'benchmark' argument here is a fixture that pytest-benchmark
+# automatically makes available to all tests.
+@pytest.mark.parametrize('background', [False, True])
+def test_log_lines(benchmark, juju_log: pathlib.Path, background: bool):
+    logger = logging.getLogger('benchmark')
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+
+    rounds = 0
+
+    def run():
+        nonlocal rounds
+        rounds += 1
+        # Roughly a hook that logs a lot at debug level.
+        handler = ops.log.JujuLogHandler(_ModelBackend('myapp/0'), background=background)
+        logger.addHandler(handler)
+        try:
+            for i in range(NUM_LINES):
+                logger.debug('line %d', i)
+        finally:
+            logger.removeHandler(handler)
+            handler.close()
+
+    juju_log.write_text('')
+    benchmark.pedantic(run, rounds=3)
+    # With --benchmark-disable, there's only one round.
+    assert len(juju_log.read_text().splitlines()) == NUM_LINES * rounds
@@ -0,0 +1,159 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark tests for dispatching an event to a charm with ops.main.
+
+Each dispatch runs the benchmark charm in a new Python process, as Juju
+does, with fake hook commands and a fake Pebble server. As well as the time
+taken, each benchmark reports (in ``extra_info``) the number of hook
+commands run per dispatch, each of which is a fork, and the peak RSS of the
+charm process.
+"""
+
+from __future__ import annotations
+
+import collections
+import json
+import os
+import pathlib
+import shutil
+import subprocess
+import sys
+import typing
+
+import pytest
+
+import test.fake_pebble as fake_pebble
+
+CHARM_DIR = pathlib.Path(__file__).parent.parent / 'charms' / 'test_benchmark'
+
+NUM_UNITS = 50
+FILE_SIZE = 8 * 1024 * 1024
+
+
+class Dispatcher:
+    """Runs dispatches of the benchmark charm, and records what they cost."""
+
+    def __init__(self, tmp_path: pathlib.Path):
+        self.charm_dir = tmp_path / 'charm'
+        shutil.copytree(CHARM_DIR, self.charm_dir)
+        dispatch = self.charm_dir / 'dispatch'
+        dispatch.write_text(f'#!/bin/sh\nexec "{sys.executable}" src/charm.py\n')
+        dispatch.chmod(0o755)
+
+        # Each fake hook command records that it ran.
+        self.calls = tmp_path / 'calls'
+        self.rss = tmp_path / 'rss'
+        bin_dir = tmp_path / 'bin'
+        bin_dir.mkdir()
+        units = json.dumps([f'benchmark/{i}' for i in range(1, NUM_UNITS + 1)])
+        tools = {
+            'juju-log': 'cat > /dev/null',
+            'is-leader': "echo 'true'",
+            'relation-ids': """echo '["peer:1"]'""",
+            'relation-list': f"echo '{units}'",
+            'relation-get': """echo '{"address": "10.0.0.1"}'""",
+        }
+        for name, content in tools.items():
+            path = bin_dir / name
+            path.write_text(f'#!/bin/sh\necho {name} >> {self.calls}\n{content}\n')
+            path.chmod(0o755)
+
+        self.env = {
+            **os.environ,
+            'PATH': f'{bin_dir}{os.pathsep}{os.environ["PATH"]}',
+            'PYTHONPATH': str(pathlib.Path(__file__).parent.parent.parent),
+            'JUJU_CHARM_DIR': str(self.charm_dir),
+            'JUJU_UNIT_NAME': 'benchmark/0',
+            'JUJU_MODEL_NAME': 'benchmark',
+            'JUJU_VERSION': '3.6.8',
+            'BENCHMARK_DIR': str(tmp_path),
+        }
+        self.forks: list[int] = []
+        self.last_calls: collections.Counter[str] = collections.Counter()
+        self.peak_rss = 0
+
+    def __call__(self, hook: str = 'update-status', **env: str):
+        self.calls.write_text('')
+        subprocess.run(
+            [str(self.charm_dir / 'dispatch')],
+            cwd=self.charm_dir,
+            env={**self.env, 'JUJU_DISPATCH_PATH': f'hooks/{hook}', **env},
+            check=True,
+        )
+        self.last_calls = collections.Counter(self.calls.read_text().splitlines())
+        self.forks.append(self.last_calls.total())
+        self.peak_rss = max(self.peak_rss, int(self.rss.read_text()))
+
+    def measure(self, benchmark: typing.Any, rounds: int = 5, **env: str):
+        """Benchmark update-status dispatches, after setting up with an install dispatch."""
+        self('install', **env)
+        self.forks.clear()
+        self.peak_rss = 0
+        benchmark.pedantic(lambda: self(**env), rounds=rounds)
+        benchmark.extra_info['forks_per_dispatch'] = sum(self.forks) / len(self.forks)
+        benchmark.extra_info['peak_rss'] = self.peak_rss
+
+
+@pytest.fixture
+def dispatcher(tmp_path: pathlib.Path):
+    return Dispatcher(tmp_path)
+
+
+# Note: the 'benchmark' argument here is a fixture that pytest-benchmark
+# automatically makes available to all tests.
+def test_dispatch_cold_start(benchmark, dispatcher: Dispatcher):
+    dispatcher.measure(benchmark)
+    # Only the framework's own logging, and the leadership check for collect-status.
+    assert set(dispatcher.last_calls) == {'juju-log', 'is-leader'}
+
+
+@pytest.mark.parametrize('num_deferred', [10, 100])
+def test_dispatch_reemit(benchmark, dispatcher: Dispatcher, num_deferred: int):
+    dispatcher.measure(benchmark, BENCHMARK_CASE='reemit', BENCHMARK_SIZE=str(num_deferred))
+
+
+def test_dispatch_stored_state(benchmark, dispatcher: Dispatcher):
+    dispatcher.measure(benchmark, BENCHMARK_CASE='stored', BENCHMARK_SIZE='10000')
+
+
+def test_dispatch_relation_data(benchmark, dispatcher: Dispatcher):
+    dispatcher.measure(benchmark, BENCHMARK_CASE='relation')
+    assert dispatcher.last_calls['relation-get'] == NUM_UNITS
+
+
+def test_dispatch_push_pull(benchmark, dispatcher: Dispatcher, tmp_path: pathlib.Path):
+    (tmp_path / 'source').write_bytes(os.urandom(FILE_SIZE))
+    shutdown, socket_path = fake_pebble.start_server()
+    try:
+        dispatcher.measure(
+            benchmark, rounds=3, BENCHMARK_CASE='pebble', BENCHMARK_PEBBLE_SOCKET=socket_path
+        )
+    finally:
+        shutdown()
+    if benchmark.stats:  # Not set with --benchmark-disable.
+        benchmark.extra_info['mb_per_second'] = 2 * FILE_SIZE / benchmark.stats['mean'] / 1e6
+    assert (tmp_path / 'pulled').read_bytes() == (tmp_path / 'source').read_bytes()
+
+
+@pytest.mark.parametrize('background', ['0', '1'])
+def test_dispatch_log_volume(benchmark, dispatcher: Dispatcher, background: str):
+    dispatcher.measure(
+        benchmark, BENCHMARK_CASE='log', BENCHMARK_SIZE='200', BENCHMARK_BACKGROUND=background
+    )
+    if background == '0':
+        # One juju-log for each line.
+        assert dispatcher.last_calls['juju-log'] > 200
+    else:
+        assert dispatcher.last_calls['juju-log'] < 10
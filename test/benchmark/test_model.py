@@ -0,0 +1,136 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark tests for the ops model, using fake hook commands."""
+
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+
+import pytest
+
+import ops
+from ops.model import _ModelBackend
+
+NUM_UNITS = 50
+NUM_SECRETS = 50
+
+
+@pytest.fixture
+def hook_tools(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    """Put fake hook commands for a relation with many remote units on the PATH.
+
+    Real hook commands mostly wait on a round trip to the Juju unit agent;
+    the fake ones sleep to simulate that.
+    """
+    units = json.dumps([f'remote/{i}' for i in range(NUM_UNITS)])
+    secret_ids = json.dumps([f'secret:{i}' for i in range(NUM_SECRETS)])
+    tools = {
+        'is-leader': "echo 'true'",
+        'relation-ids': """echo '["db:1"]'""",
+        'relation-list': f"echo '{units}'",
+        'relation-get': """echo '{"key": "value"}'""",
+        'relation-set': 'cat > /dev/null',
+        'status-set': 'true',
+        'secret-ids': f"echo '{secret_ids}'",
+        'secret-get': """echo '{"cert": "value"}'""",
+    }
+    for name, content in tools.items():
+        path = tmp_path / name
+        path.write_text(f'#!/bin/sh\nsleep 0.01\n{content}\n')
+        path.chmod(0o755)
+    monkeypatch.setenv('PATH', f'{tmp_path}{os.pathsep}{os.environ["PATH"]}')
+    monkeypatch.setenv('JUJU_VERSION', '3.6.8')
+
+
+def _new_model(buffer_relation_data: bool = False, defer_status: bool = False):
+    meta = ops.CharmMeta({'name': 'myapp', 'requires': {'db': {'interface': 'db'}}})
+    backend = _ModelBackend('myapp/0')
+    backend._buffer_relation_data = buffer_relation_data
+    backend._defer_status = defer_status
+    return ops.Model(meta, backend)
+
+
+def _read_all(relations: list[ops.Relation]):
+    return [dict(relation.data[entity]) for relation in relations for entity in relation.data]
+
+
+# Note: the 'benchmark' argument here is a fixture that pytest-benchmark
+# automatically makes available to all tests.
+def test_relation_data_lazy(benchmark, hook_tools: None):
+    def run():
+        return _read_all(_new_model().relations['db'])
+
+    data = benchmark(run)
+    assert len(data) == NUM_UNITS + 3
+
+
+def test_relation_data_prefetch(benchmark, hook_tools: None):
+    def run():
+        return _read_all(_new_model().relations.prefetch('db'))
+
+    data = benchmark(run)
+    assert len(data) == NUM_UNITS + 3
+
+
+def _write_keys(model: ops.Model):
+    relation = model.relations['db'][0]
+    for i in range(15):
+        relation.data[model.app][f'key{i}'] = str(i)
+    model.flush_relation_data()
+
+
+def test_relation_set(benchmark, hook_tools: None):
+    benchmark(lambda: _write_keys(_new_model()))
+
+
+def test_relation_set_buffered(benchmark, hook_tools: None):
+    benchmark(lambda: _write_keys(_new_model(buffer_relation_data=True)))
+
+
+def _set_statuses(model: ops.Model):
+    for step in ('installing', 'configuring', 'starting'):
+        model.unit.status = ops.MaintenanceStatus(step)
+    model.unit.status = ops.ActiveStatus()
+    model.flush_status()
+
+
+def test_status_set(benchmark, hook_tools: None):
+    benchmark(lambda: _set_statuses(_new_model()))
+
+
+def test_status_set_deferred(benchmark, hook_tools: None):
+    benchmark(lambda: _set_statuses(_new_model(defer_status=True)))
+
+
+def _get_secrets(model: ops.Model):
+    # Libraries often get the same secret more than once in a dispatch.
+    for _ in range(2):
+        for id in model._backend.secret_ids():
+            model.get_secret(id=id).get_content()
+
+
+def test_secret_get(benchmark, hook_tools: None):
+    benchmark(lambda: _get_secrets(_new_model()))
+
+
+def test_secret_get_prefetch(benchmark, hook_tools: None):
+    def run():
+        model = _new_model()
+        model.prefetch_secrets()
+        _get_secrets(model)
+
+    benchmark(run)
@@ -0,0 +1,99 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Benchmark tests for the Pebble client, using the fake Pebble server."""
+
+from __future__ import annotations
+
+import os
+import pathlib
+import shutil
+import tracemalloc
+import typing
+
+import pytest
+
+import test.fake_pebble as fake_pebble
+from ops import pebble
+
+
+# Note: the 'benchmark' argument here is a fixture that pytest-benchmark
+# automatically makes available to all tests.
+def test_many_requests(benchmark):
+    shutdown, socket_path = fake_pebble.start_server()
+    try:
+        client = pebble.Client(socket_path=socket_path)
+
+        def run():
+            for _ in range(20):
+                client.get_system_info()
+
+        benchmark(run)
+    finally:
+        shutdown()
+
+
+FILE_SIZE = 32 * 1024 * 1024
+
+
+@pytest.fixture
+def pebble_file(tmp_path: pathlib.Path):
+    """Serve a large file from the fake Pebble server."""
+    path = tmp_path / 'large'
+    path.write_bytes(os.urandom(FILE_SIZE))
+    shutdown, socket_path = fake_pebble.start_server()
+    try:
+        yield pebble.Client(socket_path=socket_path), path
+    finally:
+        shutdown()
+
+
+def _measure(benchmark: typing.Any, func: typing.Callable[[], None]):
+    # Peak Python memory use stands in for peak RSS, which only ever grows
+    # over the lifetime of the test process.
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    benchmark.extra_info['peak_memory'] = peak
+    benchmark.pedantic(func, rounds=5)
+    if benchmark.stats:  # Not set with --benchmark-disable.
+        benchmark.extra_info['mb_per_second'] = FILE_SIZE / benchmark.stats['mean'] / 1e6
+    return peak
+
+
+def test_pull(benchmark, pebble_file: tuple[pebble.Client, pathlib.Path]):
+    client, path = pebble_file
+    dest = path.with_name('dest')
+
+    def run():
+        with client.pull(path, encoding=None) as src, dest.open('wb') as dst:
+            shutil.copyfileobj(src, dst)
+
+    peak = _measure(benchmark, run)
+    assert dest.stat().st_size == FILE_SIZE
+    # The content goes to a temporary file, and isn't held in memory.
+    assert peak < FILE_SIZE / 4
+
+
+def test_pull_to(benchmark, pebble_file: tuple[pebble.Client, pathlib.Path]):
+    client, path = pebble_file
+    dest = path.with_name('dest')
+    peak = _measure(benchmark, lambda: client.pull_to(path, dest))
+    assert dest.stat().st_size == FILE_SIZE
+    # The content is streamed, not held in memory.
+    assert peak < FILE_SIZE / 4
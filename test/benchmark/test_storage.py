@@ -0,0 +1,144 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark tests for the ops storage layer."""
+
+from __future__ import annotations
+
+import os
+import pathlib
+
+import pytest
+
+import ops
+from ops.storage import JujuStorage, SQLiteStorage
+
+
+class DataEvent(ops.EventBase):
+    def __init__(self, handle: ops.Handle, data: str = ''):
+        super().__init__(handle)
+        self.data = data
+
+    def snapshot(self):
+        return {'data': self.data}
+
+    def restore(self, snapshot: dict[str, str]):
+        self.data = snapshot['data']
+
+
+class Events(ops.ObjectEvents):
+    data = ops.EventSource(DataEvent)
+
+
+class Emitter(ops.Object):
+    on = Events()  # type: ignore
+
+
+class Observer(ops.Object):
+    _stored = ops.StoredState()
+
+    def __init__(self, parent: ops.Object, key: str):
+        super().__init__(parent, key)
+        self._stored.set_default(seen=0)
+        self.seen = 0
+
+    def on_data(self, event: DataEvent):
+        self.seen += 1
+        self._stored.seen += 1
+
+
+# Note: the 'benchmark' argument here is a fixture that pytest-benchmark
+# automatically makes available to all tests.
+@pytest.mark.parametrize('queue_size', [10, 1_000, 10_000])
+def test_emit_with_deferred_queue(benchmark, tmp_path: pathlib.Path, queue_size: int):
+    storage = SQLiteStorage(tmp_path / '.unit-state.db')
+    framework = ops.Framework(storage, tmp_path, None, None)  # type: ignore
+    emitter = Emitter(framework, 'emitter')
+    observer = Observer(framework, 'observer')
+    framework.observe(emitter.on.data, observer.on_data)
+
+    # Fill the queue with deferred notices of the same kind, for the same
+    # observer, so that each emit has to check for a duplicate among them.
+    for i in range(queue_size):
+        path = f'{emitter.on.handle.path}/data[{i}]'
+        storage.save_snapshot(path, {'data': f'deferred-{i}'})
+        storage.save_notice(path, observer.handle.path, 'on_data')
+    framework._stored['event_count'] = queue_size
+
+    benchmark(emitter.on.data.emit, 'new')
+    # The queue must not have grown: the new events were all handled.
+    assert observer.seen > 0
+    assert len(tuple(storage.notices())) == queue_size
+    framework.close()
+
+
+@pytest.fixture
+def state_tools(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> pathlib.Path:
+    """Put fake state-get/state-set/state-delete commands on the PATH.
+
+    Each command appends its name to the returned log file, so that the number
+    of processes run can be counted.
+    """
+    tools = tmp_path / 'bin'
+    tools.mkdir()
+    log = tmp_path / 'calls.log'
+    # The state starts empty.
+    outputs = {
+        'state-get': 'if [ "$1" = --format=json ]; then echo "{}"; fi',
+        'state-set': 'cat >/dev/null',
+    }
+    for name, output in outputs.items():
+        path = tools / name
+        path.write_text(f'#!/bin/sh\necho {name} >>{log}\n{output}\n')
+        path.chmod(0o755)
+    (tools / 'state-delete').symlink_to(tools / 'state-set')
+    monkeypatch.setenv('PATH', f'{tools}{os.pathsep}{os.environ["PATH"]}')
+    return log
+
+
+def test_juju_storage_dispatch(benchmark, tmp_path: pathlib.Path, state_tools: pathlib.Path):
+    def dispatch():
+        # Roughly what a dispatch does: load stored state, emit a few events
+        # whose observers update it, then commit.
+        framework = ops.Framework(JujuStorage(), tmp_path, None, None)  # type: ignore
+        emitter = Emitter(framework, 'emitter')
+        observer = Observer(framework, 'observer')
+        framework.observe(emitter.on.data, observer.on_data)
+        framework.reemit()
+        for i in range(3):
+            emitter.on.data.emit(f'data-{i}')
+        framework.commit()
+        framework.close()
+
+    state_tools.write_text('')
+    dispatch()
+    forks = len(state_tools.read_text().splitlines())
+    benchmark.extra_info['forks_per_dispatch'] = forks
+    assert forks <= 2
+    benchmark(dispatch)
+
+
+@pytest.mark.parametrize('profile', ['default', 'performance'])
+def test_sqlite_commit(benchmark, tmp_path: pathlib.Path, profile: str):
+    storage = SQLiteStorage(tmp_path / '.unit-state.db', profile=profile)  # type: ignore
+    counter = iter(range(1_000_000))
+
+    def commit():
+        path = f'emitter/on/data[{next(counter)}]'
+        storage.save_snapshot(path, {'data': 'x' * 100})
+        storage.save_notice(path, 'observer', 'on_data')
+        storage.commit()
+
+    benchmark(commit)
+    storage.close()
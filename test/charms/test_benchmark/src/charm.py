@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Charm for benchmarking the dispatch of an event with ops.main.
+
+The work the charm does is chosen with environment variables:
+``BENCHMARK_CASE`` is the name of the case, and ``BENCHMARK_SIZE`` is how
+much work to do. The install hook sets up the state that the case needs,
+and update-status does the work that's measured.
+
+When the dispatch finishes, the charm writes its peak RSS to the file
+``BENCHMARK_DIR/rss``.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import pathlib
+import shutil
+
+import ops
+
+logger = logging.getLogger(__name__)
+
+
+class DeferredEvent(ops.EventBase):
+    pass
+
+
+class BenchmarkEvents(ops.CharmEvents):
+    deferred = ops.EventSource(DeferredEvent)
+
+
+class BenchmarkCharm(ops.CharmBase):
+    on = BenchmarkEvents()  # type: ignore
+
+    _stored = ops.StoredState()
+
+    def __init__(self, framework: ops.Framework):
+        super().__init__(framework)
+        self.case = os.environ.get('BENCHMARK_CASE', '')
+        self.size = int(os.environ.get('BENCHMARK_SIZE', '0'))
+        self._stored.set_default(data={})
+        framework.observe(self.on.install, self._on_install)
+        framework.observe(self.on.update_status, self._on_update_status)
+        framework.observe(self.on.deferred, self._on_deferred)
+
+    def _on_install(self, event: ops.InstallEvent):
+        if self.case == 'reemit':
+            for _ in range(self.size):
+                self.on.deferred.emit()
+        elif self.case == 'stored':
+            self._stored.data = {
+                f'key{i}': {'value': 'x' * 100, 'index': i} for i in range(self.size)
+            }
+
+    def _on_deferred(self, event: DeferredEvent):
+        event.defer()
+
+    def _on_update_status(self, event: ops.UpdateStatusEvent):
+        if self.case == 'stored':
+            self._stored.data['key0'] = {'value': 'y' * 100, 'index': 0}
+        elif self.case == 'relation':
+            for relation in self.model.relations['peer']:
+                for unit in relation.units:
+                    relation.data[unit].get('address')
+        elif self.case == 'pebble':
+            self._push_pull(pathlib.Path(os.environ['BENCHMARK_DIR']))
+        elif self.case == 'log':
+            for i in range(self.size):
+                logger.info('Log line %d', i)
+
+    def _push_pull(self, directory: pathlib.Path):
+        # The fake Pebble reads and writes the local filesystem.
+        client = ops.pebble.Client(socket_path=os.environ['BENCHMARK_PEBBLE_SOCKET'])
+        with (directory / 'source').open('rb') as f:
+            client.push(directory / 'pushed', f, encoding=None)  # type: ignore
+        with (
+            client.pull(directory / 'pushed', encoding=None) as src,
+            (directory / 'pulled').open('wb') as dst,
+        ):
+            shutil.copyfileobj(src, dst)
+
+
+def _write_peak_rss():
+    # The process's ru_maxrss includes the memory of the process that forked
+    # it, before the exec, but VmHWM is only the memory of this program.
+    with open('/proc/self/status') as f:
+        peak = next(line.split()[1] for line in f if line.startswith('VmHWM:'))
+    (pathlib.Path(os.environ['BENCHMARK_DIR']) / 'rss').write_text(str(int(peak) * 1024))
+
+
+if __name__ == '__main__':
+    atexit.register(_write_peak_rss)
+    ops.main(BenchmarkCharm, background_logging=os.environ.get('BENCHMARK_BACKGROUND') == '1')
@@ -16,10 +16,12 @@
 
 from __future__ import annotations
 
+import contextlib
 import http.server
 import json
 import os
 import re
+import shutil
 import socket
 import socketserver
 import tempfile
@@ -42,6 +44,9 @@ _Response = typing.TypedDict(
 
 
 class Handler(http.server.BaseHTTPRequestHandler):
+    # Like the real Pebble server, keep connections alive between requests.
+    protocol_version = 'HTTP/1.1'
+
     _route = list[tuple[typing.Literal['GET', 'POST'], typing.Any, typing.Callable[..., None]]]
 
     def __init__(
@@ -53,6 +58,8 @@ class Handler(http.server.BaseHTTPRequestHandler):
         self.routes: Handler._route = [
             ('GET', re.compile(r'^/system-info$'), self.get_system_info),
             ('POST', re.compile(r'^/services$'), self.services_action),
+            ('GET', re.compile(r'^/files$'), self.files_action),
+            ('POST', re.compile(r'^/files$'), self.files_write),
         ]
         self._services = ['foo']
         super().__init__(request, ('unix-socket', 80), server)
@@ -62,11 +69,12 @@ class Handler(http.server.BaseHTTPRequestHandler):
         pass
 
     def respond(self, d: _Response, status: int = 200):
+        body = json.dumps(d, indent=4, sort_keys=True).encode('utf-8')
         self.send_response(status)
         self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
         self.end_headers()
-        d_json = json.dumps(d, indent=4, sort_keys=True)
-        self.wfile.write(d_json.encode('utf-8'))
+        self.wfile.write(body)
 
     def bad_request(self, message: str):
         d: _Response = {
@@ -144,16 +152,28 @@ class Handler(http.server.BaseHTTPRequestHandler):
 
         self.not_found()
 
-    def read_body_json(self) -> dict[str, str]:
+    def read_body(self) -> bytes:
+        if self.headers.get('Transfer-Encoding') == 'chunked':
+            chunks: list[bytes] = []
+            while size := int(self.rfile.readline().split(b';')[0], 16):
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+            self.rfile.readline()
+            return b''.join(chunks)
         try:
             content_len = int(self.headers.get('Content-Length', ''))
         except ValueError:
             content_len = 0
-        if not content_len:
+        return self.rfile.read(content_len) if content_len else b''
+
+    def read_body_json(self) -> dict[str, str]:
+        body = self.read_body()
+        if not body:
+            return {}
+        if self.headers.get_content_type() == 'multipart/form-data':
+            # Keep the raw body for the handler to parse.
+            self.body = body
             return {}
-        body = self.rfile.read(content_len)
-        if isinstance(body, bytes):
-            body = body.decode('utf-8')
         return json.loads(body)
 
     def get_system_info(self, match: typing.Any, query: dict[str, str], data: dict[str, str]):
@@ -182,21 +202,121 @@ class Handler(http.server.BaseHTTPRequestHandler):
         else:
             self.bad_request(f'action "{action}" not implemented')
 
+    def files_action(self, match: typing.Any, query: dict[str, str], data: dict[str, str]):
+        # Serve a single file from the local filesystem, as Pebble does.
+        if query.get('action') != 'read':
+            self.bad_request(f'action "{query.get("action")}" not implemented')
+            return
+        path = query['path']
+        boundary = '01234567890123456789012345678901'
+        item: dict[str, typing.Any] = {'path': path}
+        try:
+            size = os.path.getsize(path)
+            f = open(path, 'rb')  # noqa: SIM115
+        except OSError as e:
+            size = 0
+            f = None
+            item['error'] = {'kind': 'not-found', 'message': str(e)}
+        files_header = (
+            f'--{boundary}\r\n'
+            f'Content-Disposition: form-data; name="files"; filename="{path}"\r\n'
+            '\r\n'
+        ).encode()
+        response = json.dumps({
+            'result': [item],
+            'status': 'OK',
+            'status-code': 200,
+            'type': 'sync',
+        }).encode()
+        response_part = (
+            f'--{boundary}\r\n'.encode()
+            + b'Content-Disposition: form-data; name="response"\r\n\r\n'
+            + response
+            + f'\r\n--{boundary}--\r\n'.encode()
+        )
+        length = len(response_part)
+        if f is not None:
+            length += len(files_header) + size + 2
+
+        self.send_response(200)
+        self.send_header('Content-Type', f'multipart/form-data; boundary={boundary}')
+        self.send_header('Content-Length', str(length))
+        self.end_headers()
+        if f is not None:
+            with f:
+                self.wfile.write(files_header)
+                shutil.copyfileobj(f, self.wfile, 1024 * 1024)
+            self.wfile.write(b'\r\n')
+        self.wfile.write(response_part)
+
+    def files_write(self, match: typing.Any, query: dict[str, str], data: dict[str, str]):
+        # Write the files to the local filesystem, as Pebble does.
+        boundary = self.headers.get_param('boundary')
+        assert isinstance(boundary, str)
+        result: list[dict[str, typing.Any]] = []
+        for part in self.body.split(f'--{boundary}'.encode())[1:-1]:
+            headers, _, content = part[2:].partition(b'\r\n\r\n')
+            content = content.removesuffix(b'\r\n')
+            filename = re.search(rb'filename="(.*)"', headers)
+            if filename is None:
+                if json.loads(content)['action'] != 'write':
+                    self.bad_request('action not implemented')
+                    return
+                continue
+            path = filename.group(1).decode()
+            with open(path, 'wb') as f:
+                f.write(content)
+            result.append({'path': path})
+        self.respond({
+            'result': result,  # type: ignore
+            'status': 'OK',
+            'status-code': 200,
+            'type': 'sync',
+        })
+
+
+class Server(socketserver.ThreadingUnixStreamServer):
+    """Server that handles each (keep-alive) connection in its own thread."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str):
+        super().__init__(socket_path, Handler)
+        self.connections: set[socket.socket] = set()
+
+    def process_request(self, request: socket.socket, client_address: typing.Any):
+        self.connections.add(request)
+        super().process_request(request, client_address)
+
+    def shutdown_request(self, request: socket.socket):
+        self.connections.discard(request)
+        super().shutdown_request(request)
+
+    def close_connections(self):
+        """Close open client connections, as a Pebble restart would."""
+        for conn in list(self.connections):
+            with contextlib.suppress(OSError):
+                conn.shutdown(socket.SHUT_RDWR)
+
 
-def start_server() -> tuple[typing.Callable[[], None], str]:
-    socket_dir = tempfile.mkdtemp(prefix='test-ops.pebble')
-    socket_path = os.path.join(socket_dir, 'test.socket')
+def start_server(socket_path: str | None = None) -> tuple[typing.Callable[[], None], str]:
+    socket_dir = None
+    if socket_path is None:
+        socket_dir = tempfile.mkdtemp(prefix='test-ops.pebble')
+        socket_path = os.path.join(socket_dir, 'test.socket')
 
-    server = socketserver.UnixStreamServer(socket_path, Handler)
+    server = Server(socket_path)
     thread = threading.Thread(target=server.serve_forever)
     thread.start()
 
     def shutdown():
         server.shutdown()
+        server.close_connections()
         server.server_close()
         thread.join()
         os.remove(socket_path)
-        os.rmdir(socket_dir)
+        if socket_dir is not None:
+            os.rmdir(socket_dir)
 
     return (shutdown, socket_path)
 
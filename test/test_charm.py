@@ -18,8 +18,10 @@ import dataclasses
 import enum
 import functools
 import pathlib
+import pickle
 import tempfile
 import typing
+import unittest.mock
 from pathlib import Path
 
 import pytest
@@ -548,6 +550,83 @@ def test_meta_from_charm_root():
         assert meta.requires['foo'].interface_name == 'bar'
 
 
+def test_meta_from_charm_root_cache(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    (tmp_path / 'metadata.yaml').write_text('name: bob\nrequires:\n  foo:\n    interface: bar\n')
+    (tmp_path / 'config.yaml').write_text('options:\n  baz:\n    type: int\n    default: 42\n')
+    cache_path = tmp_path / '.unit-meta.pickle'
+    meta = ops.CharmMeta.from_charm_root(tmp_path, cache_path=cache_path)
+    assert meta.requires['foo'].interface_name == 'bar'
+    assert cache_path.exists()
+
+    def load(*args: typing.Any):
+        raise AssertionError('YAML should not be parsed')
+
+    # The files haven't changed, so the cached metadata is used.
+    monkeypatch.setattr(ops.charm.yaml, 'safe_load', load)
+    meta = ops.CharmMeta.from_charm_root(tmp_path, cache_path=cache_path)
+    assert meta.name == 'bob'
+    assert meta.requires['foo'].interface_name == 'bar'
+    assert meta.config['baz'].default == 42
+    assert meta.actions == {}
+
+    # Rewriting a file with the same content changes its modification time,
+    # but not its hash.
+    (tmp_path / 'config.yaml').write_bytes((tmp_path / 'config.yaml').read_bytes())
+    meta = ops.CharmMeta.from_charm_root(tmp_path, cache_path=cache_path)
+    assert meta.config['baz'].default == 42
+
+    monkeypatch.undo()
+    (tmp_path / 'config.yaml').write_text('options:\n  baz:\n    type: int\n    default: 7\n')
+    (tmp_path / 'actions.yaml').write_text('qux: {}\n')
+    meta = ops.CharmMeta.from_charm_root(tmp_path, cache_path=cache_path)
+    assert meta.config['baz'].default == 7
+    assert list(meta.actions) == ['qux']
+
+
+def test_meta_from_charm_root_bad_cache(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    (tmp_path / 'metadata.yaml').write_text('name: bob\n')
+    cache_path = tmp_path / '.unit-meta.pickle'
+    cache_path.write_bytes(b'not a pickle')
+    assert ops.CharmMeta.from_charm_root(tmp_path, cache_path=cache_path).name == 'bob'
+
+    # A cache written by another version of ops is not used.
+    monkeypatch.setattr(ops.charm, 'version', '0.0.1')
+    ops.CharmMeta.from_charm_root(tmp_path, cache_path=cache_path)
+    monkeypatch.undo()
+    with unittest.mock.patch.object(ops.charm.yaml, 'safe_load', wraps=yaml.safe_load) as load:
+        ops.CharmMeta.from_charm_root(tmp_path, cache_path=cache_path)
+    assert load.called
+
+    # The cache can't be written, but the metadata is still loaded.
+    cache_path = tmp_path / 'missing' / '.unit-meta.pickle'
+    assert ops.CharmMeta.from_charm_root(tmp_path, cache_path=cache_path).name == 'bob'
+
+    (tmp_path / 'metadata.yaml').unlink()
+    with pytest.raises(FileNotFoundError):
+        ops.CharmMeta.from_charm_root(tmp_path, cache_path=cache_path)
+
+
+@pytest.mark.parametrize('fail', ['dump', 'replace'])
+def test_meta_from_charm_root_cache_write_fails(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch, fail: str
+):
+    (tmp_path / 'metadata.yaml').write_text('name: bob\n')
+    cache_path = tmp_path / '.unit-meta.pickle'
+
+    def fails(*args: typing.Any, **kwargs: typing.Any):
+        if fail == 'dump':
+            raise pickle.PicklingError('cannot pickle')
+        raise OSError('cannot rename')
+
+    if fail == 'dump':
+        monkeypatch.setattr(ops.charm.pickle, 'dump', fails)
+    else:
+        monkeypatch.setattr(ops.charm.os, 'replace', fails)
+    assert ops.CharmMeta.from_charm_root(tmp_path, cache_path=cache_path).name == 'bob'
+    # The temporary file isn't left behind.
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['metadata.yaml']
+
+
 def test_config_from_charm_root():
     with tempfile.TemporaryDirectory() as d:
         td = pathlib.Path(d)
@@ -298,6 +298,47 @@ class TestFramework:
             '<MyEvent via MyNotifier[1]/qux[4]>',
         ]
 
+    def test_observer_order_across_emitters(self, request: pytest.FixtureRequest):
+        framework = create_framework(request)
+
+        class MyEvent(ops.EventBase):
+            pass
+
+        class MyNotifier(ops.Object):
+            foo = ops.EventSource(MyEvent)
+            bar = ops.EventSource(MyEvent)
+
+        class MyObserver(ops.Object):
+            def __init__(self, parent: ops.Object, key: str, seen: list[str]):
+                super().__init__(parent, key)
+                self.seen = seen
+
+            def on_any(self, event: ops.EventBase):
+                self.seen.append(f'{self.handle.key}:{event.handle.path}')
+
+        seen: list[str] = []
+        pub1 = MyNotifier(framework, '1')
+        pub2 = MyNotifier(framework, '2')
+        obs1 = MyObserver(framework, '1', seen)
+        obs2 = MyObserver(framework, '2', seen)
+
+        framework.observe(pub1.foo, obs2.on_any)
+        framework.observe(pub2.foo, obs1.on_any)
+        framework.observe(pub1.bar, obs1.on_any)
+        framework.observe(pub1.foo, obs1.on_any)
+
+        pub1.foo.emit()
+        pub2.foo.emit()
+        pub1.bar.emit()
+        pub2.bar.emit()
+
+        assert seen == [
+            '2:MyNotifier[1]/foo[1]',
+            '1:MyNotifier[1]/foo[1]',
+            '1:MyNotifier[2]/foo[2]',
+            '1:MyNotifier[1]/bar[3]',
+        ]
+
     def test_bad_sig_observer(self, request: pytest.FixtureRequest):
         class MyEvent(ops.EventBase):
             pass
@@ -546,6 +587,42 @@ class TestFramework:
         assert len(notices_for_observer(1)) == 0
         assert len(notices_for_observer(2)) == 4
 
+    def test_repeated_defer_custom_storage(self, request: pytest.FixtureRequest):
+        class CustomStorage:
+            """A storage without has_equivalent_notice, which was added later."""
+
+            def __init__(self):
+                self._storage = SQLiteStorage(':memory:')
+
+            def __getattr__(self, name: str):
+                if name == 'has_equivalent_notice':
+                    raise AttributeError(name)
+                return getattr(self._storage, name)
+
+        framework = ops.Framework(
+            CustomStorage(),  # type: ignore
+            'non-existant',
+            meta=ops.CharmMeta(),
+            model=None,  # type: ignore
+        )
+        request.addfinalizer(framework.close)
+
+        class MyNotifier(ops.Object):
+            d = ops.EventSource(SimpleEventWithData)
+
+        class MyObserver(ops.Object):
+            def on_any(self, event: SimpleEventWithData):
+                event.defer()
+
+        pub = MyNotifier(framework, 'n')
+        obs = MyObserver(framework, '1')
+        framework.observe(pub.d, obs.on_any)
+
+        pub.d.emit('foo')
+        pub.d.emit('foo')
+        pub.d.emit('bar')
+        assert len(tuple(framework._storage.notices())) == 2
+
     def test_two_observers_one_deferring(self, request: pytest.FixtureRequest):
         framework = create_framework(request)
 
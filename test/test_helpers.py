@@ -150,9 +150,12 @@ class FakeScript:
         with path.open('wt') as f:
             # Before executing the provided script, dump the provided arguments in calls.txt.
             # RS 'record separator' (octal 036 in ASCII), FS 'file separator' (octal 034 in ASCII).
+            # The call is written with a single printf so that calls made concurrently
+            # are not interleaved.
             f.write(
                 """#!/bin/sh
-{{ printf {name}; printf "\\036%s" "$@"; printf "\\034"; }} >> {path}/calls.txt
+call=$(printf {name}; printf "\\036%s" "$@"; printf "\\034")
+printf "%s" "$call" >> {path}/calls.txt
 
 # Capture key and data from key#file=/some/path arguments
 for word in "$@"; do
@@ -14,16 +14,22 @@
 
 from __future__ import annotations
 
+import contextlib
+import json
 import os
 import pathlib
+import sqlite3
 import subprocess
 import sys
+import textwrap
 import types
 
 import pytest
 
 import ops.testing
 
+from .test_helpers import FakeScript
+
 
 @pytest.mark.parametrize(
     'mod_name',
@@ -90,3 +96,167 @@ def test_ops_testing_doc():
             })
 
     assert expected_names == found_names
+
+
+# Modules that are slow to import and only needed for some dispatches.
+LAZY_MODULES = ('ops.pebble', 'websocket', 'email.parser', 'ops_tracing')
+
+REPORT_MODULES = """
+import json, sys
+print(json.dumps([
+    name for name in sys.modules
+    if type(sys.modules[name]).__name__ != '_LazyModule'
+]))
+"""
+
+
+def _loaded_modules(code: str, env: dict[str, str] | None = None) -> set[str]:
+    environ = os.environ.copy()
+    environ.update(env or {})
+    environ['PYTHONPATH'] = os.pathsep.join(
+        p for p in (os.getcwd(), environ.get('PYTHONPATH')) if p
+    )
+    proc = subprocess.run(
+        [sys.executable, '-c', code + REPORT_MODULES],
+        env=environ,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(json.loads(proc.stdout.splitlines()[-1]))
+
+
+def test_import_is_lazy():
+    modules = _loaded_modules('import ops')
+    assert 'ops.model' in modules
+    assert modules.isdisjoint(LAZY_MODULES)
+
+    modules = _loaded_modules('import ops; ops.pebble.Client')
+    assert {'ops.pebble', 'email.parser'} <= modules
+    assert 'websocket' not in modules
+
+
+def _dispatch(
+    request: pytest.FixtureRequest,
+    charm_dir: pathlib.Path,
+    code: str,
+    extra_env: dict[str, str] | None = None,
+) -> set[str]:
+    fake_script = FakeScript(request)
+    fake_script.write('is-leader', 'echo true')
+    fake_script.write('juju-log', 'exit 0')
+    env = {
+        'JUJU_CHARM_DIR': str(charm_dir),
+        'JUJU_UNIT_NAME': 'test/0',
+        'JUJU_MODEL_NAME': 'test',
+        'JUJU_VERSION': '3.6.8',
+        'JUJU_DISPATCH_PATH': 'hooks/update-status',
+        ops._main.PROFILE_ENV: '',
+        **(extra_env or {}),
+    }
+    return _loaded_modules(textwrap.dedent(code), env)
+
+
+def test_dispatch_is_lazy(request: pytest.FixtureRequest, tmp_path: pathlib.Path):
+    charm_dir = tmp_path / 'charm'
+    charm_dir.mkdir()
+    (charm_dir / 'metadata.yaml').write_text('name: test\n')
+    modules = _dispatch(
+        request,
+        charm_dir,
+        """
+        import ops
+
+        class Charm(ops.CharmBase):
+            pass
+
+        ops.main(Charm)
+        """,
+    )
+    assert (charm_dir / '.unit-state.db').exists()
+    assert 'ops.framework' in modules
+    assert modules.isdisjoint(LAZY_MODULES)
+    assert not (charm_dir / ops._main.TRACING_BUFFER_FILE).exists()
+
+
+@pytest.mark.parametrize('profile', [False, True])
+def test_dispatch_profiler_is_lazy(
+    request: pytest.FixtureRequest, tmp_path: pathlib.Path, profile: bool
+):
+    charm_dir = tmp_path / 'charm'
+    charm_dir.mkdir()
+    (charm_dir / 'metadata.yaml').write_text('name: test\n')
+    modules = _dispatch(
+        request,
+        charm_dir,
+        """
+        import ops
+
+        class Charm(ops.CharmBase):
+            pass
+
+        ops.main(Charm)
+        """,
+        {ops._main.PROFILE_ENV: '1'} if profile else None,
+    )
+    assert ('cProfile' in modules) == profile
+    assert ('pstats' in modules) == profile
+    assert (charm_dir / ops._main.PROFILE_FILE).exists() == profile
+
+
+def _traced_span_names(charm_dir: pathlib.Path) -> list[str]:
+    """Return the names of the buffered spans (in OTLP/JSON), and empty the buffer."""
+    path = charm_dir / ops._main.TRACING_BUFFER_FILE
+    with contextlib.closing(sqlite3.connect(path)) as db, db:
+        rows = db.execute('SELECT data FROM tracing').fetchall()
+        db.execute('DELETE FROM tracing')
+    return [
+        span['name']
+        for (data,) in rows
+        for resource_spans in json.loads(data)['resourceSpans']
+        for scope_spans in resource_spans['scopeSpans']
+        for span in scope_spans['spans']
+    ]
+
+
+def test_dispatch_sets_up_tracing_when_used(
+    request: pytest.FixtureRequest, tmp_path: pathlib.Path
+):
+    pytest.importorskip('ops_tracing')
+    charm_dir = tmp_path / 'charm'
+    charm_dir.mkdir()
+    (charm_dir / 'metadata.yaml').write_text('name: test\n')
+    code = """
+        import ops
+
+        class Charm(ops.CharmBase):
+            def __init__(self, framework: ops.Framework):
+                super().__init__(framework)
+                ops.tracing.set_destination(None, None)
+                framework.observe(self.on.update_status, self._on_update_status)
+
+            def _on_update_status(self, event: ops.UpdateStatusEvent):
+                pass
+
+        ops.main(Charm)
+        """
+    modules = _dispatch(request, charm_dir, code)
+    assert 'ops_tracing' in modules
+    # Tracing was set up during the charm's __init__, after the root span
+    # started, so only the later spans are recorded, without a parent.
+    names = _traced_span_names(charm_dir)
+    assert 'update_status: Charm' in names
+    assert 'ops.main' not in names
+
+    # Trace data was buffered, so later dispatches set up tracing up front
+    # and record the whole dispatch.
+    modules = _dispatch(request, charm_dir, code)
+    assert 'ops_tracing' in modules
+    names = _traced_span_names(charm_dir)
+    assert {'ops.main', 'update_status: Charm'} <= set(names)
+
+
+def test_lazy_modules_loaded_before_threads():
+    # The lazy loader isn't thread-safe before Python 3.12.
+    modules = _loaded_modules('import ops; ops.model._run_concurrently(str, [(1,), (2,)])')
+    assert ('ops.pebble' in modules) == (sys.version_info < (3, 12))
@@ -18,6 +18,7 @@ import io
 import logging
 import re
 import sys
+import threading
 import unittest
 import warnings
 from unittest.mock import patch
@@ -163,5 +164,85 @@ class TestLogging:
         assert len(calls[2][1]) == 9
 
 
+class BlockingModelBackend(FakeModelBackend):
+    """A backend that blocks in juju_log until released."""
+
+    def __init__(self):
+        super().__init__()
+        self.blocked = threading.Event()
+        self.release = threading.Event()
+
+    def juju_log(self, level: str, message: str):
+        self.blocked.set()
+        self.release.wait()
+        super().juju_log(level, message)
+
+
+class TestBackgroundLogging:
+    def test_coalesced_in_order(self, logger: logging.Logger):
+        backend = BlockingModelBackend()
+        handler = ops.log.setup_root_logging(backend, background=True)
+        logger.info('first')
+        # Wait for the worker to be blocked sending the first message.
+        backend.blocked.wait()
+        logger.debug('one')
+        logger.debug('two')
+        logger.info('three')
+        logger.debug('four')
+        assert backend.calls() == []
+
+        backend.release.set()
+        handler.flush()
+        assert backend.calls(clear=True) == [
+            ('INFO', 'first'),
+            ('DEBUG', 'one\ntwo'),
+            ('INFO', 'three'),
+            ('DEBUG', 'four'),
+        ]
+        handler.close()
+        assert handler._worker is not None
+        assert not handler._worker.is_alive()
+
+    def test_coalesce_max_len(self):
+        entries = [('DEBUG', 'a' * 4), ('DEBUG', 'b' * 4), ('DEBUG', 'c' * 4), ('INFO', 'd')]
+        assert list(ops.log.JujuLogHandler._coalesce(entries, 10)) == [
+            ('DEBUG', 'aaaa\nbbbb'),
+            ('DEBUG', 'cccc'),
+            ('INFO', 'd'),
+        ]
+
+    def test_queue_full(self, logger: logging.Logger):
+        backend = BlockingModelBackend()
+        handler = ops.log.JujuLogHandler(backend, background=True, max_queue=2)
+        logger.addHandler(handler)
+        logger.info('first')
+        backend.blocked.wait()
+        for i in range(5):
+            logger.info('message %d', i)
+        assert handler.dropped == 3
+
+        backend.release.set()
+        handler.close()
+        assert backend.calls() == [
+            ('INFO', 'first'),
+            ('INFO', 'message 0\nmessage 1'),
+            ('WARNING', '3 log messages dropped (queue full).'),
+        ]
+
+    def test_uncaught_exception_flushed(self, logger: logging.Logger):
+        backend = BlockingModelBackend()
+        backend.release.set()
+        handler = ops.log.setup_root_logging(backend, background=True)
+        try:
+            raise RuntimeError('boom')
+        except RuntimeError as e:
+            with patch('ops.log._log_security_event'):
+                sys.excepthook(RuntimeError, e, e.__traceback__)
+        calls = backend.calls()
+        assert calls[0][0] == 'ERROR'
+        assert calls[0][1].startswith('Uncaught exception while in charm code:')
+        handler.close()
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -36,6 +36,7 @@ import pytest
 
 import ops
 from ops._main import _should_use_controller_storage
+from ops._private.profiler import DispatchProfiler
 from ops.jujucontext import JujuContext
 from ops.storage import SQLiteStorage
 
@@ -137,6 +138,113 @@ class TestCharmInit:
 
                 ops.main(charm_class, **kwargs)
 
+    @pytest.mark.parametrize(
+        'profile,event,compacted',
+        [
+            ('default', 'upgrade-charm', False),
+            ('performance', 'install', False),
+            ('performance', 'upgrade-charm', True),
+        ],
+    )
+    def test_storage_profile(self, profile: str, event: str, compacted: bool):
+        with patch('ops.storage.SQLiteStorage.compact') as compact:
+            with patch('ops.storage.SQLiteStorage', wraps=SQLiteStorage) as storage:
+                self._check(
+                    ops.CharmBase,
+                    extra_environ={'JUJU_DISPATCH_PATH': f'hooks/{event}'},
+                    storage_profile=profile,
+                )
+        assert storage.call_args.kwargs == {'profile': profile}
+        assert compact.called == compacted
+
+    @pytest.mark.parametrize('background', [False, True])
+    def test_background_logging(self, background: bool):
+        with patch('ops._main.setup_root_logging') as setup_root_logging:
+            self._check(ops.CharmBase, background_logging=background)
+        assert setup_root_logging.call_args.kwargs['background'] is background
+        # The logs are flushed at the end of the dispatch.
+        setup_root_logging.return_value.flush.assert_called()
+
+    @pytest.mark.parametrize('buffer', [False, True])
+    def test_buffer_relation_data(self, buffer: bool):
+        buffered: list[bool] = []
+
+        class MyCharm(ops.CharmBase):
+            def __init__(self, framework: ops.Framework):
+                super().__init__(framework)
+                buffered.append(self.model._backend._buffer_relation_data)
+
+        with patch('ops.model._ModelBackend.flush_relation_data') as flush:
+            self._check(MyCharm, buffer_relation_data=buffer)
+        assert buffered == [buffer]
+        # The buffer is flushed when the framework commits.
+        flush.assert_called_once_with()
+
+    @pytest.mark.parametrize('defer', [False, True])
+    def test_defer_status(self, defer: bool):
+        deferred: list[bool] = []
+
+        class MyCharm(ops.CharmBase):
+            def __init__(self, framework: ops.Framework):
+                super().__init__(framework)
+                deferred.append(self.model._backend._defer_status)
+
+        with patch('ops.model._ModelBackend.flush_status') as flush:
+            self._check(MyCharm, defer_status=defer)
+        assert deferred == [defer]
+        # The status is set when the framework commits.
+        flush.assert_called_once_with()
+
+    def test_profile(self):
+        with patch('ops._private.profiler.DispatchProfiler.write') as write:
+            self._check(ops.CharmBase, extra_environ={'JUJU_OPS_PROFILE': '1'})
+        report, path = write.call_args.args
+        assert path.name == '.unit-profile.json'
+        assert {'meta', 'storage', 'framework', 'charm_init', 'commit'} <= set(report['phases_ms'])
+        assert report['total_ms'] >= sum(
+            ms for name, ms in report['phases_ms'].items() if name != 'startup'
+        )
+        assert report['functions']
+        attributes = DispatchProfiler.span_attributes(report)
+        assert attributes['ops.profile.commit_ms'] == report['phases_ms']['commit']
+
+    def test_no_profile(self):
+        with patch('ops._private.profiler.DispatchProfiler.write') as write:
+            self._check(ops.CharmBase)
+        write.assert_not_called()
+
+    @pytest.mark.parametrize('event,name', [('install', 'old'), ('upgrade-charm', 'new')])
+    def test_meta_cache(self, tmp_path: Path, event: str, name: str):
+        metadata = tmp_path / 'metadata.yaml'
+        metadata.write_text('name: old')
+        ops.CharmMeta.from_charm_root(tmp_path, cache_path=tmp_path / '.unit-meta.pickle')
+        # Change the metadata without changing its size or modification time,
+        # so that the cache looks valid.
+        stat = metadata.stat()
+        metadata.write_text('name: new')
+        os.utime(metadata, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        names: list[str] = []
+
+        class MyCharm(ops.CharmBase):
+            def __init__(self, framework: ops.Framework):
+                super().__init__(framework)
+                names.append(self.meta.name)
+
+        environ = {
+            'JUJU_UNIT_NAME': 'test_main/0',
+            'JUJU_MODEL_NAME': 'mymodel',
+            'JUJU_VERSION': '2.8.0',
+            'JUJU_CHARM_DIR': str(tmp_path),
+            'JUJU_DISPATCH_PATH': f'hooks/{event}',
+        }
+        with patch.dict(os.environ, environ):
+            ops.main(MyCharm)
+        # The cache is only discarded on upgrade-charm.
+        assert names == [name]
+        meta = ops.CharmMeta.from_charm_root(tmp_path, cache_path=tmp_path / '.unit-meta.pickle')
+        assert meta.name == name
+
     def test_init_signature_passthrough(self):
         class MyCharm(ops.CharmBase):
             def __init__(self, framework: ops.Framework):
@@ -15,6 +15,7 @@
 from __future__ import annotations
 
 import datetime
+import hashlib
 import io
 import ipaddress
 import json
@@ -1597,6 +1598,272 @@ def test_push_path_relative(case: PushPullCase):
             os.chdir(cwd)
 
 
+class TestPushPullBatches:
+    @pytest.fixture
+    def harness(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(ops.model, '_MAX_BATCH_FILES', 3)
+        monkeypatch.setattr(ops.model, '_MAX_BATCH_BYTES', 100)
+        harness = ops.testing.Harness(
+            ops.CharmBase,
+            meta="""
+            name: test-app
+            containers:
+              foo:
+                resource: foo-image
+            """,
+        )
+        harness.begin()
+        harness.set_can_connect('foo', True)
+        yield harness
+        harness.cleanup()
+
+    @pytest.fixture
+    def container(self, harness: ops.testing.Harness[ops.CharmBase]):
+        return harness.model.unit.containers['foo']
+
+    @pytest.fixture
+    def sha256sum(
+        self, container: ops.Container, monkeypatch: pytest.MonkeyPatch
+    ) -> list[list[str]]:
+        """Return the sha256sum commands that the testing backend ran in the workload."""
+        commands: list[list[str]] = []
+        original = container._pebble._sha256sum  # type: ignore
+
+        def sha256sum(command: list[str]):
+            commands.append(command)
+            return original(command)
+
+        monkeypatch.setattr(container._pebble, '_sha256sum', sha256sum)
+        return commands
+
+    def test_push_path(
+        self, container: ops.Container, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        src = tmp_path / 'src'
+        (src / 'sub').mkdir(parents=True)
+        for i in range(5):
+            (src / f'{i}.txt').write_text(f'file {i}')
+        (src / 'sub' / 'big.txt').write_text('x' * 150)
+        (src / 'sub' / 'private.txt').write_text('secret')
+        (src / 'sub' / 'private.txt').chmod(0o600)
+
+        push_many = mock.Mock(wraps=container._pebble.push_many)
+        monkeypatch.setattr(container._pebble, 'push_many', push_many)
+        container.push_path(src, '/dst')
+
+        for i in range(5):
+            assert container.pull(f'/dst/src/{i}.txt').read() == f'file {i}'
+        assert container.pull('/dst/src/sub/big.txt').read() == 'x' * 150
+        assert container.pull('/dst/src/sub/private.txt').read() == 'secret'
+        batches = sorted(
+            (call.kwargs['permissions'], len(call.args[0])) for call in push_many.call_args_list
+        )
+        # At most 3 files or 100 bytes in a batch, and the differently
+        # permissioned file in its own batch.
+        assert batches == [(0o600, 1), (0o644, 1), (0o644, 2), (0o644, 3)]
+
+    def test_push_path_errors(
+        self, container: ops.Container, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        src = tmp_path / 'src'
+        src.mkdir()
+        for name in ('a', 'b', 'c'):
+            (src / name).write_text(name)
+
+        def push_many(files: list[tuple[str, typing.BinaryIO]], **kwargs: typing.Any):
+            files = [(path, source) for path, source in files if str(path) != '/dst/b']
+            errors = original(files, **kwargs)
+            errors['/dst/b'] = pebble.PathError('permission-denied', 'denied')
+            return errors
+
+        original = container._pebble.push_many
+        monkeypatch.setattr(container._pebble, 'push_many', push_many)
+        with pytest.raises(ops.MultiPushPullError) as excinfo:
+            container.push_path([src / 'a', src / 'b', src / 'c', src / 'missing'], '/dst')
+        errors = dict(excinfo.value.errors)
+        assert sorted(errors) == [str(src / 'b'), str(src / 'missing')]
+        assert isinstance(errors[str(src / 'b')], pebble.PathError)
+        assert isinstance(errors[str(src / 'missing')], FileNotFoundError)
+        assert container.pull('/dst/a').read() == 'a'
+        assert container.pull('/dst/c').read() == 'c'
+        assert not container.exists('/dst/b')
+
+    def test_pull_path(
+        self, container: ops.Container, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        for i in range(5):
+            container.push(f'/src/{i}.txt', f'file {i}', make_dirs=True)
+        container.push('/src/sub/big.txt', 'x' * 150, make_dirs=True)
+
+        pull_many = mock.Mock(wraps=container._pebble.pull_many)
+        monkeypatch.setattr(container._pebble, 'pull_many', pull_many)
+        container.pull_path('/src', tmp_path)
+
+        for i in range(5):
+            assert (tmp_path / 'src' / f'{i}.txt').read_text() == f'file {i}'
+        assert (tmp_path / 'src' / 'sub' / 'big.txt').read_text() == 'x' * 150
+        assert sorted(len(call.args[0]) for call in pull_many.call_args_list) == [1, 2, 3]
+
+    def test_pull_path_errors(
+        self, container: ops.Container, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        container.push('/src/a', 'a', make_dirs=True)
+        container.push('/src/b', 'b', make_dirs=True)
+
+        def pull_many(paths: list[str], *, encoding: str | None = 'utf-8'):
+            results = original(paths, encoding=encoding)
+            results['/src/b'] = pebble.PathError('permission-denied', 'denied')
+            return results
+
+        original = container._pebble.pull_many
+        monkeypatch.setattr(container._pebble, 'pull_many', pull_many)
+        with pytest.raises(ops.MultiPushPullError) as excinfo:
+            container.pull_path(['/src/a', '/src/b'], tmp_path)
+        assert [path for path, _ in excinfo.value.errors] == ['/src/b']
+        error = excinfo.value.errors[0][1]
+        assert isinstance(error, pebble.PathError)
+        assert error.kind == 'permission-denied'
+        assert (tmp_path / 'a').read_text() == 'a'
+        assert not (tmp_path / 'b').exists()
+
+    def test_push_if_changed(self, container: ops.Container, monkeypatch: pytest.MonkeyPatch):
+        assert container.push('/etc/app.conf', 'a=1', make_dirs=True, if_changed=True)
+        push = mock.Mock(wraps=container._pebble.push)
+        monkeypatch.setattr(container._pebble, 'push', push)
+
+        assert not container.push('/etc/app.conf', 'a=1', if_changed=True)
+        assert not container.push('/etc/app.conf', io.BytesIO(b'a=1'), if_changed=True)
+        push.assert_not_called()
+
+        assert container.push('/etc/app.conf', 'a=2', if_changed=True)
+        assert container.push('/etc/app.conf', 'a=2', permissions=0o600, if_changed=True)
+        assert container.push('/etc/app.conf', 'a=2', if_changed=True)
+        assert push.call_count == 3
+        assert container.pull('/etc/app.conf').read() == 'a=2'
+
+    def test_sync_path(
+        self, container: ops.Container, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        src = tmp_path / 'src'
+        (src / 'sub').mkdir(parents=True)
+        for i in range(5):
+            (src / f'{i}.txt').write_text(f'file {i}')
+        (src / 'sub' / 'big.txt').write_text('x' * 150)
+        pushed = container.sync_path(src, '/dst')
+        assert len(pushed) == 6
+
+        push_many = mock.Mock(wraps=container._pebble.push_many)
+        monkeypatch.setattr(container._pebble, 'push_many', push_many)
+        assert container.sync_path(src, '/dst') == []
+        push_many.assert_not_called()
+
+        (src / '1.txt').write_text('file 9')  # Same size, different content.
+        (src / '2.txt').write_text('longer file 2')
+        (src / '3.txt').chmod(0o600)
+        (src / 'sub' / 'new.txt').write_text('new')
+        pushed = container.sync_path(src, '/dst')
+        assert sorted(pushed) == [
+            '/dst/src/1.txt',
+            '/dst/src/2.txt',
+            '/dst/src/3.txt',
+            '/dst/src/sub/new.txt',
+        ]
+        assert container.pull('/dst/src/1.txt').read() == 'file 9'
+        assert container.pull('/dst/src/2.txt').read() == 'longer file 2'
+        assert container.list_files('/dst/src/3.txt')[0].permissions == 0o600
+        assert container.pull('/dst/src/sub/new.txt').read() == 'new'
+        assert container.sync_path(src, '/dst') == []
+
+    def test_push_if_changed_remote_digest(
+        self, container: ops.Container, sha256sum: list[list[str]], monkeypatch: pytest.MonkeyPatch
+    ):
+        assert container.push('/etc/app.conf', 'a=1', make_dirs=True, if_changed=True)
+        pull_stream = mock.Mock(wraps=container._pebble.pull_stream)
+        monkeypatch.setattr(container._pebble, 'pull_stream', pull_stream)
+
+        assert not container.push('/etc/app.conf', 'a=1', if_changed=True)
+        assert container.push('/etc/app.conf', 'a=2', if_changed=True)
+        assert sha256sum == [['sha256sum', '--', '/etc/app.conf']] * 2
+        # The remote content was compared without reading it back.
+        pull_stream.assert_not_called()
+
+    def test_sync_path_remote_digests(
+        self,
+        container: ops.Container,
+        sha256sum: list[list[str]],
+        tmp_path: pathlib.Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        src = tmp_path / 'src'
+        src.mkdir()
+        for i in range(5):
+            (src / f'{i}.txt').write_text(f'file {i}')
+        container.sync_path(src, '/dst')
+        pull_many = mock.Mock(wraps=container._pebble.pull_many)
+        monkeypatch.setattr(container._pebble, 'pull_many', pull_many)
+
+        assert container.sync_path(src, '/dst') == []
+        (src / '1.txt').write_text('file 9')  # Same size, different content.
+        assert container.sync_path(src, '/dst') == ['/dst/src/1.txt']
+        assert container.pull('/dst/src/1.txt').read() == 'file 9'
+        pull_many.assert_not_called()
+        # One sha256sum for each batch of files.
+        assert len(sha256sum) == 4
+
+    def test_remote_digests_unreadable_file(self, container: ops.Container):
+        container.push('/etc/a.conf', 'a', make_dirs=True)
+        container.push('/etc/back\\slash\nnewline', 'b')
+        digests = container._remote_digests([
+            '/etc/a.conf',
+            '/etc/missing',
+            '/etc/back\\slash\nnewline',
+        ])
+        assert digests == [
+            hashlib.sha256(b'a').hexdigest(),
+            None,
+            hashlib.sha256(b'b').hexdigest(),
+        ]
+        # A file that can't be read doesn't stop using sha256sum.
+        assert not container._no_remote_digests
+        assert not container.push('/etc/a.conf', 'a', if_changed=True)
+        assert container.push('/etc/missing', 'm', if_changed=True)
+
+    def test_remote_digests_no_sha256sum(
+        self, harness: ops.testing.Harness[ops.CharmBase], container: ops.Container
+    ):
+        harness.handle_exec('foo', ['sha256sum'], result=127)
+        container.push('/etc/a.conf', 'a', make_dirs=True)
+        assert container._remote_digests(['/etc/a.conf']) is None
+        assert container._no_remote_digests
+        # The content is compared by reading the file back instead.
+        assert not container.push('/etc/a.conf', 'a', if_changed=True)
+        assert container.push('/etc/a.conf', 'b', if_changed=True)
+
+    def test_sync_path_errors(
+        self, container: ops.Container, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        src = tmp_path / 'src'
+        src.mkdir()
+        for name in ('a', 'b'):
+            (src / name).write_text(name)
+
+        def push_many(files: list[tuple[str, typing.BinaryIO]], **kwargs: typing.Any):
+            files = [(path, source) for path, source in files if str(path) != '/dst/b']
+            errors = original(files, **kwargs)
+            errors['/dst/b'] = pebble.PathError('permission-denied', 'denied')
+            return errors
+
+        original = container._pebble.push_many
+        monkeypatch.setattr(container._pebble, 'push_many', push_many)
+        with pytest.raises(ops.MultiPushPullError) as excinfo:
+            container.sync_path([src / 'a', src / 'b', src / 'missing'], '/dst')
+        assert sorted(path for path, _ in excinfo.value.errors) == [
+            str(src / 'b'),
+            str(src / 'missing'),
+        ]
+        assert container.pull('/dst/a').read() == 'a'
+
+
 class TestApplication:
     @pytest.fixture
     def harness(self):
@@ -3410,7 +3677,9 @@ echo '{
     "relations": {}
 }'""",
         )
-        assert backend.planned_units() == 2
+        # The goal state is cached for the dispatch, unless the cache isn't used.
+        assert backend.planned_units() == 0
+        assert backend.planned_units(use_cache=False) == 2
 
         # active and dying units
         fake_script.write(
@@ -3424,7 +3693,103 @@ echo '{
     "relations": {}
 }'""",
         )
-        assert backend.planned_units() == 1
+        assert backend.planned_units(use_cache=False) == 1
+
+    def test_read_cache(self, fake_script: FakeScript, backend: _ModelBackend):
+        fake_script.write('config-get', """echo '{"foo": "bar"}'""")
+        content = '{"message": "", "status": "active", "status-data": {}}'
+        fake_script.write('status-get', f"echo '{content}'")
+        fake_script.write('status-set', 'exit 0')
+        fake_script.write('opened-ports', """echo '["8080/tcp"]'""")
+        fake_script.write('open-port', 'exit 0')
+
+        config = backend.config_get()
+        config['foo'] = 'changed'
+        assert backend.config_get() == {'foo': 'bar'}
+        assert backend.status_get() == {'status': 'active', 'message': ''}
+        assert backend.status_get() == {'status': 'active', 'message': ''}
+        assert backend.opened_ports() == {ops.Port('tcp', 8080)}
+        assert [call[0] for call in fake_script.calls(clear=True)] == [
+            'config-get',
+            'status-get',
+            'opened-ports',
+        ]
+        assert backend.cache_hits == {'config-get': 1, 'status-get': 1}
+
+        # Writes invalidate the matching reads.
+        backend.status_set('active', is_app=True)
+        backend.status_get()
+        backend.status_set('active')
+        backend.status_get()
+        backend.open_port('tcp', 80)
+        backend.opened_ports()
+        # Reads can skip the cache.
+        backend.config_get(use_cache=False)
+        assert [call[0] for call in fake_script.calls(clear=True)] == [
+            'status-set',
+            'status-set',
+            'status-get',
+            'open-port',
+            'opened-ports',
+            'config-get',
+        ]
+        assert backend.cache_misses == {
+            'config-get': 2,
+            'status-get': 2,
+            'opened-ports': 2,
+        }
+
+    def test_invalidate_cache(self, fake_script: FakeScript, backend: _ModelBackend):
+        model = ops.Model(ops.CharmMeta(), backend)
+        fake_script.write('config-get', """echo '{"foo": "bar"}'""")
+        content = '{"message": "", "status": "active", "status-data": {}}'
+        fake_script.write('status-get', f"echo '{content}'")
+        fake_script.write(
+            'network-get',
+            """echo '{"bind-addresses": [], "ingress-addresses": ["10.0.0.1"]}'""",
+        )
+        fake_script.write('goal-state', """echo '{"units": {}, "relations": {}}'""")
+        fake_script.write('opened-ports', """echo '["8080/tcp"]'""")
+
+        def read_all():
+            assert model.config['foo'] == 'bar'
+            assert model.unit.status == ops.ActiveStatus()
+            assert model.get_binding('db').network.ingress_address == ipaddress.ip_address(
+                '10.0.0.1'
+            )
+            assert model.app.planned_units() == 0
+            assert model.unit.opened_ports() == {ops.Port('tcp', 8080)}
+
+        expected = ['config-get', 'status-get', 'network-get', 'goal-state', 'opened-ports']
+        read_all()
+        read_all()
+        assert [call[0] for call in fake_script.calls(clear=True)] == expected
+
+        # Everything is read from Juju again after invalidating the cache.
+        model.invalidate_cache()
+        read_all()
+        assert [call[0] for call in fake_script.calls(clear=True)] == expected
+
+    def test_read_cache_network_get(self, fake_script: FakeScript, backend: _ModelBackend):
+        fake_script.write(
+            'network-get',
+            """case "$*" in *missing*) echo 'relation not found' >&2; exit 2;; esac
+echo '{"bind-addresses": [], "ingress-addresses": ["10.0.0.1"], "egress-subnets": []}'""",
+        )
+        for _ in range(2):
+            backend.network_get('db', 1)
+            backend.network_get('db', 2)
+            backend.network_get('ingress')
+        assert fake_script.calls(clear=True) == [
+            ['network-get', '--format=json', '-r', '1', 'db'],
+            ['network-get', '--format=json', '-r', '2', 'db'],
+            ['network-get', '--format=json', 'ingress'],
+        ]
+        # Errors aren't cached.
+        for _ in range(2):
+            with pytest.raises(ops.RelationNotFoundError):
+                backend.network_get('missing')
+        assert len(fake_script.calls()) == 2
 
 
 class TestLazyMapping:
@@ -3645,6 +4010,98 @@ class TestSecrets:
             model.get_secret(id='123')
         assert not isinstance(excinfo.value, ops.SecretNotFoundError)
 
+    def test_get_secret_cached(self, fake_script: FakeScript, model: ops.Model):
+        fake_script.write('secret-get', """echo '{"foo": "g"}'""")
+        fake_script.write('secret-set', '')
+        fake_script.write('secret-info-get', """echo '{"123": {"revision": 1}}'""")
+        secret_id = f'secret://{model._backend.model_uuid}/123'
+
+        model.get_secret(id='123', label='lbl')
+        # The tracked revision's content is kept for the dispatch, by ID and label.
+        assert model.get_secret(id='123').get_content() == {'foo': 'g'}
+        assert model.get_secret(label='lbl').get_content() == {'foo': 'g'}
+        assert fake_script.calls(clear=True) == [
+            ['secret-get', '--format=json', secret_id, '--label', 'lbl']
+        ]
+
+        # Refreshing and peeking always query the secret storage.
+        secret = model.get_secret(id='123')
+        secret.get_content(refresh=True)
+        secret.peek_content()
+        secret.peek_content()
+        model.get_secret(id='123')
+        assert fake_script.calls(clear=True) == [
+            ['secret-get', '--format=json', secret_id, '--refresh'],
+            ['secret-get', '--format=json', secret_id, '--peek'],
+            ['secret-get', '--format=json', secret_id, '--peek'],
+        ]
+
+        # Changing a secret may change the content of any of them.
+        secret.set_content({'foo': 'h'})
+        model.get_secret(id='123')
+        assert [call[0] for call in fake_script.calls(clear=True)] == [
+            'secret-info-get',
+            'secret-set',
+            'secret-get',
+        ]
+
+    def test_get_secret_after_peek(self, fake_script: FakeScript, model: ops.Model):
+        # The tracked revision has "old" content, and the latest has "new" content.
+        fake_script.write(
+            'secret-get',
+            """case "$*" in
+            *--peek*|*--refresh*) echo '{"foo": "new"}';;
+            *) echo '{"foo": "old"}';;
+            esac""",
+        )
+        backend = model._backend
+        secret_id = f'secret://{backend.model_uuid}/123'
+
+        assert backend.secret_get(id=secret_id, peek=True) == {'foo': 'new'}
+        assert backend.secret_get(id=secret_id) == {'foo': 'old'}
+        assert backend.secret_get(id=secret_id, peek=True) == {'foo': 'new'}
+        assert backend.secret_get(id=secret_id) == {'foo': 'old'}
+        assert fake_script.calls(clear=True) == [
+            ['secret-get', '--format=json', secret_id, '--peek'],
+            ['secret-get', '--format=json', secret_id],
+            ['secret-get', '--format=json', secret_id, '--peek'],
+        ]
+
+        # Refreshing tracks the latest revision, so that's what's cached from then on.
+        assert backend.secret_get(id=secret_id, refresh=True) == {'foo': 'new'}
+        assert backend.secret_get(id=secret_id) == {'foo': 'new'}
+        assert fake_script.calls(clear=True) == [
+            ['secret-get', '--format=json', secret_id, '--refresh'],
+        ]
+
+    def test_prefetch_secrets(
+        self, fake_script: FakeScript, model: ops.Model, caplog: pytest.LogCaptureFixture
+    ):
+        fake_script.write('secret-ids', """echo '["secret:1", "secret:2", "secret:gone"]'""")
+        fake_script.write(
+            'secret-get',
+            """case "$*" in *gone*) echo 'ERROR secret not found' >&2; exit 1;; esac
+            echo '{"foo": "g"}'""",
+        )
+
+        with caplog.at_level(logging.DEBUG, logger='ops.model'):
+            secrets = model.prefetch_secrets()
+        assert [secret.id for secret in secrets] == ['secret:1', 'secret:2']
+        assert 'Could not prefetch secret secret:gone' in caplog.text
+        assert [secret.get_content() for secret in secrets] == [{'foo': 'g'}, {'foo': 'g'}]
+        calls = fake_script.calls(clear=True)
+        assert calls[0] == ['secret-ids', '--format=json']
+        assert sorted(calls[1:]) == [
+            ['secret-get', '--format=json', 'secret:1'],
+            ['secret-get', '--format=json', 'secret:2'],
+            ['secret-get', '--format=json', 'secret:gone'],
+        ]
+
+        assert model.get_secret(id='secret:2').get_content() == {'foo': 'g'}
+        assert fake_script.calls() == []
+        with pytest.raises(ops.SecretNotFoundError):
+            model.get_secret(id='secret:gone')
+
     def test_secret_unique_identifier(self, fake_script: FakeScript, model: ops.Model):
         fake_script.write('secret-get', """echo '{"foo": "g"}'""")
 
@@ -4788,5 +5245,284 @@ def test_departing_unit_data_available(fake_script: FakeScript):
     assert ['relation-get', '--format=json', '-r', '1', '-', 'db/1'] in calls
 
 
+class TestRelationPrefetch:
+    @pytest.fixture
+    def model(self, fake_script: FakeScript, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setenv('JUJU_VERSION', '3.6.8')
+        fake_script.write('relation-ids', """echo '["db:1", "db:2"]'""")
+        fake_script.write(
+            'relation-list',
+            """
+            case "$2$3" in
+                --app*) echo '"remote"' ;;
+                -r1) echo '["remote/0", "remote/1"]' ;;
+                *) echo '[]' ;;
+            esac
+            """,
+        )
+        fake_script.write(
+            'relation-get',
+            """
+            for member in "$@"; do :; done
+            case "$4" in
+                --app) echo '{"from": "'$member'", "app": "true"}' ;;
+                *) echo '{"from": "'$member'"}' ;;
+            esac
+            """,
+        )
+        meta = ops.CharmMeta({'name': 'myapp', 'requires': {'db': {'interface': 'db'}}})
+        return ops.Model(meta, _ModelBackend('myapp/0'))
+
+    def test_prefetch_leader(self, fake_script: FakeScript, model: ops.Model):
+        fake_script.write('is-leader', 'echo true')
+        relations = model.relations.prefetch('db')
+        assert relations == model.relations['db']
+        calls = fake_script.calls(clear=True)
+        # relation-list for both relations, and to find the remote app of the
+        # relation with no units; relation-get for each of the 8 databags.
+        assert sorted(call[0] for call in calls) == [
+            'is-leader',
+            *['relation-get'] * 8,
+            'relation-ids',
+            *['relation-list'] * 3,
+        ]
+
+        rel1, rel2 = relations
+        remote0 = model.get_unit('remote/0')
+        assert rel1.units == {remote0, model.get_unit('remote/1')}
+        assert rel1.data[remote0] == {'from': 'remote/0'}
+        assert rel1.data[rel1.app] == {'from': 'remote', 'app': 'true'}
+        assert rel1.data[model.unit] == {'from': 'myapp/0'}
+        assert rel1.data[model.app] == {'from': 'myapp', 'app': 'true'}
+        assert rel2.units == set()
+        assert rel2.data[model.app] == {'from': 'myapp', 'app': 'true'}
+        # Everything was already loaded.
+        assert fake_script.calls() == []
+
+    def test_prefetch_not_leader(self, fake_script: FakeScript, model: ops.Model):
+        fake_script.write('is-leader', 'echo false')
+        model.relations.prefetch('db')
+        calls = fake_script.calls(clear=True)
+        app_calls = [call for call in calls if call[0] == 'relation-get' and '--app' in call]
+        # Only the remote application databags.
+        assert sorted(app_calls) == [
+            ['relation-get', '--format=json', '-r', '1', '--app', '-', 'remote'],
+            ['relation-get', '--format=json', '-r', '2', '--app', '-', 'remote'],
+        ]
+
+    def test_prefetch_after_access(self, fake_script: FakeScript, model: ops.Model):
+        fake_script.write('is-leader', 'echo true')
+        relation = model.relations['db'][0]
+        assert relation.data[model.unit] == {'from': 'myapp/0'}
+        fake_script.calls(clear=True)
+        model.relations.prefetch('db')
+        calls = fake_script.calls(clear=True)
+        assert ['relation-ids', 'db', '--format=json'] not in calls
+        assert ['relation-get', '--format=json', '-r', '1', '-', 'myapp/0'] not in calls
+        assert ['relation-get', '--format=json', '-r', '2', '-', 'myapp/0'] in calls
+
+    def test_relation_data_prefetch(self, fake_script: FakeScript, model: ops.Model):
+        fake_script.write('is-leader', 'echo false')
+        relation = model.relations['db'][0]
+        fake_script.calls(clear=True)
+        relation.data.prefetch()
+        calls = fake_script.calls(clear=True)
+        # Both remote units, the remote app, and this unit, but not this app.
+        assert sorted(call[-1] for call in calls if call[0] == 'relation-get') == [
+            'myapp/0',
+            'remote',
+            'remote/0',
+            'remote/1',
+        ]
+        assert relation.data[model.get_unit('remote/1')] == {'from': 'remote/1'}
+        assert relation.data[relation.app] == {'from': 'remote', 'app': 'true'}
+        assert fake_script.calls() == []
+
+    def test_prefetch_errors(self, fake_script: FakeScript, model: ops.Model):
+        fake_script.write('is-leader', 'echo true')
+        fake_script.write('relation-get', 'echo ERROR cannot read settings >&2; exit 2')
+        relation = model.relations.prefetch('db')[0]
+        fake_script.write('relation-get', """echo '{"now": "ok"}'""")
+        # The databag is loaded when it is accessed.
+        assert relation.data[model.unit] == {'now': 'ok'}
+
+
+class TestBufferedRelationData:
+    @pytest.fixture
+    def model(self, fake_script: FakeScript, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setenv('JUJU_VERSION', '3.6.8')
+        fake_script.write('is-leader', 'echo true')
+        fake_script.write('relation-ids', """echo '["db:1"]'""")
+        fake_script.write('relation-list', """echo '["remote/0"]'""")
+        fake_script.write('relation-get', """echo '{"old": "value", "keep": "this"}'""")
+        # Save the data passed on stdin, one JSON object per line.
+        fake_script.write(
+            'relation-set',
+            f'cat >> {fake_script.path}/set.txt; echo >> {fake_script.path}/set.txt',
+        )
+        meta = ops.CharmMeta({'name': 'myapp', 'requires': {'db': {'interface': 'db'}}})
+        backend = _ModelBackend('myapp/0')
+        backend._buffer_relation_data = True
+        backend._hook_is_running = 'db-relation-changed'
+        return ops.Model(meta, backend)
+
+    def test_writes_buffered(self, fake_script: FakeScript, model: ops.Model):
+        relation = model.relations['db'][0]
+        app_data = relation.data[model.app]
+        for i in range(15):
+            app_data[f'key{i}'] = str(i)
+        del app_data['old']
+        relation.data[model.unit].update({'address': '10.0.0.1'})
+        # Reads see the buffered writes, even for a databag that hasn't been loaded yet.
+        assert app_data['key14'] == '14'
+        assert 'old' not in app_data
+        model.relations._invalidate('db')
+        relation = model.relations['db'][0]
+        assert relation.data[model.unit] == {'address': '10.0.0.1', 'keep': 'this', 'old': 'value'}
+        assert 'relation-set' not in [call[0] for call in fake_script.calls()]
+
+        model.flush_relation_data()
+        set_calls = [call for call in fake_script.calls(clear=True) if call[0] == 'relation-set']
+        assert set_calls == [
+            ['relation-set', '-r', '1', '--app', '--file', '-'],
+            ['relation-set', '-r', '1', '--file', '-'],
+        ]
+        app_set, unit_set = (fake_script.path / 'set.txt').read_text().splitlines()
+        assert json.loads(app_set) == {**{f'key{i}': str(i) for i in range(15)}, 'old': ''}
+        assert json.loads(unit_set) == {'address': '10.0.0.1'}
+        # Nothing left to write.
+        model.flush_relation_data()
+        assert fake_script.calls() == []
+
+    def test_writes_validated(self, fake_script: FakeScript, model: ops.Model):
+        relation = model.relations['db'][0]
+        with pytest.raises(ops.RelationDataTypeError):
+            relation.data[model.unit]['key'] = 1  # type: ignore
+        with pytest.raises(ops.RelationDataAccessError):
+            relation.data[relation.app]['key'] = 'value'
+        fake_script.write('is-leader', 'echo false')
+        model._backend._leader_check_time = None
+        with pytest.raises(ops.RelationDataAccessError):
+            relation.data[model.app]['key'] = 'value'
+        model.flush_relation_data()
+        assert 'relation-set' not in [call[0] for call in fake_script.calls()]
+
+    def test_remote_data_not_overlaid(self, fake_script: FakeScript, model: ops.Model):
+        relation = model.relations['db'][0]
+        relation.data[model.app]['old'] = 'new'
+        relation.data[model.unit]['old'] = 'new'
+        # Only our own databags have buffered changes, the remote ones are as Juju has them.
+        assert relation.data[relation.app]['old'] == 'value'
+        assert relation.data[model.get_unit('remote/0')]['old'] == 'value'
+        assert relation.data[model.app]['old'] == 'new'
+
+    def test_relation_gone_before_commit(
+        self,
+        fake_script: FakeScript,
+        model: ops.Model,
+        tmp_path: pathlib.Path,
+        caplog: pytest.LogCaptureFixture,
+    ):
+        storage = ops.storage.SQLiteStorage(':memory:')
+        framework = ops.Framework(storage, tmp_path, ops.CharmMeta(), model)
+        model.relations['db'][0].data[model.unit]['key'] = 'value'
+        fake_script.write('relation-set', "echo 'ERROR relation not found' >&2; exit 2")
+        with caplog.at_level(logging.WARNING, logger='ops.model'):
+            framework.commit()
+        assert 'Dropping buffered changes to relation 1' in caplog.text
+        assert model._backend._pending_relation_data == {}
+        framework.close()
+
+    def test_flushed_on_commit(
+        self, fake_script: FakeScript, model: ops.Model, tmp_path: pathlib.Path
+    ):
+        storage = ops.storage.SQLiteStorage(':memory:')
+        framework = ops.Framework(storage, tmp_path, ops.CharmMeta(), model)
+        model.relations['db'][0].data[model.unit]['key'] = 'value'
+        fake_script.calls(clear=True)
+        framework.commit()
+        assert fake_script.calls() == [['relation-set', '-r', '1', '--file', '-']]
+        framework.close()
+
+
+class TestDeferredStatus:
+    @pytest.fixture
+    def model(self, fake_script: FakeScript):
+        fake_script.write('is-leader', 'echo true')
+        fake_script.write('status-set', '')
+        fake_script.write(
+            'status-get',
+            """echo '{"status": "active", "message": "ready", "status-data": {}}'""",
+        )
+        meta = ops.CharmMeta({'name': 'myapp'})
+        backend = _ModelBackend('myapp/0')
+        backend._defer_status = True
+        return ops.Model(meta, backend)
+
+    def test_last_status_set(self, fake_script: FakeScript, model: ops.Model):
+        for step in ('installing', 'configuring'):
+            model.unit.status = ops.MaintenanceStatus(step)
+        model.unit.status = ops.WaitingStatus('database')
+        model.app.status = ops.ActiveStatus()
+        assert model._backend.status_get() == {'status': 'waiting', 'message': 'database'}
+        assert [call[0] for call in fake_script.calls(clear=True)] == ['is-leader']
+
+        model.flush_status()
+        assert fake_script.calls(clear=True) == [
+            ['status-set', '--application=False', 'waiting', '--', 'database'],
+            ['status-set', '--application=True', 'active', '--', ''],
+        ]
+        # Nothing left to set.
+        model.flush_status()
+        assert fake_script.calls() == []
+
+    def test_unchanged_status_not_set(self, fake_script: FakeScript, model: ops.Model):
+        assert model.unit.status == ops.ActiveStatus('ready')
+        model.unit.status = ops.MaintenanceStatus('restarting')
+        model.unit.status = ops.ActiveStatus('ready')
+        model.flush_status()
+        assert fake_script.calls() == [
+            ['status-get', '--include-data', '--format=json', '--application=false']
+        ]
+
+    def test_status_get_without_cache(self, fake_script: FakeScript, model: ops.Model):
+        model.unit.status = ops.MaintenanceStatus('restarting')
+        assert model._backend.status_get() == {'status': 'maintenance', 'message': 'restarting'}
+        # Juju still has the old status, as the new one hasn't been set yet.
+        assert model._backend.status_get(use_cache=False) == {
+            'status': 'active',
+            'message': 'ready',
+        }
+        model.flush_status()
+        assert [call[0] for call in fake_script.calls()] == ['status-get', 'status-set']
+
+    def test_status_always_set_if_not_read(self, fake_script: FakeScript, model: ops.Model):
+        # The same as Juju has, but it wasn't read, so there's nothing to compare with.
+        model.unit.status = ops.ActiveStatus('ready')
+        model.flush_status()
+        assert fake_script.calls() == [
+            ['status-set', '--application=False', 'active', '--', 'ready']
+        ]
+
+    def test_invalid_status(self, fake_script: FakeScript, model: ops.Model):
+        with pytest.raises(ops.InvalidStatusError):
+            model._backend.status_set('error')  # type: ignore
+        fake_script.write('is-leader', 'echo false')
+        with pytest.raises(RuntimeError):
+            model.app.status = ops.ActiveStatus()
+        model.flush_status()
+        assert 'status-set' not in [call[0] for call in fake_script.calls()]
+
+    def test_flushed_on_commit(
+        self, fake_script: FakeScript, model: ops.Model, tmp_path: pathlib.Path
+    ):
+        storage = ops.storage.SQLiteStorage(':memory:')
+        framework = ops.Framework(storage, tmp_path, ops.CharmMeta(), model)
+        model.unit.status = ops.ActiveStatus()
+        framework.commit()
+        assert fake_script.calls() == [['status-set', '--application=False', 'active', '--', '']]
+        framework.close()
+
+
 if __name__ == '__main__':
     unittest.main()
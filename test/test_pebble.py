@@ -20,7 +20,10 @@ import email.message
 import email.parser
 import io
 import json
+import os
+import pathlib
 import signal
+import socket
 import tempfile
 import typing
 import unittest
@@ -1464,6 +1467,7 @@ class MockHTTPResponse:
         self.headers = message
         reader = io.BytesIO(body)
         self.read = reader.read
+        self.close = reader.close
 
 
 class MockTime:
@@ -2472,6 +2476,150 @@ bad path\r
             client.pull('/etc/hosts')
         assert str(excinfo.value) == 'no "response" field in multipart body'
 
+    _hosts_response = (
+        {'Content-Type': 'multipart/form-data; boundary=01234567890123456789012345678901'},
+        b"""\
+--01234567890123456789012345678901\r
+Content-Disposition: form-data; name="files"; filename="/etc/hosts"\r
+\r
+127.0.0.1 localhost  # \xf0\x9f\x98\x80\nfoo\r\nbar\r
+--01234567890123456789012345678901\r
+Content-Disposition: form-data; name="response"\r
+\r
+{
+    "result": [{"path": "/etc/hosts"}],
+    "status": "OK",
+    "status-code": 200,
+    "type": "sync"
+}\r
+--01234567890123456789012345678901--\r
+""",
+    )
+
+    def test_pull_stream_text(self, client: MockClient):
+        client.responses.append(self._hosts_response)
+        client._chunk_size = 13
+        with client.pull_stream('/etc/hosts') as infile:
+            content = infile.read()
+        assert content == '127.0.0.1 localhost  # 😀\nfoo\r\nbar'
+
+        assert client.requests == [
+            (
+                'GET',
+                '/v1/files',
+                {'action': 'read', 'path': '/etc/hosts'},
+                {'Accept': 'multipart/form-data'},
+                None,
+            ),
+        ]
+
+    def test_pull_stream_readinto(self, client: MockClient):
+        client.responses.append(self._hosts_response)
+        client._chunk_size = 13
+        buf = bytearray(5)
+        chunks: list[bytes] = []
+        with client.pull_stream('/etc/hosts', encoding=None) as infile:
+            while n := infile.readinto(buf):  # type: ignore
+                chunks.append(bytes(buf[:n]))
+        assert b''.join(chunks) == b'127.0.0.1 localhost  # \xf0\x9f\x98\x80\nfoo\r\nbar'
+
+    def test_pull_stream_path_error(self, client: MockClient):
+        client.responses.append((
+            {'Content-Type': 'multipart/form-data; boundary=01234567890123456789012345678901'},
+            b"""\
+--01234567890123456789012345678901\r
+Content-Disposition: form-data; name="response"\r
+\r
+{
+    "result": [
+        {"path": "/etc/hosts", "error": {"kind": "not-found", "message": "not found"}}
+    ],
+    "status": "OK",
+    "status-code": 200,
+    "type": "sync"
+}\r
+--01234567890123456789012345678901--\r
+""",
+        ))
+        with pytest.raises(pebble.PathError) as excinfo:
+            client.pull_stream('/etc/hosts')
+        assert excinfo.value.kind == 'not-found'
+        assert excinfo.value.message == 'not found'
+
+    def test_pull_stream_protocol_errors(self, client: MockClient):
+        client.responses.append(({'Content-Type': 'c/t'}, b''))
+        with pytest.raises(pebble.ProtocolError) as excinfo:
+            client.pull_stream('/etc/hosts')
+        assert str(excinfo.value) == "expected Content-Type 'multipart/form-data', got 'c/t'"
+
+        client.responses.append((
+            {'Content-Type': 'multipart/form-data; boundary=01234567890123456789012345678901'},
+            b"""\
+--01234567890123456789012345678901\r
+Content-Disposition: form-data; name="files"; filename="/bad"\r
+\r
+bad path\r
+--01234567890123456789012345678901--\r
+""",
+        ))
+        with pytest.raises(pebble.ProtocolError) as excinfo:
+            client.pull_stream('/etc/hosts')
+        assert str(excinfo.value) == "path not expected: '/bad'"
+
+        # The response metadata is only checked once the content has been read.
+        client.responses.append((
+            {'Content-Type': 'multipart/form-data; boundary=01234567890123456789012345678901'},
+            b"""\
+--01234567890123456789012345678901\r
+Content-Disposition: form-data; name="files"; filename="/etc/hosts"\r
+\r
+content\r
+--01234567890123456789012345678901--\r
+""",
+        ))
+        infile = client.pull_stream('/etc/hosts', encoding=None)
+        with pytest.raises(pebble.ProtocolError) as excinfo:
+            infile.read()
+        assert str(excinfo.value) == 'no "response" field in multipart body'
+
+    def test_pull_to(self, client: MockClient, tmp_path: pathlib.Path):
+        client.responses.append(self._hosts_response)
+        client.pull_to('/etc/hosts', tmp_path / 'hosts')
+        assert (tmp_path / 'hosts').read_bytes() == (
+            b'127.0.0.1 localhost  # \xf0\x9f\x98\x80\nfoo\r\nbar'
+        )
+
+        client.responses.append(self._hosts_response)
+        dest = io.BytesIO()
+        client.pull_to('/etc/hosts', dest)
+        assert dest.getvalue() == b'127.0.0.1 localhost  # \xf0\x9f\x98\x80\nfoo\r\nbar'
+
+    def test_pull_to_removes_partial_file(self, client: MockClient, tmp_path: pathlib.Path):
+        client.responses.append((
+            {'Content-Type': 'multipart/form-data; boundary=01234567890123456789012345678901'},
+            b"""\
+--01234567890123456789012345678901\r
+Content-Disposition: form-data; name="files"; filename="/etc/hosts"\r
+\r
+content\r
+--01234567890123456789012345678901\r
+Content-Disposition: form-data; name="response"\r
+\r
+{
+    "result": [
+        {"path": "/etc/hosts", "error": {"kind": "generic-file-error", "message": "oops"}}
+    ],
+    "status": "OK",
+    "status-code": 200,
+    "type": "sync"
+}\r
+--01234567890123456789012345678901--\r
+""",
+        ))
+        with pytest.raises(pebble.PathError):
+            client.pull_to('/etc/hosts', tmp_path / 'hosts')
+        assert not (tmp_path / 'hosts').exists()
+
     def test_push_str(self, client: MockClient):
         self._test_push_str(client, 'content 😀\nfoo\r\nbar')
 
@@ -2668,6 +2816,192 @@ bad path\r
             'files': [{'path': '/foo/bar'}],
         }
 
+    def test_push_many(self, client: MockClient):
+        client.responses.append((
+            {'Content-Type': 'application/json'},
+            b"""
+{
+    "result": [
+        {"path": "/foo/bar"},
+        {"path": "/foo/baz", "error": {"kind": "permission-denied", "message": "denied"}},
+        {"path": "/foo/qux"}
+    ],
+    "status": "OK",
+    "status-code": 200,
+    "type": "sync"
+}
+""",
+        ))
+
+        errors = client.push_many(
+            [
+                ('/foo/bar', 'bar 😀'),
+                ('/foo/baz', b'baz'),
+                (pathlib.PurePath('/foo/qux'), io.BytesIO(b'qux')),
+            ],
+            make_dirs=True,
+            permissions=0o600,
+            user='bob',
+        )
+        assert list(errors) == ['/foo/baz']
+        assert errors['/foo/baz'].kind == 'permission-denied'
+        assert errors['/foo/baz'].message == 'denied'
+
+        assert len(client.requests) == 1
+        request = client.requests[0]
+        assert request[:3] == ('POST', '/v1/files', None)
+
+        headers, body = request[3:]
+        req, files = self._parse_write_multipart_files(headers['Content-Type'], body)
+        assert files == [
+            ('/foo/bar', 'bar 😀'.encode()),
+            ('/foo/baz', b'baz'),
+            ('/foo/qux', b'qux'),
+        ]
+        options = {'make-dirs': True, 'permissions': '600', 'user': 'bob'}
+        assert req == {
+            'action': 'write',
+            'files': [
+                {'path': '/foo/bar', **options},
+                {'path': '/foo/baz', **options},
+                {'path': '/foo/qux', **options},
+            ],
+        }
+
+    def test_push_many_empty(self, client: MockClient):
+        assert client.push_many([]) == {}
+        assert client.requests == []
+
+    def test_push_many_duplicate_path(self, client: MockClient):
+        with pytest.raises(ValueError):
+            client.push_many([('/foo/bar', 'a'), ('/foo/bar', 'b')])
+        assert client.requests == []
+
+    def test_pull_many(self, client: MockClient):
+        client.responses.append((
+            {'Content-Type': 'multipart/form-data; boundary=01234567890123456789012345678901'},
+            b"""\
+--01234567890123456789012345678901\r
+Content-Disposition: form-data; name="files"; filename="/etc/hosts"\r
+\r
+127.0.0.1 localhost\r
+--01234567890123456789012345678901\r
+Content-Disposition: form-data; name="files"; filename="/etc/hostname"\r
+\r
+myhost\r
+--01234567890123456789012345678901\r
+Content-Disposition: form-data; name="response"\r
+\r
+{
+    "result": [
+        {"path": "/etc/hosts"},
+        {"path": "/etc/missing", "error": {"kind": "not-found", "message": "not found"}},
+        {"path": "/etc/hostname"}
+    ],
+    "status": "OK",
+    "status-code": 200,
+    "type": "sync"
+}\r
+--01234567890123456789012345678901--\r
+""",
+        ))
+
+        results = client.pull_many(['/etc/hosts', '/etc/missing', '/etc/hostname'], encoding=None)
+        assert list(results) == ['/etc/hosts', '/etc/missing', '/etc/hostname']
+        hosts = results['/etc/hosts']
+        assert not isinstance(hosts, pebble.PathError)
+        with hosts:
+            assert hosts.read() == b'127.0.0.1 localhost'
+        hostname = results['/etc/hostname']
+        assert not isinstance(hostname, pebble.PathError)
+        with hostname:
+            assert hostname.read() == b'myhost'
+        missing = results['/etc/missing']
+        assert isinstance(missing, pebble.PathError)
+        assert missing.kind == 'not-found'
+
+        assert client.requests == [
+            (
+                'GET',
+                '/v1/files',
+                {'action': 'read', 'path': ['/etc/hosts', '/etc/missing', '/etc/hostname']},
+                {'Accept': 'multipart/form-data'},
+                None,
+            ),
+        ]
+
+    def test_pull_many_protocol_errors(self, client: MockClient):
+        client.responses.append((
+            {'Content-Type': 'multipart/form-data; boundary=01234567890123456789012345678901'},
+            b"""\
+--01234567890123456789012345678901\r
+Content-Disposition: form-data; name="files"; filename="/etc/hosts"\r
+\r
+127.0.0.1 localhost\r
+--01234567890123456789012345678901\r
+Content-Disposition: form-data; name="response"\r
+\r
+{
+    "result": [{"path": "/etc/hosts"}, {"path": "/etc/hostname"}],
+    "status": "OK",
+    "status-code": 200,
+    "type": "sync"
+}\r
+--01234567890123456789012345678901--\r
+""",
+        ))
+        with pytest.raises(pebble.ProtocolError) as excinfo:
+            client.pull_many(['/etc/hosts', '/etc/hostname'])
+        assert str(excinfo.value) == "no file content for '/etc/hostname' in multipart response"
+
+        client.responses.append((
+            {'Content-Type': 'multipart/form-data; boundary=01234567890123456789012345678901'},
+            b"""\
+--01234567890123456789012345678901\r
+Content-Disposition: form-data; name="files"; filename="/bad"\r
+\r
+bad path\r
+--01234567890123456789012345678901\r
+Content-Disposition: form-data; name="response"\r
+\r
+{
+    "result": [{"path": "/etc/hosts"}],
+    "status": "OK",
+    "status-code": 200,
+    "type": "sync"
+}\r
+--01234567890123456789012345678901--\r
+""",
+        ))
+        with pytest.raises(pebble.ProtocolError) as excinfo:
+            client.pull_many(['/etc/hosts'])
+        assert str(excinfo.value) == "paths not expected: ['/bad']"
+
+    def _parse_write_multipart_files(self, content_type: str, body: _bytes_generator):
+        message = email.message.Message()
+        message['Content-Type'] = content_type
+        boundary = message.get_param('boundary')
+        assert isinstance(boundary, str)
+        parser = email.parser.BytesFeedParser()
+        parser.feed(
+            b'Content-Type: multipart/form-data; boundary='
+            + boundary.encode('utf-8')
+            + b'\r\n\r\n'
+        )
+        for b in body:
+            parser.feed(b)
+        message = parser.close()
+
+        req = None
+        files: list[tuple[str | None, typing.Any]] = []
+        for part in message.walk():
+            name = part.get_param('name', header='Content-Disposition')
+            if name == 'request':
+                req = json.loads(typing.cast('str', part.get_payload()))
+            elif name == 'files':
+                files.append((part.get_filename(), part.get_payload(decode=True)))
+        return req, files
+
     def _parse_write_multipart(self, content_type: str, body: _bytes_generator):
         message = email.message.Message()
         message['Content-Type'] = content_type
@@ -3349,6 +3683,147 @@ class TestSocketClient:
         finally:
             shutdown()
 
+    def test_keep_alive(self):
+        shutdown, socket_path = fake_pebble.start_server()
+
+        try:
+            client = pebble.Client(socket_path=socket_path)
+            for _ in range(5):
+                assert client.get_system_info().version == '3.14.159'
+            with pytest.raises(pebble.APIError):
+                client.start_services(['bar'], timeout=0)
+            assert client.start_services(['foo'], timeout=0) == '1234'
+
+            assert client.new_connections == 1
+            assert client.reused_connections == 6
+            assert client._pool is not None
+            client._pool.close()
+        finally:
+            shutdown()
+
+    def test_reconnect_after_restart(self, tmp_path: pathlib.Path):
+        socket_path = str(tmp_path / 'pebble.socket')
+        client = pebble.Client(socket_path=socket_path)
+
+        shutdown, _ = fake_pebble.start_server(socket_path)
+        try:
+            assert client.get_system_info().version == '3.14.159'
+        finally:
+            shutdown()
+        assert client.new_connections == 1
+
+        # The pooled connection was closed when Pebble stopped.
+        with pytest.raises(pebble.ConnectionError) as excinfo:
+            client.get_system_info()
+        assert 'Could not connect to Pebble' in str(excinfo.value)
+
+        shutdown, _ = fake_pebble.start_server(socket_path)
+        try:
+            assert client.get_system_info().version == '3.14.159'
+            assert client.get_system_info().version == '3.14.159'
+        finally:
+            shutdown()
+        assert client.new_connections == 3
+        assert client.reused_connections == 1
+
+    def test_pull_stream(self, tmp_path: pathlib.Path):
+        shutdown, socket_path = fake_pebble.start_server()
+
+        try:
+            client = pebble.Client(socket_path=socket_path)
+            content = os.urandom(1024 * 1024)
+            (tmp_path / 'src').write_bytes(content)
+
+            with client.pull_stream(tmp_path / 'src', encoding=None) as f:
+                assert f.read(100) == content[:100]
+                assert f.read() == content[100:]
+            client.pull_to(tmp_path / 'src', tmp_path / 'dst')
+            assert (tmp_path / 'dst').read_bytes() == content
+            with client.pull(tmp_path / 'src', encoding=None) as f:
+                assert f.read() == content
+
+            with pytest.raises(pebble.PathError):
+                client.pull_to(tmp_path / 'missing', tmp_path / 'dst2')
+            assert not (tmp_path / 'dst2').exists()
+
+            # A stream that's closed early can't leave its connection in the pool.
+            with client.pull_stream(tmp_path / 'src', encoding=None) as f:
+                assert f.read(100) == content[:100]
+            assert client.get_system_info().version == '3.14.159'
+            assert client._pool is not None
+            client._pool.close()
+        finally:
+            shutdown()
+
+    def test_stale_connection_retried(self, monkeypatch: pytest.MonkeyPatch):
+        shutdown, socket_path = fake_pebble.start_server()
+
+        try:
+            client = pebble.Client(socket_path=socket_path)
+            assert client.get_system_info().version == '3.14.159'
+            # Simulate the server closing the connection just after the check
+            # that it's still open.
+            monkeypatch.setattr(pebble._UnixSocketConnection, 'is_dropped', lambda *_: False)  # type: ignore
+            pool = client._pool
+            assert pool is not None
+            (conn,) = pool._idle
+            assert conn.sock is not None
+            conn.sock.shutdown(socket.SHUT_RDWR)
+
+            assert client.get_system_info().version == '3.14.159'
+            assert client.reused_connections == 1
+            assert client.new_connections == 1
+            pool.close()
+        finally:
+            shutdown()
+
+    def test_dropped_post_not_resent(self, monkeypatch: pytest.MonkeyPatch):
+        requests: list[str] = []
+
+        def services_action(self: fake_pebble.Handler, *_: typing.Any):
+            # Read the request, but close the connection without responding.
+            requests.append(self.path)
+            self.close_connection = True
+
+        monkeypatch.setattr(fake_pebble.Handler, 'services_action', services_action)
+        shutdown, socket_path = fake_pebble.start_server()
+
+        try:
+            client = pebble.Client(socket_path=socket_path)
+            assert client.get_system_info().version == '3.14.159'
+            with pytest.raises(ConnectionResetError):
+                client.start_services(['foo'], timeout=0)
+            assert requests == ['/v1/services']
+            assert client.reused_connections == 1
+            assert client.new_connections == 1
+        finally:
+            shutdown()
+
+    def test_streamed_body_not_sent_on_pooled_connection(
+        self, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        shutdown, socket_path = fake_pebble.start_server()
+
+        try:
+            client = pebble.Client(socket_path=socket_path)
+            assert client.get_system_info().version == '3.14.159'
+            monkeypatch.setattr(pebble._UnixSocketConnection, 'is_dropped', lambda *_: False)  # type: ignore
+            pool = client._pool
+            assert pool is not None
+            (conn,) = pool._idle
+            assert conn.sock is not None
+            conn.sock.shutdown(socket.SHUT_RDWR)
+
+            # The push body is streamed, so it can't be retried, and a stale
+            # pooled connection would fail it.
+            client.push(str(tmp_path / 'file'), b'content')
+            assert (tmp_path / 'file').read_bytes() == b'content'
+            assert client.reused_connections == 0
+            assert client.new_connections == 2
+            pool.close()
+        finally:
+            shutdown()
+
 
 class TestExecError:
     def test_init(self):
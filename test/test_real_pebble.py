@@ -225,6 +225,22 @@ class TestRealPebble:
             data = f.read()
             assert data == content
 
+    def test_push_pull_many(self, client: pebble.Client, tmp_path: pathlib.Path):
+        files = {str(tmp_path / f'file{i}'): f'content {i}' for i in range(3)}
+        errors = client.push_many(files.items())
+        assert errors == {}
+
+        missing = str(tmp_path / 'missing')
+        results = client.pull_many([*files, missing])
+        for path, content in files.items():
+            f = results[path]
+            assert not isinstance(f, pebble.PathError)
+            with f:
+                assert f.read() == content
+        error = results[missing]
+        assert isinstance(error, pebble.PathError)
+        assert error.kind == 'not-found'
+
     @pytest.mark.parametrize('path_type', (str, pathlib.Path))
     def test_list_files_path_type(
         self,
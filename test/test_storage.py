@@ -19,7 +19,10 @@ import gc
 import io
 import os
 import pathlib
+import pickle
+import sqlite3
 import stat
+import subprocess
 import sys
 import tempfile
 import typing
@@ -263,6 +266,44 @@ class StoragePermutations(abc.ABC):
             ('event', 'observer', 'method2'),
         ]
 
+    def test_has_equivalent_notice(
+        self,
+        request: pytest.FixtureRequest,
+        fake_script: FakeScript,
+    ):
+        store = self.create_storage(request, fake_script)
+        store.save_snapshot('obj/on/evt[1]', {'a': 1, 'b': [1, 2]})
+        store.save_notice('obj/on/evt[1]', 'observer', 'method')
+        # The notice is saved before the snapshot here, as ops-scenario does.
+        store.save_notice('obj/on/evt[2]', 'observer', 'method')
+        store.save_snapshot('obj/on/evt[2]', {'c': 3})
+
+        # The event ID and the order of the keys do not matter.
+        assert store.has_equivalent_notice(
+            'obj/on/evt[3]', 'observer', 'method', {'b': [1, 2], 'a': 1}
+        )
+        assert store.has_equivalent_notice('obj/on/evt[3]', 'observer', 'method', {'c': 3})
+        # Numbers that compare equal are equal, whatever their type.
+        assert store.has_equivalent_notice(
+            'obj/on/evt[3]', 'observer', 'method', {'a': 1.0, 'b': [True, 2.0]}
+        )
+        assert store.has_equivalent_notice('obj/on/evt[3]', 'observer', 'method', {'c': 3.0})
+        assert not store.has_equivalent_notice(
+            'obj/on/evt[3]', 'observer', 'method', {'a': 1, 'b': [2, 1]}
+        )
+        assert not store.has_equivalent_notice('obj/on/evt[3]', 'observer', 'method', {})
+        assert not store.has_equivalent_notice(
+            'obj/on/evt[3]', 'observer', 'other', {'a': 1, 'b': [1, 2]}
+        )
+        assert not store.has_equivalent_notice(
+            'obj/on/other[3]', 'observer', 'method', {'a': 1, 'b': [1, 2]}
+        )
+
+        store.drop_notice('obj/on/evt[1]', 'observer', 'method')
+        assert not store.has_equivalent_notice(
+            'obj/on/evt[3]', 'observer', 'method', {'a': 1, 'b': [1, 2]}
+        )
+
 
 class TestSQLiteStorage(StoragePermutations):
     def create_storage(self, request: pytest.FixtureRequest, fake_script: FakeScript):
@@ -303,6 +344,175 @@ class TestSQLiteStorage(StoragePermutations):
             open(filename, 'w').close()
             pytest.raises(RuntimeError, ops.storage.SQLiteStorage, filename)
 
+    def test_migrate_notices(self, tmp_path: pathlib.Path):
+        filename = tmp_path / '.unit-state.db'
+        # Create a database with the notice table from before duplicate detection was indexed.
+        db = sqlite3.connect(str(filename))
+        db.execute('CREATE TABLE snapshot (handle TEXT PRIMARY KEY, data BLOB)')
+        db.execute("""
+            CREATE TABLE notice (
+              sequence INTEGER PRIMARY KEY AUTOINCREMENT,
+              event_path TEXT,
+              observer_path TEXT,
+              method_name TEXT)
+            """)
+        db.execute('INSERT INTO snapshot VALUES (?, ?)', ('obj/on/evt[1]', pickle.dumps({'a': 1})))
+        db.execute(
+            'INSERT INTO notice VALUES (NULL, ?, ?, ?)', ('obj/on/evt[1]', 'observer', 'method')
+        )
+        db.commit()
+        db.close()
+
+        store = ops.storage.SQLiteStorage(filename)
+        assert list(store.notices()) == [('obj/on/evt[1]', 'observer', 'method')]
+        assert store.has_equivalent_notice('obj/on/evt[2]', 'observer', 'method', {'a': 1})
+        store.save_notice('obj/on/evt[1]', 'observer', 'method2')
+        store.commit()
+        store.close()
+
+        # Opening the migrated database again leaves it as it is.
+        store = ops.storage.SQLiteStorage(filename)
+        assert list(store.notices()) == [
+            ('obj/on/evt[1]', 'observer', 'method'),
+            ('obj/on/evt[1]', 'observer', 'method2'),
+        ]
+        assert store.has_equivalent_notice('obj/on/evt[2]', 'observer', 'method2', {'a': 1})
+        store.close()
+
+    def test_snapshots_written_on_commit(self):
+        store = ops.storage.SQLiteStorage(':memory:')
+        statements: list[str] = []
+        store._db.set_trace_callback(statements.append)
+        store.save_snapshot('foo', {'a': 1})
+        store.save_snapshot('bar', {'b': 2})
+        store.save_snapshot('foo', {'a': 3})
+        store.drop_snapshot('bar')
+        assert store.load_snapshot('foo') == {'a': 3}
+        with pytest.raises(ops.storage.NoSnapshotError):
+            store.load_snapshot('bar')
+        assert not any('snapshot' in statement for statement in statements)
+
+        store.commit()
+        assert store._db.execute('SELECT handle FROM snapshot').fetchall() == [('foo',)]
+
+        # Saving an unchanged snapshot doesn't write it again.
+        assert store.load_snapshot('foo') == {'a': 3}
+        store.save_snapshot('foo', {'a': 3})
+        statements.clear()
+        store.commit()
+        assert not any('REPLACE' in statement for statement in statements)
+        store.close()
+
+    def test_uncommitted_snapshots_discarded(self, tmp_path: pathlib.Path):
+        filename = tmp_path / '.unit-state.db'
+        store = ops.storage.SQLiteStorage(filename)
+        store.save_snapshot('foo', {'a': 1})
+        store.commit()
+        store.save_snapshot('foo', {'a': 2})
+        store.save_snapshot('bar', {'b': 1})
+        store.save_notice('bar', 'observer', 'method')
+        assert sorted(store.list_snapshots()) == ['bar', 'foo']
+        store.close()
+
+        store = ops.storage.SQLiteStorage(filename)
+        assert store.load_snapshot('foo') == {'a': 1}
+        with pytest.raises(ops.storage.NoSnapshotError):
+            store.load_snapshot('bar')
+        assert list(store.notices()) == []
+        store.close()
+
+    def test_changes_after_commit_held_until_next_commit(self, tmp_path: pathlib.Path):
+        filename = tmp_path / '.unit-state.db'
+        store = ops.storage.SQLiteStorage(filename)
+        store.save_notice('foo', 'observer', 'method')
+        store.commit()
+        # Not autocommit: every change after a commit waits for the next one.
+        assert store._db.in_transaction
+        store.save_notice('bar', 'observer', 'method')
+        store.drop_notice('foo', 'observer', 'method')
+        assert store._db.in_transaction
+        store.commit()
+        store.save_notice('baz', 'observer', 'method')
+        store.close()
+
+        store = ops.storage.SQLiteStorage(filename)
+        assert list(store.notices()) == [('bar', 'observer', 'method')]
+        store.close()
+
+    def test_performance_profile(self, tmp_path: pathlib.Path):
+        filename = tmp_path / '.unit-state.db'
+        store = ops.storage.SQLiteStorage(filename, profile='performance')
+        assert store._db.execute('PRAGMA journal_mode').fetchone() == ('wal',)
+        assert store._db.execute('PRAGMA synchronous').fetchone() == (1,)  # NORMAL
+        for i in range(100):
+            store.save_snapshot(f'obj/on/evt[{i}]', {'data': 'x' * 1000})
+            store.save_notice(f'obj/on/evt[{i}]', 'observer', 'method')
+        store.commit()
+        for i in range(99):
+            store.drop_snapshot(f'obj/on/evt[{i}]')
+            store.drop_notice(f'obj/on/evt[{i}]', 'observer', 'method')
+        store.commit()
+        wal = pathlib.Path(f'{filename}-wal')
+        size = filename.stat().st_size + wal.stat().st_size
+        store.compact()
+        assert filename.stat().st_size < size
+        assert wal.stat().st_size == 0
+        store.save_notice('obj/on/evt[100]', 'observer', 'method')
+        store.commit()
+        store.close()
+
+        # The database stays in WAL mode.
+        store = ops.storage.SQLiteStorage(filename)
+        assert store._db.execute('PRAGMA journal_mode').fetchone() == ('wal',)
+        assert list(store.notices()) == [
+            ('obj/on/evt[99]', 'observer', 'method'),
+            ('obj/on/evt[100]', 'observer', 'method'),
+        ]
+        assert store.load_snapshot('obj/on/evt[99]') == {'data': 'x' * 1000}
+        store.close()
+
+    @pytest.mark.parametrize('profile', ['default', 'performance'])
+    def test_killed_during_commit(self, tmp_path: pathlib.Path, profile: str):
+        filename = tmp_path / '.unit-state.db'
+        # The child process saves and commits notices as fast as it can,
+        # reporting each commit, until it is killed.
+        script = dedent(f"""
+            import sys
+            import ops.storage
+            store = ops.storage.SQLiteStorage({str(filename)!r}, profile={profile!r})
+            i = 0
+            while True:
+                store.save_snapshot(f'obj/on/evt[{{i}}]', {{'data': 'x' * 10_000}})
+                store.save_notice(f'obj/on/evt[{{i}}]', 'observer', 'method')
+                store.commit()
+                print(i, flush=True)
+                i += 1
+        """)
+        env = {**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)}
+        proc = subprocess.Popen(
+            [sys.executable, '-c', script], stdout=subprocess.PIPE, text=True, env=env
+        )
+        assert proc.stdout is not None
+        committed = -1
+        for line in proc.stdout:
+            committed = int(line)
+            if committed >= 200:
+                break
+        proc.kill()
+        proc.wait()
+        # Anything written after the last reported commit may or may not be there.
+        for line in proc.stdout:
+            committed = int(line)
+
+        store = ops.storage.SQLiteStorage(filename, profile=profile)  # type: ignore
+        assert store._db.execute('PRAGMA integrity_check').fetchone() == ('ok',)
+        notices = list(store.notices())
+        assert len(notices) in (committed + 1, committed + 2)
+        for i, (event_path, _, _) in enumerate(notices):
+            assert event_path == f'obj/on/evt[{i}]'
+            assert store.load_snapshot(event_path) == {'data': 'x' * 10_000}
+        store.close()
+
 
 def setup_juju_backend(fake_script: FakeScript, state_file: pathlib.Path):
     """Create fake scripts for pretending to be state-set and state-get."""
@@ -329,7 +539,10 @@ def setup_juju_backend(fake_script: FakeScript, state_file: pathlib.Path):
         else:
             state = {{}}
         for k, v in request.items():
-            state[k] = v
+            if v:
+                state[k] = v
+            else:
+                state.pop(k, None)
         with state_file.open("wb") as f:
             pickle.dump(state, f)
         ' "$@"
@@ -343,15 +556,18 @@ def setup_juju_backend(fake_script: FakeScript, state_file: pathlib.Path):
         import sys
         if "{pthpth}" not in sys.path:
             sys.path.append("{pthpth}")
-        import sys, pathlib, pickle
-        assert len(sys.argv) == 2
+        import sys, pathlib, pickle, json
         state_file = pathlib.Path("{state_file}")
         if state_file.exists() and state_file.stat().st_size > 0:
             with state_file.open("rb") as f:
                 state = pickle.load(f)
         else:
             state = {{}}
-        result = state.get(sys.argv[1], "\\n")
+        if sys.argv[1:] == ["--format=json"]:
+            result = json.dumps(state)
+        else:
+            assert len(sys.argv) == 2
+            result = state.get(sys.argv[1], "\\n")
         sys.stdout.write(result)
         ' "$@"
         """).format(**template_args),
@@ -389,6 +605,74 @@ class TestJujuStorage(StoragePermutations):
         setup_juju_backend(fake_script, state_file)
         return ops.storage.JujuStorage()
 
+    def test_single_round_trip(self, request: pytest.FixtureRequest, fake_script: FakeScript):
+        store = self.create_storage(request, fake_script)
+        store.save_snapshot('foo', {'a': 1})
+        store.save_snapshot('bar', ('b', 2))
+        store.save_notice('obj/on/evt[1]', 'observer', 'method')
+        assert store.load_snapshot('foo') == {'a': 1}
+        store.drop_snapshot('bar')
+        assert list(store.notices()) == [('obj/on/evt[1]', 'observer', 'method')]
+        store.commit()
+        assert [call[:2] for call in fake_script.calls(clear=True)] == [
+            ['state-get', '--format=json'],
+            ['state-set', '--file'],
+        ]
+
+        # Committing with nothing changed doesn't run anything.
+        store.save_snapshot('foo', {'a': 1})
+        store.commit()
+        assert fake_script.calls(clear=True) == []
+
+        store.drop_snapshot('foo')
+        store.drop_notice('obj/on/evt[1]', 'observer', 'method')
+        store.commit()
+        assert fake_script.calls(clear=True) == [
+            ['state-set', '--file', '-'],
+        ]
+
+        # A new storage loads what was committed, and not uncommitted changes.
+        store.save_snapshot('baz', 3)
+        store.close()
+        store = ops.storage.JujuStorage()
+        assert list(store.notices()) == []
+        with pytest.raises(ops.storage.NoSnapshotError):
+            store.load_snapshot('foo')
+        with pytest.raises(ops.storage.NoSnapshotError):
+            store.load_snapshot('baz')
+
+    def test_deletes_with_one_call(self, request: pytest.FixtureRequest, fake_script: FakeScript):
+        store = self.create_storage(request, fake_script)
+        for i in range(10):
+            store.save_snapshot(f'obj/on/evt[{i}]', {'i': i})
+            store.save_notice(f'obj/on/evt[{i}]', 'observer', 'method')
+        store.commit()
+        fake_script.calls(clear=True)
+
+        # Dropping many deferred events still costs a single process.
+        for i in range(10):
+            store.drop_snapshot(f'obj/on/evt[{i}]')
+            store.drop_notice(f'obj/on/evt[{i}]', 'observer', 'method')
+        store.save_snapshot('foo', 1)
+        store.commit()
+        assert fake_script.calls(clear=True) == [['state-set', '--file', '-']]
+
+        store = ops.storage.JujuStorage()
+        assert list(store.notices()) == []
+        assert store.load_snapshot('foo') == 1
+        with pytest.raises(ops.storage.NoSnapshotError):
+            store.load_snapshot('obj/on/evt[0]')
+        assert fake_script.calls(clear=True) == [['state-get', '--format=json']]
+
+    def test_loads_per_key_state(self, request: pytest.FixtureRequest, fake_script: FakeScript):
+        # State saved one key at a time with the backend can be loaded.
+        store = self.create_storage(request, fake_script)
+        backend = ops.storage._JujuStorageBackend()
+        backend.set('foo', {'a': (1, 2)})
+        backend.set(ops.storage.JujuStorage.NOTICE_KEY, [('obj/on/evt[1]', 'obs', 'method')])
+        assert store.load_snapshot('foo') == {'a': (1, 2)}
+        assert list(store.notices()) == [('obj/on/evt[1]', 'obs', 'method')]
+
 
 class TestSimpleLoader:
     def test_is_c_loader(self):
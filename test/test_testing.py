@@ -3715,6 +3715,23 @@ class TestTestingModelBackend:
         backend_methods = get_public_methods(backend)
         assert mb_methods == backend_methods
 
+    def test_invalidate_cache(self, request: pytest.FixtureRequest):
+        harness = ops.testing.Harness(
+            ops.CharmBase,
+            meta="""
+            name: app
+            """,
+        )
+        request.addfinalizer(harness.cleanup)
+        harness.begin()
+        model = harness.model
+        model.unit.status = ops.ActiveStatus('ready')
+        model.invalidate_cache()
+        assert model.unit.status == ops.ActiveStatus('ready')
+        assert dict(model.config) == {}
+        assert model.app.planned_units() == 1
+        assert model.unit.opened_ports() == set()
+
     def test_model_uuid_is_uuid_v4(self, request: pytest.FixtureRequest):
         harness = ops.testing.Harness(
             ops.CharmBase,
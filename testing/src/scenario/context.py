@@ -9,10 +9,12 @@ specific `State` exists in, and the events that can be executed on that `State`.
 
 from __future__ import annotations
 
+import collections
 import copy
 import functools
 import pathlib
 import tempfile
+import threading
 from collections.abc import Callable, Mapping
 from contextlib import contextmanager
 from typing import TYPE_CHECKING, Any, Generic
@@ -443,6 +445,7 @@ class Context(Generic[CharmType]):
     - :attr:`action_logs`
     - :attr:`action_results`
     - :attr:`trace_data`
+    - :attr:`hook_tool_calls`
 
     This allows you to write assertions not only on the output state, but also, to some
     extent, on the path the charm took to get there.
@@ -606,6 +609,22 @@ class Context(Generic[CharmType]):
     This will be ``None`` if the charm never calls :meth:`ops.ActionEvent.set_results`
     """
 
+    hook_tool_calls: collections.Counter[str]
+    """The number of times the charm ran each hook tool, such as ``relation-get``.
+
+    Use this to check how much work the charm asks of Juju, for example that
+    reading relation data runs one ``relation-get`` per databag::
+
+        ctx = Context(MyCharm)
+        ctx.run(ctx.on.update_status(), State(relations={relation}))
+        assert ctx.hook_tool_calls['relation-get'] == 3
+
+    The counts are not reset between runs. Note that ops caches the results of
+    some hook tools, such as ``is-leader`` and ``config-get``, for the whole
+    dispatch, which Scenario does not simulate, so those may be counted more
+    often than they would run in Juju.
+    """
+
     charm_root: str | pathlib.Path | None
     """The charm root directory to use when executing the charm.
 
@@ -744,6 +763,8 @@ class Context(Generic[CharmType]):
         self.emitted_events: list[ops.EventBase] = []
         self.requested_storages: dict[str, int] = {}
         self.trace_data = []
+        self.hook_tool_calls: collections.Counter[str] = collections.Counter()
+        self._hook_tool_calls_lock = threading.Lock()
 
         # set by Runtime.exec() in self._run()
         self._output_state: State | None = None
@@ -790,6 +811,12 @@ class Context(Generic[CharmType]):
         else:
             self.unit_status_history.append(state.unit_status)
 
+    def _record_hook_tool_call(self, name: str):
+        """Count a call to a hook tool."""
+        # The charm may run hook tools from several threads at once.
+        with self._hook_tool_calls_lock:
+            self.hook_tool_calls[name] += 1
+
     def __call__(self, event: _Event, state: State) -> Manager[CharmType]:
         """Context manager to introspect live charm object before and after the event is emitted.
 
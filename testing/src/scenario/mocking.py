@@ -11,10 +11,12 @@ from __future__ import annotations
 
 import copy
 import datetime
+import functools
 import io
 import shutil
+import threading
 import uuid
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
 from pathlib import Path
 from typing import (
     TYPE_CHECKING,
@@ -22,6 +24,7 @@ from typing import (
     Literal,
     NoReturn,
     TextIO,
+    TypeVar,
     cast,
     get_args,
 )
@@ -52,6 +55,7 @@ from .logger import logger as scenario_logger
 from .state import (
     CharmType,
     CheckInfo,
+    Exec,
     JujuLogLine,
     Mount,
     Network,
@@ -68,7 +72,7 @@ from .state import (
 if TYPE_CHECKING:  # pragma: no cover
     from .context import Context
     from .state import Container as ContainerSpec
-    from .state import Exec, Secret, State, _CharmSpec, _Event
+    from .state import Secret, State, _CharmSpec, _Event
 
 logger = scenario_logger.getChild('mocking')
 
@@ -129,6 +133,33 @@ class _MockExecProcess:
 
 _NOT_GIVEN = object()  # non-None default value sentinel
 
+_F = TypeVar('_F', bound=Callable[..., Any])
+
+
+def _hook_tool(name: str) -> Callable[[_F], _F]:
+    """Record each call of the decorated method in :attr:`Context.hook_tool_calls`.
+
+    Calls made while handling another recorded call (for example, looking up
+    the remote app while listing a relation's units) are not recorded, since
+    Juju would answer those within the one hook tool call.
+    """
+
+    def decorator(func: _F) -> _F:
+        @functools.wraps(func)
+        def wrapper(self: _MockModelBackend, *args: Any, **kwargs: Any) -> Any:
+            nested = getattr(self._hook_tool_depth, 'value', 0)
+            if not nested:
+                self._context._record_hook_tool_call(name)
+            self._hook_tool_depth.value = nested + 1
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                self._hook_tool_depth.value = nested
+
+        return cast('_F', wrapper)
+
+    return decorator
+
 
 # pyright: reportIncompatibleMethodOverride=false
 class _MockModelBackend(_ModelBackend):  # type: ignore
@@ -145,12 +176,16 @@ class _MockModelBackend(_ModelBackend):  # type: ignore
         self._event = event
         self._context = context
         self._charm_spec = charm_spec
+        # Prefetching relation data calls the backend from several threads.
+        self._hook_tool_depth = threading.local()
 
-    def opened_ports(self) -> set[Port_Ops]:
+    @_hook_tool('opened-ports')
+    def opened_ports(self, *, use_cache: bool = True) -> set[Port_Ops]:
         return {
             Port_Ops(protocol=port.protocol, port=port.port) for port in self._state.opened_ports
         }
 
+    @_hook_tool('open-port')
     def open_port(
         self,
         protocol: _RawPortProtocolLiteral,
@@ -163,6 +198,7 @@ class _MockModelBackend(_ModelBackend):  # type: ignore
         if ports != self._state.opened_ports:
             self._state._update_opened_ports(frozenset(ports))
 
+    @_hook_tool('close-port')
     def close_port(
         self,
         protocol: _RawPortProtocolLiteral,
@@ -252,6 +288,7 @@ class _MockModelBackend(_ModelBackend):  # type: ignore
                 f'setting application data is not supported on Juju version {version}',
             )
 
+    @_hook_tool('relation-get')
     def relation_get(self, relation_id: int, member_name: str, is_app: bool):
         self._check_app_data_access(is_app)
         data = self._relation_get(relation_id, member_name=member_name, is_app=is_app)
@@ -273,6 +310,7 @@ class _MockModelBackend(_ModelBackend):  # type: ignore
         unit_id = int(member_name.split('/')[-1])
         return relation._get_databag_for_remote(unit_id)
 
+    @_hook_tool('relation-model-get')
     def relation_model_get(self, relation_id: int) -> dict[str, Any]:
         if JujuVersion(self._context.juju_version) < '3.6.2':
             raise ModelError('Relation.remote_model is only available on Juju >= 3.6.2')
@@ -285,16 +323,20 @@ class _MockModelBackend(_ModelBackend):  # type: ignore
             uuid = self._state.model.uuid
         return {'uuid': uuid}
 
+    @_hook_tool('is-leader')
     def is_leader(self):
         return self._state.leader
 
-    def status_get(self, *, is_app: bool = False):
+    @_hook_tool('status-get')
+    def status_get(self, *, is_app: bool = False, use_cache: bool = True):
         status = self._state.app_status if is_app else self._state.unit_status
         return {'status': status.name, 'message': status.message}
 
+    @_hook_tool('relation-ids')
     def relation_ids(self, relation_name: str):
         return [rel.id for rel in self._state.relations if rel.endpoint == relation_name]
 
+    @_hook_tool('relation-list')
     def relation_list(self, relation_id: int) -> tuple[str, ...]:
         relation = self._get_relation_by_id(relation_id)
 
@@ -311,7 +353,8 @@ class _MockModelBackend(_ModelBackend):  # type: ignore
         remote_name = self.relation_remote_app_name(relation_id)
         return tuple(f'{remote_name}/{unit_id}' for unit_id in relation._remote_unit_ids)
 
-    def config_get(self):
+    @_hook_tool('config-get')
+    def config_get(self, *, use_cache: bool = True):
         state_config = self._state.config.copy()  # dedup or we'll mutate the state!
 
         # add defaults
@@ -328,7 +371,10 @@ class _MockModelBackend(_ModelBackend):  # type: ignore
 
         return state_config  # full config
 
-    def network_get(self, binding_name: str, relation_id: int | None = None):
+    @_hook_tool('network-get')
+    def network_get(
+        self, binding_name: str, relation_id: int | None = None, *, use_cache: bool = True
+    ):
         # validation:
         extra_bindings = self._charm_spec.meta.get('extra-bindings', ())
         all_endpoints = self._charm_spec.get_all_relations()
@@ -366,6 +412,7 @@ class _MockModelBackend(_ModelBackend):  # type: ignore
         return network._hook_tool_output_fmt()
 
     # setter methods: these can mutate the state.
+    @_hook_tool('application-version-set')
     def application_version_set(self, version: str):
         if workload_version := self._state.workload_version:
             # do not record if empty = unset
@@ -373,6 +420,7 @@ class _MockModelBackend(_ModelBackend):  # type: ignore
 
         self._state._update_workload_version(version)
 
+    @_hook_tool('status-set')
     def status_set(
         self,
         status: _SettableStatusName,
@@ -389,9 +437,11 @@ class _MockModelBackend(_ModelBackend):  # type: ignore
         status_obj = _EntityStatus.from_status_name(status, message)
         self._state._update_status(status_obj, is_app)
 
+    @_hook_tool('juju-log')
     def juju_log(self, level: str, message: str):
         self._context.juju_log.append(JujuLogLine(level, message))
 
+    @_hook_tool('relation-set')
     def relation_set(self, relation_id: int, data: Mapping[str, str], is_app: bool) -> None:
         self._check_app_data_access(is_app)
         # NOTE: The code below currently does not have any effect, because
@@ -417,6 +467,7 @@ class _MockModelBackend(_ModelBackend):  # type: ignore
             else:
                 tgt[key] = value
 
+    @_hook_tool('secret-add')
     def secret_add(
         self,
         content: dict[str, str],
@@ -459,6 +510,7 @@ class _MockModelBackend(_ModelBackend):  # type: ignore
             # charm-facing side: respect ops error
             raise ModelError('ERROR permission denied') from understandable_error
 
+    @_hook_tool('secret-get')
     def secret_get(
         self,
         *,
@@ -486,6 +538,7 @@ class _MockModelBackend(_ModelBackend):  # type: ignore
 
         return secret.tracked_content.copy()
 
+    @_hook_tool('secret-info-get')
     def secret_info_get(
         self,
         *,
@@ -511,6 +564,7 @@ class _MockModelBackend(_ModelBackend):  # type: ignore
             model_uuid=self._state.model.uuid,
         )
 
+    @_hook_tool('secret-set')
     def secret_set(
         self,
         id: str,
@@ -541,6 +595,7 @@ class _MockModelBackend(_ModelBackend):  # type: ignore
             rotate=rotate,
         )
 
+    @_hook_tool('secret-grant')
     def secret_grant(self, id: str, relation_id: int, *, unit: str | None = None):
         secret = self._get_secret(id)
         self._check_can_manage_secret(secret)
@@ -555,6 +610,7 @@ class _MockModelBackend(_ModelBackend):  # type: ignore
 
         secret.remote_grants[relation_id].add(cast('str', grantee))
 
+    @_hook_tool('secret-revoke')
     def secret_revoke(self, id: str, relation_id: int, *, unit: str | None = None):
         secret = self._get_secret(id)
         self._check_can_manage_secret(secret)
@@ -567,6 +623,11 @@ class _MockModelBackend(_ModelBackend):  # type: ignore
         if not secret.remote_grants[relation_id]:
             del secret.remote_grants[relation_id]
 
+    @_hook_tool('secret-ids')
+    def secret_ids(self) -> list[str]:
+        return [secret.id for secret in self._state.secrets if secret.owner is not None]
+
+    @_hook_tool('secret-remove')
     def secret_remove(self, id: str, *, revision: int | None = None):
         secret = self._get_secret(id)
         self._check_can_manage_secret(secret)
@@ -598,6 +659,7 @@ class _MockModelBackend(_ModelBackend):  # type: ignore
         # executed, so we track that in a history list in the context.
         self._context.removed_secret_revisions.append(revision)
 
+    @_hook_tool('relation-list')
     def relation_remote_app_name(
         self,
         relation_id: int,
@@ -617,6 +679,7 @@ class _MockModelBackend(_ModelBackend):  # type: ignore
             return relation.remote_app_name
         raise TypeError('relation_remote_app_name: unknown relation type')
 
+    @_hook_tool('action-set')
     def action_set(self, results: dict[str, Any]):
         if not self._event.action:
             raise ActionMissingFromContextError(
@@ -631,6 +694,7 @@ class _MockModelBackend(_ModelBackend):  # type: ignore
         else:
             self._context.action_results = results
 
+    @_hook_tool('action-fail')
     def action_fail(self, message: str = ''):
         if not self._event.action:
             raise ActionMissingFromContextError(
@@ -638,6 +702,7 @@ class _MockModelBackend(_ModelBackend):  # type: ignore
             )
         self._context._action_failure_message = message
 
+    @_hook_tool('action-log')
     def action_log(self, message: str):
         if not self._event.action:
             raise ActionMissingFromContextError(
@@ -645,6 +710,7 @@ class _MockModelBackend(_ModelBackend):  # type: ignore
             )
         self._context.action_logs.append(message)
 
+    @_hook_tool('action-get')
     def action_get(self):
         action = self._event.action
         if not action:
@@ -653,6 +719,7 @@ class _MockModelBackend(_ModelBackend):  # type: ignore
             )
         return copy.deepcopy(action.params)
 
+    @_hook_tool('storage-add')
     def storage_add(self, name: str, count: int = 1):
         if not isinstance(count, int) or isinstance(count, bool):
             raise TypeError(
@@ -665,6 +732,7 @@ class _MockModelBackend(_ModelBackend):  # type: ignore
 
         self._context.requested_storages[name] = count
 
+    @_hook_tool('storage-list')
     def storage_list(self, name: str) -> list[int]:
         return [storage.index for storage in self._state.storages if storage.name == name]
 
@@ -676,6 +744,7 @@ class _MockModelBackend(_ModelBackend):  # type: ignore
         fs_path = storage.get_filesystem(self._context)
         return storage.index, str(fs_path)
 
+    @_hook_tool('storage-get')
     def storage_get(self, storage_name_id: str, attribute: str) -> str:
         if not len(attribute) > 0:  # assume it's an empty string.
             raise RuntimeError(
@@ -708,7 +777,8 @@ class _MockModelBackend(_ModelBackend):  # type: ignore
         fs_path = storage.get_filesystem(self._context)
         return str(fs_path)
 
-    def planned_units(self) -> int:
+    @_hook_tool('goal-state')
+    def planned_units(self, *, use_cache: bool = True) -> int:
         return self._state.planned_units
 
     # legacy ops API that we don't intend to mock:
@@ -732,6 +802,7 @@ class _MockModelBackend(_ModelBackend):  # type: ignore
             '(and never will be: it was removed in Juju 3.6.11)'
         )
 
+    @_hook_tool('resource-get')
     def resource_get(self, resource_name: str) -> str:
         # We assume that there are few enough resources that a linear search
         # will perform well enough.
@@ -744,6 +815,7 @@ class _MockModelBackend(_ModelBackend):  # type: ignore
             f'Inconsistent state: resource {resource_name} not found in State. please pass it.',
         )
 
+    @_hook_tool('credential-get')
     def credential_get(self) -> CloudSpec_Ops:
         if not self._context.app_trusted:
             raise ModelError(
@@ -947,6 +1019,16 @@ class _MockPebbleClient(_TestingPebbleClient):
         **kwargs: Any,
     ):
         handler = self._find_exec_handler(command)
+        builtin = not handler and command[:1] == ['sha256sum']
+        if builtin:
+            # Container.push and Container.sync_path run this to compare files.
+            result = self._sha256sum(command)
+            handler = Exec(
+                command,
+                return_code=result.exit_code,
+                stdout=cast('str', result.stdout),
+                stderr=cast('str', result.stderr),
+            )
         if not handler:
             raise ExecError(
                 command,
@@ -988,10 +1070,11 @@ class _MockPebbleClient(_TestingPebbleClient):
             encoding=encoding,
             combine_stderr=combine_stderr,
         )
-        try:
-            self._context.exec_history[self._container_name].append(args)
-        except KeyError:
-            self._context.exec_history[self._container_name] = [args]
+        if not builtin:
+            try:
+                self._context.exec_history[self._container_name].append(args)
+            except KeyError:
+                self._context.exec_history[self._container_name] = [args]
 
         change_id = handler._run()
         return cast(
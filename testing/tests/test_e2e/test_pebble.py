@@ -104,6 +104,26 @@ def test_fs_push(tmp_path, charm_cls):
     )
 
 
+def test_fs_push_if_changed(tmp_path, charm_cls):
+    (tmp_path / 'app.conf').write_text('a=1')
+    container = Container(
+        name='foo',
+        can_connect=True,
+        mounts={'etc': Mount(location='/etc', source=tmp_path)},
+    )
+    ctx = Context(charm_type=charm_cls, meta={'name': 'foo', 'containers': {'foo': {}}})
+    with ctx(ctx.on.start(), state=State(containers={container})) as mgr:
+        mgr.run()
+        workload = mgr.charm.unit.get_container('foo')
+        # The content is compared with sha256sum without an Exec mock for it.
+        assert not workload.push('/etc/app.conf', 'a=1', if_changed=True)
+        assert not workload._no_remote_digests
+        assert workload.push('/etc/app.conf', 'a=2', if_changed=True)
+    assert (tmp_path / 'app.conf').read_text() == 'a=2'
+    # It's not one of the charm's own commands.
+    assert ctx.exec_history == {}
+
+
 @pytest.mark.parametrize('make_dirs', (True, False))
 def test_fs_pull(tmp_path, charm_cls, make_dirs):
     text = 'lorem ipsum/n alles amat gloriae foo'
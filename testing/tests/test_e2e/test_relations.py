@@ -783,3 +783,34 @@ def test_peer_relation_units_does_not_contain_this_unit():
     state = ctx.run(ctx.on.update_status(), State(relations={rel_in}))
     rel_out = state.get_relation(rel_in.id)
     assert rel_out.local_unit_data.get('this-unit') == '<ops.model.Unit charm-name/0>'
+
+
+@pytest.mark.parametrize('prefetch', [False, True])
+def test_peer_relation_prefetch_hook_tool_calls(prefetch: bool):
+    class PeerCharm(ops.CharmBase):
+        def __init__(self, framework: ops.Framework):
+            super().__init__(framework)
+            framework.observe(self.on.update_status, self._update_status)
+
+        def _update_status(self, _: ops.EventBase):
+            if prefetch:
+                relations = self.model.relations.prefetch('peers')
+            else:
+                relations = self.model.relations['peers']
+            for relation in relations:
+                for unit in relation.units:
+                    assert relation.data[unit]['unit'] == unit.name
+
+    ctx = Context(
+        PeerCharm,
+        meta={'name': 'peer', 'peers': {'peers': {'interface': 'peer'}}},
+    )
+    relation = PeerRelation(
+        endpoint='peers',
+        peers_data={i: {'unit': f'peer/{i}'} for i in range(1, 101)},
+    )
+    ctx.run(ctx.on.update_status(), State(relations={relation}))
+    # Prefetching also loads this unit's and the app's databags.
+    assert ctx.hook_tool_calls['relation-get'] == (102 if prefetch else 100)
+    assert ctx.hook_tool_calls['relation-list'] == 1
+    assert ctx.hook_tool_calls['relation-ids'] == 1
@@ -46,6 +46,21 @@ def test_get_secret(owner: str):
         assert mgr.charm.model.get_secret(id=secret.id).get_content()['a'] == 'b'
 
 
+def test_prefetch_secrets():
+    ctx = Context(Charm, meta={'name': 'local'})
+    owned = [Secret({'a': str(i)}, owner='app') for i in range(3)]
+    observed = Secret({'a': 'b'})
+    with ctx(ctx.on.update_status(), State(secrets={*owned, observed})) as mgr:
+        model = mgr.charm.model
+        secrets = model.prefetch_secrets()
+        assert {secret.id for secret in secrets} == {secret.id for secret in owned}
+        assert [secret.get_content() for secret in model.prefetch_secrets([observed.id])] == [
+            {'a': 'b'}
+        ]
+    assert ctx.hook_tool_calls['secret-ids'] == 1
+    assert ctx.hook_tool_calls['secret-get'] == 4
+
+
 @pytest.mark.parametrize('owner', ('app', 'unit'))
 def test_get_secret_get_refresh(owner: str):
     ctx = Context(Charm, meta={'name': 'local'})
@@ -215,3 +215,23 @@ def test_status_error(status: ops.StatusBase, monkeypatch: pytest.MonkeyPatch):
         ctx.run(ctx.on.update_status(), State())
     assert isinstance(excinfo.value.__cause__, ops.ModelError)
     assert f'invalid status "{status.name}"' in str(excinfo.value.__cause__)
+
+
+def test_invalidate_cache():
+    class CachingCharm(ops.CharmBase):
+        def __init__(self, framework: ops.Framework):
+            super().__init__(framework)
+            framework.observe(self.on.update_status, self._on_update_status)
+
+        def _on_update_status(self, _: ops.EventBase):
+            self.unit.status = ops.ActiveStatus('ready')
+            self.model.invalidate_cache()
+            assert self.unit.status == ops.ActiveStatus('ready')
+            assert dict(self.config) == {}
+            assert self.app.planned_units() == 1
+            assert self.unit.opened_ports() == set()
+            assert self.model.get_binding('foo').network.bind_address
+
+    ctx = Context(CachingCharm, meta={'name': 'local', 'extra-bindings': {'foo': {}}})
+    out = ctx.run(ctx.on.update_status(), State())
+    assert out.unit_status == ActiveStatus('ready')
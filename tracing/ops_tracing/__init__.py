@@ -71,6 +71,12 @@ HTTP connections only. Declaring both relations is most common.
 
 Note that you don't have to ``import ops.tracing``, that name is automatically
 available when your Python project depends on ``ops[tracing]``.
+
+Tracing is only set up when the charm first uses ``ops.tracing``, or when an
+earlier dispatch has already collected trace data, so that charms that don't
+use tracing don't pay for it. In the very first dispatch that uses it, the
+trace data from before that point isn't recorded, including the ``ops.main``
+root span, and the later spans have no parent.
 """
 
 from ._api import Tracing
@@ -78,8 +84,10 @@ from ._backend import mark_observed as _mark_observed
 from ._backend import set_destination
 from ._backend import setup as _setup
 from ._backend import shutdown as _shutdown
+from ._sampling import SamplingPolicy
 
 __all__ = [
+    'SamplingPolicy',
     'Tracing',
     '_mark_observed',
     '_setup',
@@ -21,7 +21,9 @@ import logging
 import opentelemetry.trace
 import ops
 
+from . import _backend, _protobuf
 from ._buffer import Destination
+from ._sampling import SamplingPolicy
 from .vendor.charms.certificate_transfer_interface.v1.certificate_transfer import (
     CertificateTransferRequires,
 )
@@ -75,6 +77,14 @@ class Tracing(ops.Object):
         ca_relation_name: the name of the relation that provides the CA
             list to validate the tracing destination against.
         ca_data: a fixed CA list (PEM bundle, a multi-line string).
+        background_export: only write trace data to the local buffer during
+            the dispatch, and send it out from a detached process afterwards,
+            so that a slow or unreachable collector doesn't slow down the
+            dispatch.
+        protobuf: send trace data as OTLP/protobuf instead of OTLP/JSON, which
+            is faster to encode and smaller, for charms that produce many spans.
+        sampling: how much trace data to record, see :class:`SamplingPolicy`.
+            The default is to record everything.
 
     If the destination is resolved to an HTTPS URL, a CA list is required
     to establish a secure connection.
@@ -91,6 +101,9 @@ class Tracing(ops.Object):
         *,
         ca_relation_name: str | None = None,
         ca_data: str | None = None,
+        background_export: bool = False,
+        protobuf: bool = False,
+        sampling: SamplingPolicy | None = None,
     ):
         """Initialise the tracing service."""
         with tracer.start_as_current_span('ops.tracing.Tracing'):
@@ -99,6 +112,9 @@ class Tracing(ops.Object):
             self.tracing_relation_name = tracing_relation_name
             self.ca_relation_name = ca_relation_name
             self.ca_data = ca_data
+            self.mime = _protobuf.CONTENT_TYPE if protobuf else None
+            _backend.set_background_export(background_export)
+            _backend.set_sampling_policy(sampling or SamplingPolicy())
 
             if ca_relation_name is not None and ca_data is not None:
                 raise ValueError('At most one of ca_relation_name, ca_data is allowed')
@@ -160,7 +176,7 @@ class Tracing(ops.Object):
 
     def _reconcile(self, _event: ops.EventBase):
         dst = self._get_destination()
-        ops.tracing.set_destination(url=dst.url, ca=dst.ca)
+        ops.tracing.set_destination(url=dst.url, ca=dst.ca, mime=self.mime)
 
     def _get_destination(self) -> Destination:
         try:
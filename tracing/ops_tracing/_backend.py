@@ -14,6 +14,7 @@
 
 from __future__ import annotations
 
+import logging
 import pathlib
 from typing import TYPE_CHECKING
 
@@ -27,13 +28,21 @@ if TYPE_CHECKING:
     from ops import JujuContext
 
 from ._buffer import Destination
-from ._export import BufferingSpanExporter
+from ._export import ENCODERS, BufferingSpanExporter
+from ._sampling import PolicySampler, SamplingPolicy
+
+logger = logging.getLogger(__name__)
 
 BUFFER_FILENAME: str = '.tracing-data.db'
 """Name of the buffer file where the trace data is stored, next to .unit-state.db."""
 
+SAMPLING_SETTING: str = 'sampling'
+"""Key of the sampling policy in the buffer settings, saved for the next dispatches."""
+
 _exporter: BufferingSpanExporter | None = None
 """A reference to the exporter that we passed to OpenTelemetry SDK at setup."""
+_sampler = PolicySampler()
+"""The sampler that we pass to OpenTelemetry SDK, which applies the sampling policy."""
 
 
 def setup(juju_context: JujuContext, charm_class_name: str) -> None:
@@ -66,6 +75,24 @@ def setup(juju_context: JujuContext, charm_class_name: str) -> None:
     )
     set_tracer_provider(_create_provider(resource, juju_context.charm_dir))
 
+    # Load the policy before the dispatch's root span starts, so that head
+    # sampling applies to the whole dispatch.
+    _sampler.reset()
+    _sampler.set_policy(_load_sampling_policy())
+
+
+def _load_sampling_policy() -> SamplingPolicy:
+    if not _exporter:
+        return SamplingPolicy()
+    data = _exporter.buffer.load_setting(SAMPLING_SETTING)
+    if not data:
+        return SamplingPolicy()
+    try:
+        return SamplingPolicy._from_json(data)
+    except (ValueError, TypeError):
+        logger.exception('Loading the tracing sampling policy')
+        return SamplingPolicy()
+
 
 def _create_provider(resource: Resource, charm_dir: pathlib.Path) -> TracerProvider:
     """Create the OpenTelemetry tracer provider."""
@@ -73,12 +100,14 @@ def _create_provider(resource: Resource, charm_dir: pathlib.Path) -> TracerProvi
     global _exporter
     _exporter = BufferingSpanExporter(charm_dir / BUFFER_FILENAME)
     span_processor = BatchSpanProcessor(_exporter)
-    provider = TracerProvider(resource=resource)
+    provider = TracerProvider(
+        resource=resource, sampler=_sampler, span_limits=_sampler.span_limits
+    )
     provider.add_span_processor(span_processor)
     return provider
 
 
-def set_destination(url: str | None, ca: str | None) -> None:
+def set_destination(url: str | None, ca: str | None, mime: str | None = None) -> None:
     """Configure the destination service for trace data.
 
     Args:
@@ -86,11 +115,15 @@ def set_destination(url: str | None, ca: str | None) -> None:
             An example could be ``http://localhost/v1/traces``.
             None or empty string disables sending out the data, which is still buffered.
         ca: the CA list (PEM bundle, a multi-line string), only used for HTTPS URLs.
+        mime: the format to send trace data in, ``application/json`` (OTLP/JSON)
+            or ``application/x-protobuf`` (OTLP/protobuf). None means OTLP/JSON.
     """
     if url and not url.startswith(('http://', 'https://')):
         raise ValueError('Only HTTP and HTTPS tracing destinations are supported.')
+    if mime is not None and mime not in ENCODERS:
+        raise ValueError(f'Unsupported trace data format {mime!r}.')
 
-    config = Destination(url, ca)
+    config = Destination(url, ca, mime)
 
     if not _exporter:
         # Perhaps our tracer provider was never set up.
@@ -101,6 +134,23 @@ def set_destination(url: str | None, ca: str | None) -> None:
     _exporter.buffer.save_destination(config)
 
 
+def set_sampling_policy(policy: SamplingPolicy) -> None:
+    """Apply the sampling policy to new spans, and save it for the next dispatches."""
+    if policy == _sampler.policy:
+        return
+    _sampler.set_policy(policy)
+    if not _exporter:
+        return
+    _exporter.buffer.save_setting(SAMPLING_SETTING, policy._to_json())
+
+
+def set_background_export(enabled: bool) -> None:
+    """Only buffer trace data during the dispatch, and send it out from a background process."""
+    if not _exporter:
+        return
+    _exporter.background = enabled
+
+
 def mark_observed() -> None:
     """Mark the trace data collected in this dispatch as higher priority."""
     if not _exporter:
@@ -113,3 +163,11 @@ def shutdown() -> None:
     provider = get_tracer_provider()
     if isinstance(provider, TracerProvider):
         provider.shutdown()
+
+    if _exporter and _exporter.background and _exporter.buffer.load_destination().url:
+        from . import _flush  # break circular import
+
+        try:
+            _flush.spawn(_exporter.buffer.path)
+        except OSError:
+            logger.exception('Starting the trace data flusher')
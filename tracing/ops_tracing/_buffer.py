@@ -64,6 +64,13 @@ class Destination:
     """The URL to send trace data to."""
     ca: str | None
     """CA list, a PEM bundle."""
+    mime: str | None = None
+    """MIME type to encode trace data as, or None for the default, OTLP/JSON."""
+
+
+def chunk_size(data: bytes) -> int:
+    """Return the space a chunk of trace data takes up, rounded up to whole 4KiB pages."""
+    return (len(data) + 4095) // 4096 * 4096
 
 
 def retry(f: Callable[P, R]) -> Callable[P, R]:
@@ -98,11 +105,14 @@ class Buffer:
     observed = False
     """Marks that data from this dispatch invocation has been marked observed."""
     stored: int | None = None
-    """Estimate of stored data size in bytes if known, or None if not yet known."""
+    """Stored data size in bytes, as of the last push, or None if not yet known."""
 
     def __init__(self, path: pathlib.Path):
         self.path = path
         self.ids = set()
+        # Only the charm changes the destination, through this object, so it
+        # doesn't need to be read from the database for each export.
+        self._destination: Destination | None = None
         self._set_db_schema()
 
     @retry
@@ -125,17 +135,12 @@ class Buffer:
                     -- a chunk of trace data
                     data BLOB NOT NULL,
                     -- MIME type for these data
-                    mime TEXT NOT NULL
+                    mime TEXT NOT NULL,
+                    -- the size of data rounded up to whole pages, see chunk_size()
+                    size INTEGER NOT NULL DEFAULT 0
                 )
                 """
             )
-            conn.execute(
-                """
-                CREATE INDEX IF NOT EXISTS tracing_priority_id
-                ON tracing
-                (priority, id)
-                """
-            )
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS settings (
@@ -146,6 +151,21 @@ class Buffer:
                 )
                 """
             )
+            columns = {row[1] for row in conn.execute("""PRAGMA table_info(tracing)""")}
+            if 'size' not in columns:
+                # Buffer created by an older version.
+                conn.execute("""ALTER TABLE tracing ADD COLUMN size INTEGER NOT NULL DEFAULT 0""")
+                conn.execute("""UPDATE tracing SET size = (length(data)+4095)/4096*4096""")
+                conn.execute("""DELETE FROM settings WHERE key = 'stored'""")
+            # Eviction walks this index in order, without reading the data.
+            conn.execute("""DROP INDEX IF EXISTS tracing_priority_id""")
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS tracing_priority_id_size
+                ON tracing
+                (priority, id, size)
+                """
+            )
 
     @contextlib.contextmanager
     def tx(self, *, timeout: float = DB_TIMEOUT, readonly: bool = False):
@@ -164,18 +184,39 @@ class Buffer:
     @retry
     def load_destination(self) -> Destination:
         """Get the tracing destination from the database."""
+        if self._destination is not None:
+            return self._destination
         with self.tx(readonly=True) as conn:
             settings = {k: v for k, v in conn.execute("""SELECT key, value FROM settings""")}
-            return Destination(settings.get('url') or None, settings.get('ca') or None)
+            self._destination = Destination(
+                settings.get('url') or None,
+                settings.get('ca') or None,
+                settings.get('mime') or None,
+            )
+        return self._destination
 
     @retry
     def save_destination(self, destination: Destination) -> None:
         """Update the tracing destination in the database."""
         with self.tx() as conn:
             conn.execute(
-                """REPLACE INTO settings(key, value) VALUES ('url', ?), ('ca', ?)""",
-                (destination.url or '', destination.ca or ''),
+                """REPLACE INTO settings(key, value) VALUES ('url', ?), ('ca', ?), ('mime', ?)""",
+                (destination.url or '', destination.ca or '', destination.mime or ''),
             )
+        self._destination = destination
+
+    @retry
+    def load_setting(self, key: str) -> str | None:
+        """Get a setting from the database, or None if it's not set."""
+        with self.tx(readonly=True) as conn:
+            row = conn.execute("""SELECT value FROM settings WHERE key = ?""", (key,)).fetchone()
+            return row[0] if row else None
+
+    @retry
+    def save_setting(self, key: str, value: str) -> None:
+        """Update a setting in the database."""
+        with self.tx() as conn:
+            conn.execute("""REPLACE INTO settings(key, value) VALUES (?, ?)""", (key, value))
 
     @retry
     def mark_observed(self) -> None:
@@ -195,6 +236,41 @@ class Buffer:
         self.observed = True
         self.ids.clear()
 
+    @retry
+    def push(self, data: bytes, mime: str) -> None:
+        """Push a data chunk into the queue.
+
+        Removes old, boring data if the queue would grow beyond the set limit.
+        """
+        with self.tx() as conn:
+            self._push(conn, data, mime)
+
+    def _push(self, conn: sqlite3.Connection, data: bytes, mime: str) -> None:
+        """Must be called in a write transaction."""
+        size = chunk_size(data)
+
+        # Ensure that there's enough space in the buffer
+        # TODO: expose `stored` in metrics, one day.
+        stored = self._stored_size(conn)
+        excess = stored + size - BUFFER_SIZE
+        if excess > 0:
+            stored -= self._evict(conn, excess)
+
+        # Store the new trace data.
+        priority = OBSERVED_PRIORITY if self.observed else DEFAULT_PRIORITY
+        cursor = conn.execute(
+            """
+            INSERT INTO tracing (priority, data, mime, size)
+            VALUES (?, ?, ?, ?)
+            """,
+            (priority, data, mime, size),
+        )
+        self._save_stored_size(conn, stored + size)
+
+        assert cursor.lastrowid is not None  # noqa: S101  # Just inserted.
+        if not self.observed:
+            self.ids.add(cursor.lastrowid)
+
     @retry
     def pushpop(self, record: tuple[bytes, str] | None = None) -> tuple[int, bytes, str] | None:
         """Push a message into the queue and return another.
@@ -203,110 +279,127 @@ class Buffer:
         Removes old, boring data if the queue would grow beyond the set limit.
         Returns the oldest important record (id, data, mime type).
         """
-        data, mime = record if record else (None, None)
-        stored_size = 0 if data is None else (len(data) + 4095) // 4096 * 4096
-        collected_size = 0
-
-        with self.tx(readonly=not data) as conn:
-            if data:
-                # Ensure that there's enough space in the buffer
-
-                # TODO: expose `stored` in metrics, one day.
-                if self.stored is None:
-                    self.stored = self._stored_size(conn)
-                excess = self.stored + stored_size - BUFFER_SIZE
-
-                if excess > 0:
-                    # Drop lower-priority, older data
-                    cursor = conn.execute(
-                        """
-                        SELECT id, (length(data)+4095)/4096*4096
-                        FROM tracing
-                        ORDER BY priority ASC, id ASC
-                        """
-                    )
-
-                    collected_ids: set[int] = set()
-                    for id_, size in cursor:
-                        collected_ids.add(id_)
-                        collected_size += size
-                        if collected_size > excess:
-                            break
-
-                    collected_template = ','.join(['?'] * len(collected_ids))
-                    conn.execute(
-                        f"""
-                        DELETE FROM tracing
-                        WHERE id IN ({collected_template})
-                        """,  # noqa: S608
-                        tuple(collected_ids),
-                    )
-
-                # Store the new trace data.
-                priority = OBSERVED_PRIORITY if self.observed else DEFAULT_PRIORITY
-                cursor = conn.execute(
-                    """
-                    INSERT INTO tracing (priority, data, mime)
-                    VALUES (?, ?, ?)
-                    """,
-                    (priority, data, mime),
-                )
-
-                assert cursor.lastrowid is not None  # noqa: S101  # Just inserted.
-                if not self.observed:
-                    self.ids.add(cursor.lastrowid)
+        with self.tx(readonly=not record) as conn:
+            if record:
+                self._push(conn, *record)
 
             # Return the oldest important record, if any.
+            # Two lookups in the index, rather than sorting the whole table.
             rv = conn.execute(
                 """
                 SELECT id, data, mime
                 FROM tracing
-                ORDER BY priority DESC, id ASC
+                WHERE priority = (SELECT max(priority) FROM tracing)
+                ORDER BY id ASC
                 LIMIT 1
                 """
             ).fetchone()
 
-        if self.stored is not None:
-            self.stored += stored_size - collected_size
+        return rv
 
+    @retry
+    def oldest(self, max_size: int) -> list[tuple[int, bytes, str]]:
+        """Return the oldest important records that fit in max_size, in the order to send.
+
+        The records all have the same priority and MIME type as the first one. The first
+        record is returned even if it's larger than max_size.
+        Returns a list of records (id, data, mime type), empty if there are none.
+        """
+        rv: list[tuple[int, bytes, str]] = []
+        size = 0
+        with self.tx(readonly=True) as conn:
+            # As in pushpop, find the top priority in the index first, rather
+            # than sorting the whole table.
+            cursor = conn.execute(
+                """
+                SELECT id, data, mime
+                FROM tracing
+                WHERE priority = (SELECT max(priority) FROM tracing)
+                ORDER BY id ASC
+                """
+            )
+            for id_, data, mime in cursor:
+                if rv and (mime != rv[0][2] or size + len(data) > max_size):
+                    break
+                rv.append((id_, data, mime))
+                size += len(data)
         return rv
 
     def _stored_size(self, conn: sqlite3.Connection) -> int:
-        """Must be called in a transaction."""
-        stored: int | None = conn.execute(
+        """Get the running total of stored data size. Must be called in a transaction."""
+        row = conn.execute("""SELECT value FROM settings WHERE key = 'stored'""").fetchone()
+        if row:
+            self.stored = int(row[0])
+        else:
+            # Only for a buffer created by an older version.
+            self.stored = conn.execute("""SELECT total(size) FROM tracing""").fetchone()[0]
+            self.stored = int(self.stored or 0)
+        return self.stored
+
+    def _save_stored_size(self, conn: sqlite3.Connection, stored: int) -> None:
+        """Must be called in the same write transaction that changed the stored data."""
+        conn.execute("""REPLACE INTO settings(key, value) VALUES ('stored', ?)""", (str(stored),))
+        self.stored = stored
+
+    def _evict(self, conn: sqlite3.Connection, excess: int) -> int:
+        """Drop lower-priority, older data to free at least excess bytes.
+
+        Only reads as many index entries as needed, and returns the bytes freed.
+        Must be called in a write transaction.
+        """
+        collected_size = 0
+        last: tuple[int, int] | None = None
+        cursor = conn.execute(
             """
-            SELECT sum((length(data)+4095)/4096*4096)
+            SELECT priority, id, size
             FROM tracing
+            ORDER BY priority ASC, id ASC
             """
-        ).fetchone()[0]
-        return stored or 0
+        )
+        for priority, id_, size in cursor:
+            last = (priority, id_)
+            collected_size += size
+            if collected_size > excess:
+                break
+        cursor.close()
+
+        if last:
+            # The data to drop is a prefix of the index.
+            conn.execute(
+                """
+                DELETE FROM tracing
+                WHERE (priority, id) <= (?, ?)
+                """,
+                last,
+            )
+        return collected_size
 
     @retry
-    def remove(self, id_: int) -> None:
-        """Remove a tracing record by id."""
+    def remove(self, *ids: int) -> None:
+        """Remove tracing records by id."""
+        template = ','.join(['?'] * len(ids))
         with self.tx() as conn:
             # The RETURNING clause would be ideal here, but it can't be used.
             # Sqlite shipped with Python 3.8 is too old.
-            row = conn.execute(
-                """
-                SELECT (length(data)+4095)/4096*4096
+            size: int | None = conn.execute(
+                f"""
+                SELECT sum(size)
                 FROM tracing
-                WHERE id = ?
-                """,
-                (id_,),
-            ).fetchone()
+                WHERE id IN ({template})
+                """,  # noqa: S608
+                ids,
+            ).fetchone()[0]
 
-            if not row:
+            if size is None:
                 return
 
             conn.execute(
-                """
+                f"""
                 DELETE FROM tracing
-                WHERE id = ?
-                """,
-                (id_,),
+                WHERE id IN ({template})
+                """,  # noqa: S608
+                ids,
             )
+            self._save_stored_size(conn, self._stored_size(conn) - size)
 
-        self.ids -= {id_}
-        if self.stored is not None:
-            self.stored -= row[0]
+        self.ids -= set(ids)
@@ -14,18 +14,21 @@
 
 from __future__ import annotations
 
+import gzip
+import http.client
+import json
 import logging
 import pathlib
 import ssl
 import threading
 import time
-import urllib.error
-import urllib.request
-from typing import Sequence
+import urllib.parse
+from typing import Callable, Sequence
 
 from opentelemetry.sdk.trace import ReadableSpan
 from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
 
+from . import _protobuf
 from ._buffer import Buffer
 from .vendor import otlp_json
 
@@ -33,7 +36,16 @@ EXPORT_TIMEOUT: int | float = 1  # seconds
 """How much time to give OTLP span exporter to push traces to the backend."""
 
 SENDOUT_FACTOR: int = 10
-"""How many buffered chunks to send out for each incoming chunk."""
+"""How many requests to send out for each incoming chunk."""
+
+MAX_REQUEST_SIZE: int = 4 * 1024 * 1024
+"""Up to how many bytes of buffered chunks to merge into one request, before compression."""
+
+ENCODERS: dict[str, Callable[[Sequence[ReadableSpan]], bytes]] = {
+    otlp_json.CONTENT_TYPE: otlp_json.encode_spans,
+    _protobuf.CONTENT_TYPE: _protobuf.encode_spans,
+}
+"""Encoders for the supported trace data formats, by MIME type."""
 
 logger = logging.getLogger(__name__)
 
@@ -55,11 +67,19 @@ class BufferingSpanExporter(SpanExporter):
     """Buffers and sends out trace data."""
 
     cache: dict[str | None, ssl.SSLContext]
+    connection: http.client.HTTPConnection | None = None
+    """Connection to the collector, kept alive for the rest of the dispatch."""
+    background: bool = False
+    """Only buffer the trace data, leaving it to a background flusher to send out."""
+    timeout: int | float = EXPORT_TIMEOUT
+    """How long to wait for the collector, for each request."""
 
     def __init__(self, buffer_path: pathlib.Path):
         self.buffer = Buffer(buffer_path)
         self.lock = threading.Lock()
         self.cache = {}
+        self._connection_key: tuple[str, str, str | None] | None = None
+        self._connection_used = False
 
     def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
         """Export a batch of telemetry data.
@@ -80,22 +100,32 @@ class BufferingSpanExporter(SpanExporter):
             deadline = time.monotonic() + 6
 
             assert spans  # noqa: S101  # The BatchSpanProcessor won't call us if there's no data.
-            rv = self.buffer.pushpop((otlp_json.encode_spans(spans), otlp_json.CONTENT_TYPE))
-            assert rv  # noqa: S101  # We've just pushed something in.
-            self.do_export(*rv)
+            mime = self.buffer.load_destination().mime or otlp_json.CONTENT_TYPE
+            self.buffer.push(ENCODERS[mime](spans), mime)
 
-            for _ in range(SENDOUT_FACTOR - 1):
-                if time.monotonic() > deadline:
-                    break
-                if not (rv := self.buffer.pushpop()):
-                    break
-                self.do_export(*rv)
+            if not self.background:
+                self.send_out(deadline, SENDOUT_FACTOR)
 
             return SpanExportResult.SUCCESS
         except Exception:
             logger.exception('Exporting trace data')
             raise
 
+    def send_out(self, deadline: float, max_requests: int) -> None:
+        """Send out buffered data, oldest important data first.
+
+        Stops when the buffer is empty, a request fails, max_requests have been
+        sent, or the deadline (a :func:`time.monotonic` value) has passed.
+        """
+        with self.lock:
+            for i in range(max_requests):
+                if i and time.monotonic() > deadline:
+                    break
+                if not (records := self.buffer.oldest(MAX_REQUEST_SIZE)):
+                    break
+                if not self.do_export(records):
+                    break
+
     def ssl_context(self, ca: str | None) -> ssl.SSLContext:
         """Create an SSL context with our CA list and settings."""
         if context := self.cache.get(ca):
@@ -120,44 +150,108 @@ class BufferingSpanExporter(SpanExporter):
         context.verify_flags &= ~ssl.VERIFY_X509_STRICT
         return context
 
-    def do_export(self, buffered_id: int, data: bytes, mime: str) -> None:
-        """Export buffered data and remove it from the buffer on success."""
+    def do_export(self, records: Sequence[tuple[int, bytes, str]]) -> bool:
+        """Export buffered records in one request, and remove them from the buffer on success.
+
+        Returns True if the records were sent.
+        """
         config = self.buffer.load_destination()
         if not config.url:
-            return
+            return False
 
         if not config.url.startswith(('http://', 'https://')):
             raise ValueError(f'{config.url=} must be an HTTP or HTTPS URL')
-        context = self.ssl_context(config.ca) if config.url.startswith('https://') else None
+
+        mime = records[0][2]
+        if mime not in ENCODERS:
+            # Only chunks in the formats we encode are merged.
+            records = records[:1]
+        body = gzip.compress(merge([data for _, data, _ in records], mime), mtime=0)
+        headers = {'Content-Type': mime, 'Content-Encoding': 'gzip'}
 
         try:
-            with urllib.request.urlopen(  # noqa: S310
-                urllib.request.Request(  # noqa: S310
-                    config.url,
-                    data=data,
-                    headers={'Content-Type': mime},
-                    method='POST',
-                ),
-                context=context,
-                timeout=EXPORT_TIMEOUT,
-            ):
-                pass
-        except urllib.error.HTTPError as e:
-            resp = e.fp.read()[:1000]
-            logger.exception(f'Tracing collector rejected our data, {e.code=} {resp=}')
-        except OSError:
-            # URLError, TimeoutError, SSLError, socket.error
+            status, resp = self._post(config.url, config.ca, body, headers)
+        except (OSError, http.client.HTTPException):
+            # TimeoutError, SSLError, socket.error, a broken connection
             # We silence these errors, as a misconfigured system would produce too many.
-            pass
+            self.close()
+            return False
         except Exception:
+            self.close()
             logger.exception('Failed to send trace data out')
-        else:
-            self.buffer.remove(buffered_id)
+            return False
+
+        if status >= 300:
+            logger.error(f'Tracing collector rejected our data, {status=} {resp=}')
+            return False
+        self.buffer.remove(*(id_ for id_, _, _ in records))
+        return True
+
+    def _post(
+        self, url: str, ca: str | None, body: bytes, headers: dict[str, str]
+    ) -> tuple[int, bytes]:
+        """POST the body, reusing the connection from earlier requests if possible."""
+        parts = urllib.parse.urlsplit(url)
+        path = parts.path or '/'
+        if parts.query:
+            path += f'?{parts.query}'
+        key = (parts.scheme, parts.netloc, ca)
+        if self.connection is not None and key != self._connection_key:
+            self.close()
+
+        while True:
+            if self.connection is None:
+                if parts.scheme == 'https':
+                    self.connection = http.client.HTTPSConnection(
+                        parts.netloc, timeout=self.timeout, context=self.ssl_context(ca)
+                    )
+                else:
+                    self.connection = http.client.HTTPConnection(
+                        parts.netloc, timeout=self.timeout
+                    )
+                self._connection_key = key
+                self._connection_used = False
+            reused = self._connection_used
+            try:
+                self.connection.request('POST', path, body=body, headers=headers)
+                response = self.connection.getresponse()
+                data = response.read()[:1000]
+            except (ConnectionError, http.client.BadStatusLine):
+                self.close()
+                if reused:
+                    # The collector closed the idle connection; try again on a new one.
+                    continue
+                raise
+            self._connection_used = True
+            if response.will_close:
+                self.close()
+            return response.status, data
+
+    def close(self) -> None:
+        """Close the connection to the collector, if it's open."""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
 
     def shutdown(self) -> None:
         """Shut down the exporter."""
-        pass
+        with self.lock:
+            self.close()
 
     def force_flush(self, timeout_millis: int = 30000) -> bool:
         """No-op, as the real exporter doesn't buffer."""
         return True
+
+
+def merge(chunks: Sequence[bytes], mime: str) -> bytes:
+    """Merge chunks of trace data into one export request.
+
+    OTLP/JSON chunks are merged by combining their resource spans. Protobuf
+    messages merge by concatenation, and other chunks are concatenated too.
+    """
+    if len(chunks) == 1 or mime != otlp_json.CONTENT_TYPE:
+        return b''.join(chunks)
+    resource_spans: list[object] = []
+    for chunk in chunks:
+        resource_spans.extend(json.loads(chunk)['resourceSpans'])
+    return json.dumps({'resourceSpans': resource_spans}, separators=(',', ':')).encode()
@@ -0,0 +1,81 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific language
+# governing permissions and limitations under the License.
+
+"""Background flusher for the ops-tracing extension.
+
+With background export, the dispatch only writes trace data to the buffer, and
+then starts this module in a detached process to send the data out, so that the
+dispatch doesn't wait for the tracing collector. A lock file next to the buffer
+ensures that there's at most one flusher for each unit.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import os
+import pathlib
+import subprocess  # noqa: S404
+import sys
+import time
+
+from ._export import BufferingSpanExporter
+
+FLUSH_TIMEOUT: int | float = 60  # seconds
+"""How long a flusher may keep sending data out before it gives up until the next dispatch."""
+
+MAX_REQUESTS: int = 1000
+"""How many requests a flusher may send out."""
+
+REQUEST_TIMEOUT: int | float = 10  # seconds
+"""How long a flusher waits for the collector, for each request."""
+
+
+def spawn(buffer_path: pathlib.Path) -> None:
+    """Start a detached flusher process for the buffer, and return without waiting for it."""
+    # The flusher must not hold on to the dispatch's standard streams, or Juju
+    # would wait for it to finish, and it must survive the end of the dispatch.
+    subprocess.Popen(  # noqa: S603
+        [sys.executable, '-m', __name__, str(buffer_path)],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+        env={**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)},
+    )
+
+
+def flush(buffer_path: pathlib.Path) -> bool:
+    """Send out the buffered data, unless another flusher is already doing that.
+
+    Returns False if another flusher holds the lock.
+    """
+    lock_path = buffer_path.with_name(f'{buffer_path.name}.lock')
+    fd = os.open(lock_path, os.O_CREAT | os.O_RDWR, 0o600)
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        exporter = BufferingSpanExporter(buffer_path)
+        exporter.timeout = REQUEST_TIMEOUT
+        try:
+            exporter.send_out(time.monotonic() + FLUSH_TIMEOUT, MAX_REQUESTS)
+        finally:
+            exporter.shutdown()
+        return True
+    finally:
+        # Closing the file releases the lock.
+        os.close(fd)
+
+
+if __name__ == '__main__':
+    flush(pathlib.Path(sys.argv[1]))
@@ -64,6 +64,8 @@ def patch_tracing() -> Generator[InMemorySpanExporter, None, None]:
 
 def _create_provider(resource: Resource, charm_dir: pathlib.Path) -> TracerProvider:
     """Create an OpenTelemetry tracing provider suitable for testing."""
-    provider = TracerProvider(resource=resource)
+    provider = TracerProvider(
+        resource=resource, sampler=_backend._sampler, span_limits=_backend._sampler.span_limits
+    )
     provider.add_span_processor(SPAN_PROCESSOR)
     return provider
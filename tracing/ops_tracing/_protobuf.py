@@ -0,0 +1,302 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific language
+# governing permissions and limitations under the License.
+
+"""OTLP/protobuf encoder for trace data in the ops-tracing extension.
+
+This writes the protobuf wire format of an ``ExportTraceServiceRequest``
+directly, without depending on the ``protobuf`` package or generated code.
+The output is equivalent to the vendored OTLP/JSON encoder's.
+
+Serialised protobuf messages can be merged by concatenation, so chunks
+encoded separately can be sent out in one request by joining them.
+"""
+
+from __future__ import annotations
+
+import struct
+from collections.abc import Mapping, Sequence
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import Event, ReadableSpan
+    from opentelemetry.sdk.util.instrumentation import InstrumentationScope
+
+CONTENT_TYPE = 'application/x-protobuf'
+
+_pack_fixed32 = struct.Struct('<I').pack
+_pack_fixed64 = struct.Struct('<Q').pack
+_pack_double = struct.Struct('<d').pack
+
+_INT64_MASK = 2**64 - 1
+
+# Span flags, see the comment on Span.flags in the OTLP trace.proto.
+_REMOTE = 0x300
+_LOCAL = 0x100
+
+# Field tags, that is (field number << 3) | wire type, already varint encoded.
+# Wire types: 0 varint, 1 fixed64, 2 length-delimited, 5 fixed32.
+_REQUEST_RESOURCE_SPANS = b'\x0a'
+_RESOURCE_SPANS_RESOURCE = b'\x0a'
+_RESOURCE_SPANS_SCOPE_SPANS = b'\x12'
+_SCOPE_SPANS_SCOPE = b'\x0a'
+_SCOPE_SPANS_SPANS = b'\x12'
+_RESOURCE_ATTRIBUTES = b'\x0a'
+_RESOURCE_DROPPED_ATTRIBUTES_COUNT = b'\x10'
+_SCOPE_NAME = b'\x0a'
+_SCOPE_VERSION = b'\x12'
+_SCOPE_ATTRIBUTES = b'\x1a'
+_SCOPE_DROPPED_ATTRIBUTES_COUNT = b'\x20'
+_SPAN_TRACE_ID = b'\x0a'
+_SPAN_SPAN_ID = b'\x12'
+_SPAN_PARENT_SPAN_ID = b'\x22'
+_SPAN_NAME = b'\x2a'
+_SPAN_KIND = b'\x30'
+_SPAN_START_TIME = b'\x39'
+_SPAN_END_TIME = b'\x41'
+_SPAN_ATTRIBUTES = b'\x4a'
+_SPAN_DROPPED_ATTRIBUTES_COUNT = b'\x50'
+_SPAN_EVENTS = b'\x5a'
+_SPAN_STATUS = b'\x7a'
+_SPAN_FLAGS = b'\x85\x01'
+# Trace and span IDs are fixed size, so their tag and length are constant.
+_SPAN_TRACE_ID_PREFIX = _SPAN_TRACE_ID + b'\x10'
+_SPAN_SPAN_ID_PREFIX = _SPAN_SPAN_ID + b'\x08'
+_SPAN_PARENT_SPAN_ID_PREFIX = _SPAN_PARENT_SPAN_ID + b'\x08'
+_EVENT_TIME = b'\x09'
+_EVENT_NAME = b'\x12'
+_EVENT_ATTRIBUTES = b'\x1a'
+_EVENT_DROPPED_ATTRIBUTES_COUNT = b'\x20'
+_STATUS_MESSAGE = b'\x12'
+_STATUS_CODE = b'\x18'
+_KEY_VALUE_KEY = b'\x0a'
+_KEY_VALUE_VALUE = b'\x12'
+_VALUE_STRING = b'\x0a'
+_VALUE_BOOL = b'\x10'
+_VALUE_INT = b'\x18'
+_VALUE_DOUBLE = b'\x21'
+_VALUE_ARRAY = b'\x2a'
+_VALUE_KVLIST = b'\x32'
+_VALUE_BYTES = b'\x3a'
+_LIST_VALUES = b'\x0a'
+
+
+def encode_spans(spans: Sequence[ReadableSpan]) -> bytes:
+    """Encode spans as an OTLP ``ExportTraceServiceRequest`` message."""
+    # Spans grouped by resource and scope, each group already encoded.
+    groups: dict[Resource, dict[InstrumentationScope, bytearray]] = {}
+    last_resource = last_scope = buf = None
+    for span in spans:
+        assert span.instrumentation_scope  # noqa: S101
+        # Hashing a resource is expensive, and consecutive spans usually share both.
+        if span.resource is not last_resource or span.instrumentation_scope is not last_scope:
+            last_resource, last_scope = span.resource, span.instrumentation_scope
+            scopes = groups.setdefault(last_resource, {})
+            buf = scopes.get(last_scope)
+            if buf is None:
+                buf = scopes[last_scope] = bytearray()
+        assert buf is not None  # noqa: S101
+        encoded_span = _span(span)
+        buf += _SCOPE_SPANS_SPANS
+        buf += _size(len(encoded_span))
+        buf += encoded_span
+
+    rv = bytearray()
+    for resource, scopes in groups.items():
+        resource_spans = bytearray()
+        _field(resource_spans, _RESOURCE_SPANS_RESOURCE, _resource(resource))
+        for scope, encoded_spans in scopes.items():
+            scope_spans = bytearray()
+            _field(scope_spans, _SCOPE_SPANS_SCOPE, _scope(scope))
+            scope_spans += encoded_spans
+            _field(resource_spans, _RESOURCE_SPANS_SCOPE_SPANS, scope_spans)
+        _field(rv, _REQUEST_RESOURCE_SPANS, resource_spans)
+    return bytes(rv)
+
+
+_ONE_BYTE_VARINTS = [bytes((i,)) for i in range(0x80)]
+
+
+def _varint(value: int) -> bytes:
+    if value < 0x80:
+        return _ONE_BYTE_VARINTS[value]
+    rv = bytearray()
+    while value > 0x7F:
+        rv.append((value & 0x7F) | 0x80)
+        value >>= 7
+    rv.append(value)
+    return bytes(rv)
+
+
+_size = _varint
+
+
+def _field(buf: bytearray, tag: bytes, value: bytes | bytearray) -> None:
+    """Append a length-delimited field."""
+    buf += tag
+    buf += _size(len(value))
+    buf += value
+
+
+def _resource(resource: Resource) -> bytearray:
+    buf = bytearray()
+    _attributes(buf, resource.attributes, _RESOURCE_ATTRIBUTES, _RESOURCE_DROPPED_ATTRIBUTES_COUNT)
+    return buf
+
+
+def _scope(scope: InstrumentationScope) -> bytearray:
+    buf = bytearray()
+    _field(buf, _SCOPE_NAME, scope.name.encode())
+    if scope.version:
+        _field(buf, _SCOPE_VERSION, scope.version.encode())
+    if scope.attributes:
+        _attributes(buf, scope.attributes, _SCOPE_ATTRIBUTES, _SCOPE_DROPPED_ATTRIBUTES_COUNT)
+    return buf
+
+
+def _span(span: ReadableSpan) -> bytearray:
+    context = span.context
+    assert context  # noqa: S101
+    buf = bytearray(_SPAN_TRACE_ID_PREFIX)
+    buf += _trace_id(context.trace_id)
+    buf += _SPAN_SPAN_ID_PREFIX
+    buf += _span_id(context.span_id)
+    parent = span.parent
+    if parent:
+        buf += _SPAN_PARENT_SPAN_ID_PREFIX
+        buf += _span_id(parent.span_id)
+    _field(buf, _SPAN_NAME, span.name.encode())
+    # The OTLP enum has SPAN_KIND_UNSPECIFIED at 0, then the same order as the SDK.
+    buf += _SPAN_KIND
+    buf.append(span.kind.value + 1)
+    if span.start_time is not None:
+        buf += _SPAN_START_TIME
+        buf += _pack_fixed64(span.start_time)
+    if span.end_time is not None:
+        buf += _SPAN_END_TIME
+        buf += _pack_fixed64(span.end_time)
+    if span.attributes:
+        _attributes(buf, span.attributes, _SPAN_ATTRIBUTES, _SPAN_DROPPED_ATTRIBUTES_COUNT)
+    for event in span.events:
+        _field(buf, _SPAN_EVENTS, _event(event))
+    status = span.status
+    if status.status_code.value or status.description:
+        encoded_status = bytearray()
+        if status.description:
+            _field(encoded_status, _STATUS_MESSAGE, status.description.encode())
+        if status.status_code.value:
+            encoded_status += _STATUS_CODE
+            encoded_status.append(status.status_code.value)
+        _field(buf, _SPAN_STATUS, encoded_status)
+    buf += _SPAN_FLAGS
+    buf += _pack_fixed32(_REMOTE if parent and parent.is_remote else _LOCAL)
+    return buf
+
+
+def _event(event: Event) -> bytearray:
+    buf = bytearray()
+    buf += _EVENT_TIME
+    buf += _pack_fixed64(event.timestamp)
+    _field(buf, _EVENT_NAME, event.name.encode())
+    if event.attributes:
+        _attributes(buf, event.attributes, _EVENT_ATTRIBUTES, _EVENT_DROPPED_ATTRIBUTES_COUNT)
+    return buf
+
+
+def _trace_id(trace_id: int) -> bytes:
+    if not 0 <= trace_id < 2**128:
+        raise ValueError(f'The {trace_id=} is out of bounds')
+    return trace_id.to_bytes(16, 'big')
+
+
+def _span_id(span_id: int) -> bytes:
+    if not 0 <= span_id < 2**64:
+        raise ValueError(f'The {span_id=} is out of bounds')
+    return span_id.to_bytes(8, 'big')
+
+
+def _attributes(
+    buf: bytearray, attributes: Mapping[str, Any] | None, tag: bytes, dropped_tag: bytes
+) -> None:
+    """Append attributes as repeated KeyValue fields, skipping unsupported values."""
+    if not attributes:
+        return
+    dropped = 0
+    for key, value in attributes.items():
+        try:
+            _field(buf, tag, _key_value(key, value))
+        except ValueError:  # noqa: PERF203
+            dropped += 1
+    if dropped:
+        buf += dropped_tag
+        buf += _varint(dropped)
+
+
+def _key_value(key: str, value: Any) -> bytes:
+    encoded_key = key.encode()
+    encoded_value = _value(value)
+    return b''.join((
+        _KEY_VALUE_KEY,
+        _size(len(encoded_key)),
+        encoded_key,
+        _KEY_VALUE_VALUE,
+        _size(len(encoded_value)),
+        encoded_value,
+    ))
+
+
+def _value(value: Any) -> bytes:
+    """Encode an AnyValue message."""
+    # Exact type checks first, as they're much faster than isinstance.
+    cls = type(value)
+    if cls is str:
+        encoded = value.encode()
+        return _VALUE_STRING + _size(len(encoded)) + encoded
+    if cls is int:
+        return _VALUE_INT + _varint(value & _INT64_MASK)
+    if cls is bool:
+        return _VALUE_BOOL + _ONE_BYTE_VARINTS[value]
+    if cls is float:
+        return _VALUE_DOUBLE + _pack_double(value)
+    if cls is tuple or cls is list:
+        return _array(value)
+
+    if isinstance(value, str):
+        return _value(str(value))
+    if isinstance(value, bool):
+        return _value(bool(value))
+    if isinstance(value, int):
+        return _value(int(value))
+    if isinstance(value, float):
+        return _value(float(value))
+    if isinstance(value, bytes):
+        return _VALUE_BYTES + _size(len(value)) + value
+    if isinstance(value, Sequence):
+        return _array(value)  # type: ignore
+    if isinstance(value, Mapping):
+        values = bytearray()
+        for k, v in value.items():  # type: ignore
+            _field(values, _LIST_VALUES, _key_value(k, v))  # type: ignore
+        return _VALUE_KVLIST + _size(len(values)) + values
+    raise ValueError(f'Cannot convert attribute value of {type(value)=}')
+
+
+def _array(value: Sequence[Any]) -> bytes:
+    if len({type(v) for v in value}) > 1:
+        raise ValueError('Attribute value arrays must be homogeneous')
+    values = bytearray()
+    for v in value:
+        encoded = _value(v)
+        values += _LIST_VALUES
+        values += _size(len(encoded))
+        values += encoded
+    return _VALUE_ARRAY + _size(len(values)) + values
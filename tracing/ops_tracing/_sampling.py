@@ -0,0 +1,161 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific language
+# governing permissions and limitations under the License.
+
+"""Sampling policy for the ops-tracing extension."""
+
+from __future__ import annotations
+
+import collections
+import dataclasses
+import json
+from typing import TYPE_CHECKING, Mapping, Sequence
+
+import opentelemetry.trace
+from opentelemetry.sdk.trace import SpanLimits
+from opentelemetry.sdk.trace.sampling import Decision, Sampler, SamplingResult
+
+if TYPE_CHECKING:
+    from opentelemetry.context import Context
+    from opentelemetry.trace import Link, SpanKind
+    from opentelemetry.trace.span import TraceState
+    from opentelemetry.util.types import Attributes
+
+_TRACE_ID_LIMIT = (1 << 64) - 1
+
+
+@dataclasses.dataclass(frozen=True)
+class SamplingPolicy:
+    """How much trace data to record.
+
+    Example::
+
+        self.tracing = ops.tracing.Tracing(
+            self,
+            tracing_relation_name='charm-tracing',
+            sampling=ops.tracing.SamplingPolicy(
+                ratio=0.1,
+                span_limits={'relation-get': 20},
+                max_attribute_length=200,
+            ),
+        )
+
+    Whether a dispatch is traced is decided when it starts, before the charm
+    is initialised, so changes to ``enabled`` and ``ratio`` take effect from
+    the next dispatch. The other settings apply to spans started after the
+    ``Tracing`` object is created.
+    """
+
+    enabled: bool = True
+    """Whether to record trace data at all.
+
+    When disabled, spans aren't recorded and ops skips formatting their attributes.
+    """
+    ratio: float = 1.0
+    """The fraction of dispatches to trace, from 0.0 to 1.0."""
+    span_limits: Mapping[str, int] = dataclasses.field(default_factory=dict)
+    """The maximum number of spans with the given name to record in a dispatch.
+
+    For example, ``{'relation-get': 20}``. Children of spans over the limit
+    aren't recorded either.
+    """
+    default_span_limit: int | None = None
+    """The maximum number of spans with any other name to record in a dispatch."""
+    max_attribute_length: int | None = None
+    """Truncate string attribute values to this many characters."""
+
+    def __post_init__(self):
+        if not 0.0 <= self.ratio <= 1.0:
+            raise ValueError(f'{self.ratio=} must be between 0.0 and 1.0')
+
+    def _to_json(self) -> str:
+        return json.dumps({**dataclasses.asdict(self), 'span_limits': dict(self.span_limits)})
+
+    @classmethod
+    def _from_json(cls, data: str) -> SamplingPolicy:
+        fields = {field.name for field in dataclasses.fields(cls)}
+        return cls(**{k: v for k, v in json.loads(data).items() if k in fields})
+
+
+class PolicySampler(Sampler):
+    """An OpenTelemetry sampler that applies a :class:`SamplingPolicy`.
+
+    Every span of a dispatch is in the same trace, so the decision for the root
+    span is the head sampling decision for the whole dispatch, and other spans
+    are only recorded if their parent is.
+    """
+
+    policy: SamplingPolicy
+    span_limits: SpanLimits
+    """Limits to give the tracer provider, updated in place to cap attribute lengths."""
+
+    def __init__(self):
+        self.span_limits = SpanLimits()
+        self._default_attribute_lengths = (
+            self.span_limits.max_attribute_length,
+            self.span_limits.max_span_attribute_length,
+        )
+        self.counts: collections.Counter[str] = collections.Counter()
+        self.set_policy(SamplingPolicy())
+
+    def set_policy(self, policy: SamplingPolicy) -> None:
+        """Apply the policy to spans started from now on."""
+        self.policy = policy
+        self._bound = round(policy.ratio * (_TRACE_ID_LIMIT + 1))
+        if policy.max_attribute_length is None:
+            max_lengths = self._default_attribute_lengths
+        else:
+            max_lengths = (policy.max_attribute_length, policy.max_attribute_length)
+        self.span_limits.max_attribute_length, self.span_limits.max_span_attribute_length = (
+            max_lengths
+        )
+
+    def reset(self) -> None:
+        """Start counting spans for a new dispatch."""
+        self.counts.clear()
+
+    def should_sample(
+        self,
+        parent_context: Context | None,
+        trace_id: int,
+        name: str,
+        kind: SpanKind | None = None,
+        attributes: Attributes = None,
+        links: Sequence[Link] | None = None,
+        trace_state: TraceState | None = None,
+    ) -> SamplingResult:
+        """Decide whether to record a span."""
+        policy = self.policy
+        if not policy.enabled:
+            return SamplingResult(Decision.DROP)
+
+        parent = opentelemetry.trace.get_current_span(parent_context).get_span_context()
+        if parent.is_valid:
+            if not parent.trace_flags.sampled:
+                return SamplingResult(Decision.DROP)
+        elif trace_id & _TRACE_ID_LIMIT >= self._bound:
+            return SamplingResult(Decision.DROP)
+
+        limit = policy.span_limits.get(name, policy.default_span_limit)
+        if limit is not None:
+            if self.counts[name] >= limit:
+                return SamplingResult(Decision.DROP)
+            self.counts[name] += 1
+
+        return SamplingResult(
+            Decision.RECORD_AND_SAMPLE,
+            attributes,
+            parent.trace_state if parent.is_valid else None,
+        )
+
+    def get_description(self) -> str:
+        """Describe the sampler, for debugging."""
+        return f'PolicySampler{{{self.policy}}}'
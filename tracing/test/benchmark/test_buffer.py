@@ -0,0 +1,56 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark tests for the trace data buffer."""
+
+from __future__ import annotations
+
+import os
+import pathlib
+
+import pytest
+
+from ops_tracing import _buffer
+from ops_tracing._buffer import Buffer
+
+CHUNK_SIZE = 20_000
+MIME = 'application/json'
+
+
+def fill(path: pathlib.Path, fraction: float) -> None:
+    """Fill the buffer, with chunks from a mix of observed and unobserved dispatches."""
+    count = int(_buffer.BUFFER_SIZE * fraction) // ((CHUNK_SIZE + 4095) // 4096 * 4096)
+    buffer = Buffer(path)
+    for i in range(count):
+        if i % 10 == 0:
+            # A new dispatch, every third one observed.
+            buffer = Buffer(path)
+            if i % 30 == 0:
+                buffer.mark_observed()
+        buffer.push(os.urandom(CHUNK_SIZE), MIME)
+
+
+# Note: the 'benchmark' argument here is a fixture that pytest-benchmark
+# automatically makes available to all tests.
+@pytest.mark.parametrize('fraction', [0.1, 0.5, 1.0])
+def test_buffer_push(benchmark, tmp_path: pathlib.Path, fraction: float):
+    """Push a chunk in a new dispatch, with the buffer filled to a fraction of its capacity."""
+    path = tmp_path / 'buffer.db'
+    fill(path, fraction)
+    data = os.urandom(CHUNK_SIZE)
+
+    def push():
+        Buffer(path).push(data, MIME)
+
+    benchmark.pedantic(push, rounds=20)
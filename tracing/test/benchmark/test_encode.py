@@ -0,0 +1,71 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark tests for encoding trace data.
+
+Each benchmark reports (in ``extra_info``) the size of the encoded payload,
+and its size after gzip compression, as it's sent out.
+"""
+
+from __future__ import annotations
+
+import functools
+import gzip
+
+import pytest
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+
+from ops_tracing import _protobuf
+from ops_tracing.vendor import otlp_json
+
+ENCODERS = {'json': otlp_json.encode_spans, 'protobuf': _protobuf.encode_spans}
+
+
+@functools.lru_cache
+def dispatch_spans(count: int) -> list[ReadableSpan]:
+    """Spans like those of a busy dispatch: one per hook command or Pebble call."""
+    resource = Resource({'service.name': 'app', 'juju_unit': 'app/0', 'charm': 'app'})
+    tracer = TracerProvider(resource=resource).get_tracer('ops', '3.0.0')
+    spans: list[ReadableSpan] = []
+    with tracer.start_as_current_span('ops.main') as root:
+        for i in range(count - 1):
+            with tracer.start_as_current_span(f'relation-get-{i % 10}') as span:
+                span.set_attributes({
+                    'argv': [
+                        'relation-get',
+                        '-r',
+                        f'db:{i % 3}',
+                        '-',
+                        f'remote/{i}',
+                        '--format=json',
+                    ],
+                    'exit_code': 0,
+                    'duration': 0.01 * i,
+                })
+            spans.append(span)  # type: ignore
+    spans.append(root)  # type: ignore
+    return spans
+
+
+# Note: the 'benchmark' argument here is a fixture that pytest-benchmark
+# automatically makes available to all tests.
+@pytest.mark.parametrize('count', [1_000, 10_000, 50_000])
+@pytest.mark.parametrize('encoding', ['json', 'protobuf'])
+def test_encode_spans(benchmark, encoding: str, count: int):
+    spans = dispatch_spans(count)
+    encode = ENCODERS[encoding]
+    data = benchmark.pedantic(encode, args=(spans,), rounds=3)
+    benchmark.extra_info['payload_size'] = len(data)
+    benchmark.extra_info['gzip_size'] = len(gzip.compress(data, mtime=0))
@@ -14,16 +14,25 @@
 
 from __future__ import annotations
 
+import dataclasses
+import gzip
+import http.server
 import json
 import pathlib
 import sys
+import threading
+import time
 from typing import Generator
 
 import ops
 import ops.testing
 import pytest
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
 
 import ops_tracing
+from ops_tracing._buffer import Destination
+from ops_tracing._export import BufferingSpanExporter
+from ops_tracing.vendor import otlp_json
 
 
 @pytest.fixture
@@ -103,3 +112,88 @@ def sample_charm() -> Generator[type[ops.CharmBase]]:
 
     yield SampleCharm
     sys.path.remove(extra)
+
+
+@dataclasses.dataclass
+class Collector:
+    """A local stand-in for a tracing collector, which records what it receives."""
+
+    url: str
+    requests: list[tuple[dict[str, str], bytes]] = dataclasses.field(default_factory=list)
+    """The headers and (decompressed) body of each request."""
+    wire_bytes: int = 0
+    """The number of body bytes received, as sent."""
+    connections: int = 0
+    status: int = 200
+    keep_alive: bool = True
+    delay: float = 0
+    """Seconds to wait before responding, to simulate a slow collector."""
+
+
+@pytest.fixture
+def collector() -> Generator[Collector]:
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def setup(self):
+            super().setup()
+            collector.connections += 1
+
+        def do_POST(self):  # noqa: N802
+            body = self.rfile.read(int(self.headers['Content-Length']))
+            collector.wire_bytes += len(body)
+            if self.headers.get('Content-Encoding') == 'gzip':
+                body = gzip.decompress(body)
+            collector.requests.append((dict(self.headers), body))
+            time.sleep(collector.delay)
+            self.send_response(collector.status)
+            self.send_header('Content-Length', '0')
+            if not collector.keep_alive:
+                self.send_header('Connection', 'close')
+            self.end_headers()
+
+        def log_message(self, format: str, *args: object):  # noqa: A002
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    collector = Collector(f'http://127.0.0.1:{server.server_address[1]}/v1/traces')
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield collector
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+BACKLOG = 100
+
+
+def make_spans(count: int) -> list[ReadableSpan]:
+    tracer = TracerProvider().get_tracer('test')
+    spans: list[ReadableSpan] = []
+    for i in range(count):
+        span = tracer.start_span(f'span{i}', attributes={'index': i, 'padding': 'x' * 100})
+        span.end()
+        spans.append(span)  # type: ignore
+    return spans
+
+
+@pytest.fixture
+def exporter(tmp_path: pathlib.Path, collector: Collector):
+    """An exporter with a backlog of trace data from dispatches when the collector was down."""
+    exporter = BufferingSpanExporter(tmp_path / 'buffer')
+    for _ in range(BACKLOG):
+        exporter.buffer.pushpop((otlp_json.encode_spans(make_spans(10)), otlp_json.CONTENT_TYPE))
+    exporter.buffer.save_destination(Destination(collector.url, None))
+    yield exporter
+    exporter.shutdown()
+
+
+def span_names(body: bytes) -> list[str]:
+    return [
+        span['name']
+        for resource_spans in json.loads(body)['resourceSpans']
+        for scope_spans in resource_spans['scopeSpans']
+        for span in scope_spans['spans']
+    ]
@@ -14,19 +14,27 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 import opentelemetry.trace
 import ops
 
+if TYPE_CHECKING:
+    from ops_tracing import SamplingPolicy
+
 tracer = opentelemetry.trace.get_tracer('sample charm')
 
 
 class SampleCharm(ops.CharmBase):
+    sampling: SamplingPolicy | None = None
+
     def __init__(self, framework: ops.Framework):
         super().__init__(framework)
         self.tracing = ops.tracing.Tracing(
             self,
             tracing_relation_name='charm-tracing',
             ca_relation_name='receive-ca-cert',
+            sampling=self.sampling,
         )
         self.framework.observe(self.on.collect_app_status, self._on_collect_status)
         self.framework.observe(self.on.collect_unit_status, self._on_collect_status)
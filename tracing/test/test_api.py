@@ -20,6 +20,9 @@ import ops
 import ops.testing
 import pytest
 
+import ops_tracing
+from ops_tracing import _backend
+
 _pydantic = pytest.importorskip('pydantic')
 
 pytestmark = pytest.mark.filterwarnings('ignore::pydantic.PydanticDeprecatedSince20')
@@ -45,7 +48,7 @@ def test_no_tracing_destination(sample_charm: type[ops.CharmBase], mock_destinat
     ctx = ops.testing.Context(sample_charm)
     state = ops.testing.State()
     ctx.run(ctx.on.start(), state)
-    mock_destination.assert_called_with(url=None, ca=None)
+    mock_destination.assert_called_with(url=None, ca=None, mime=None)
 
 
 def test_http_tracing_destination(
@@ -54,7 +57,9 @@ def test_http_tracing_destination(
     ctx = ops.testing.Context(sample_charm)
     state = ops.testing.State(relations={http_relation})
     ctx.run(ctx.on.relation_changed(http_relation), state)
-    mock_destination.assert_called_with(url='http://tracing.example:4318/v1/traces', ca=None)
+    mock_destination.assert_called_with(
+        url='http://tracing.example:4318/v1/traces', ca=None, mime=None
+    )
 
 
 @pytest.mark.parametrize('relation_to_poke', [0, 1])
@@ -68,4 +73,16 @@ def test_https_tracing_destination(
     ctx = ops.testing.Context(sample_charm)
     state = ops.testing.State(relations={https_relation, ca_relation})
     ctx.run(ctx.on.relation_changed([https_relation, ca_relation][relation_to_poke]), state)
-    mock_destination.assert_called_with(url='https://tls.example/v1/traces', ca='FIRST\nSECOND')
+    mock_destination.assert_called_with(
+        url='https://tls.example/v1/traces', ca='FIRST\nSECOND', mime=None
+    )
+
+
+def test_sampling_policy(sample_charm: type[ops.CharmBase], monkeypatch: pytest.MonkeyPatch):
+    policy = ops_tracing.SamplingPolicy(ratio=0.5, max_attribute_length=100)
+    monkeypatch.setattr(sample_charm, 'sampling', policy)
+    mock_set_policy = Mock()
+    monkeypatch.setattr(_backend, 'set_sampling_policy', mock_set_policy)
+    ctx = ops.testing.Context(sample_charm)
+    ctx.run(ctx.on.start(), ops.testing.State())
+    mock_set_policy.assert_called_with(policy)
@@ -60,6 +60,19 @@ def test_set_destination_invalid_url(setup_tracing: None, url: str):
         ops_tracing.set_destination(url, None)
 
 
+def test_set_destination_protobuf(setup_tracing: None):
+    assert _backend._exporter
+    ops_tracing.set_destination('http://example.com', None, 'application/x-protobuf')
+    assert _backend._exporter.buffer.load_destination() == Destination(
+        'http://example.com', None, 'application/x-protobuf'
+    )
+
+
+def test_set_destination_invalid_mime(setup_tracing: None):
+    with pytest.raises(ValueError):
+        ops_tracing.set_destination('http://example.com', None, 'text/plain')
+
+
 def test_juju_topology_labels(setup_tracing: None):
     get_tracer_provider()
     assert {**get_tracer_provider()._resource._attributes} == {  # type: ignore
@@ -15,7 +15,11 @@
 from __future__ import annotations
 
 import pathlib
+import sqlite3
 
+import pytest
+
+from ops_tracing import _buffer
 from ops_tracing._buffer import OBSERVED_PRIORITY, Buffer  # type: ignore
 
 
@@ -71,3 +75,98 @@ def test_mark_observed_missing_ids(tmp_path: pathlib.Path):
         assert priorities == {1: OBSERVED_PRIORITY, 2: OBSERVED_PRIORITY}
         assert buf.observed is True
         assert not buf.ids
+
+
+def stored_sizes(buf: Buffer) -> tuple[int, int]:
+    """Return the running total of stored data size, and the actual total."""
+    with buf.tx(readonly=True) as conn:
+        (running,) = conn.execute("SELECT value FROM settings WHERE key = 'stored'").fetchone()
+        (actual,) = conn.execute(
+            'SELECT total((length(data)+4095)/4096*4096) FROM tracing'
+        ).fetchone()
+    return int(running), int(actual)
+
+
+def test_pushpop_evicts_boring_data_first(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(_buffer, 'BUFFER_SIZE', 10 * 4096)
+    buf = Buffer(tmp_path / 'db')
+    for i in range(4):
+        buf.pushpop((b'boring%d' % i, 'text/plain'))
+    buf.mark_observed()
+    for i in range(4):
+        buf.pushpop((b'important%d' % i, 'text/plain'))
+
+    # The buffer is full, so the oldest boring data is dropped.
+    buf.pushpop((b'important4', 'text/plain'))
+    buf.pushpop((b'x' * 4097, 'text/plain'))
+
+    with buf.tx(readonly=True) as conn:
+        data = [row[0] for row in conn.execute('SELECT data FROM tracing ORDER BY id')]
+    assert data == [
+        b'boring2',
+        b'boring3',
+        *(b'important%d' % i for i in range(5)),
+        b'x' * 4097,
+    ]
+    assert stored_sizes(buf) == (9 * 4096, 9 * 4096)
+
+
+def test_stored_size_running_total(tmp_path: pathlib.Path):
+    buf = Buffer(tmp_path / 'db')
+    for i in range(5):
+        buf.pushpop((b'x' * 5000 * i or b'x', 'text/plain'))
+    assert buf.stored == stored_sizes(buf)[1]
+
+    buf.remove(*[id_ for id_, _, _ in buf.oldest(10000)])
+
+    # A new dispatch reads the total, rather than adding up the data.
+    buf = Buffer(tmp_path / 'db')
+    running, actual = stored_sizes(buf)
+    assert running == actual
+    buf.pushpop((b'more', 'text/plain'))
+    assert buf.stored == actual + 4096
+
+
+def test_migrate_buffer_without_size(tmp_path: pathlib.Path):
+    path = tmp_path / 'db'
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            'CREATE TABLE tracing (id INTEGER PRIMARY KEY, priority INTEGER NOT NULL,'
+            ' data BLOB NOT NULL, mime TEXT NOT NULL)'
+        )
+        conn.execute('CREATE INDEX tracing_priority_id ON tracing (priority, id)')
+        conn.execute(
+            "INSERT INTO tracing (priority, data, mime) VALUES (10, ?, 'text/plain')",
+            (b'x' * 5000,),
+        )
+    conn.close()
+
+    buf = Buffer(path)
+    buf.pushpop((b'new', 'text/plain'))
+
+    assert stored_sizes(buf) == (3 * 4096, 3 * 4096)
+    with buf.tx(readonly=True) as conn:
+        assert [row[0] for row in conn.execute('SELECT size FROM tracing ORDER BY id')] == [
+            8192,
+            4096,
+        ]
+
+
+def test_oldest_important_first(tmp_path: pathlib.Path):
+    buf = Buffer(tmp_path / 'db')
+    buf.push(b'boring', 'text/plain')
+    buf.observed = True
+    buf.push(b'important1', 'text/plain')
+    buf.push(b'important2', 'text/plain')
+
+    assert [data for _, data, _ in buf.oldest(10000)] == [b'important1', b'important2']
+    with buf.tx(readonly=True) as conn:
+        plan = ' '.join(
+            row[-1]
+            for row in conn.execute(
+                'EXPLAIN QUERY PLAN SELECT id, data, mime FROM tracing'
+                ' WHERE priority = (SELECT max(priority) FROM tracing) ORDER BY id ASC'
+            )
+        )
+    # Served by the index, without sorting the data.
+    assert 'TEMP B-TREE' not in plan
@@ -0,0 +1,98 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import pytest
+
+from ops_tracing import _export, _protobuf
+from ops_tracing._buffer import Destination
+from ops_tracing._export import BufferingSpanExporter
+from ops_tracing.vendor import otlp_json
+
+from .conftest import BACKLOG, Collector, make_spans, span_names
+
+
+def test_export_merges_backlog(exporter: BufferingSpanExporter, collector: Collector):
+    exporter.export(make_spans(1))
+
+    assert exporter.buffer.oldest(_export.MAX_REQUEST_SIZE) == []
+    assert len(collector.requests) == 1
+    headers, body = collector.requests[0]
+    assert headers['Content-Type'] == otlp_json.CONTENT_TYPE
+    assert headers['Content-Encoding'] == 'gzip'
+    assert len(span_names(body)) == BACKLOG * 10 + 1
+    assert collector.wire_bytes < len(body) / 5
+
+
+def test_export_keeps_connection_alive(
+    exporter: BufferingSpanExporter, collector: Collector, monkeypatch: pytest.MonkeyPatch
+):
+    chunk_size = len(exporter.buffer.oldest(0)[0][1])
+    monkeypatch.setattr(_export, 'MAX_REQUEST_SIZE', chunk_size * 10)
+
+    exporter.export(make_spans(1))
+    exporter.export(make_spans(1))
+
+    # Up to SENDOUT_FACTOR requests for each export, with 10 chunks in each.
+    assert [len(span_names(body)) for _, body in collector.requests] == [100] * 10 + [2]
+    assert collector.connections == 1
+
+
+def test_export_reconnects(
+    exporter: BufferingSpanExporter, collector: Collector, monkeypatch: pytest.MonkeyPatch
+):
+    chunk_size = len(exporter.buffer.oldest(0)[0][1])
+    monkeypatch.setattr(_export, 'MAX_REQUEST_SIZE', chunk_size * 10)
+    collector.keep_alive = False
+
+    exporter.export(make_spans(1))
+
+    assert len(collector.requests) == _export.SENDOUT_FACTOR
+    assert collector.connections == _export.SENDOUT_FACTOR
+
+
+@pytest.mark.parametrize('status', [400, 500])
+def test_export_rejected(exporter: BufferingSpanExporter, collector: Collector, status: int):
+    collector.status = status
+
+    exporter.export(make_spans(1))
+
+    # The data is kept, to send again later.
+    assert len(collector.requests) == 1
+    assert len(exporter.buffer.oldest(_export.MAX_REQUEST_SIZE)) > 1
+
+
+def test_export_unreachable(exporter: BufferingSpanExporter, collector: Collector):
+    exporter.buffer.save_destination(Destination('http://127.0.0.1:9/', None))
+
+    exporter.export(make_spans(1))
+
+    assert collector.requests == []
+    assert len(exporter.buffer.oldest(_export.MAX_REQUEST_SIZE)) > 1
+
+
+def test_export_protobuf(exporter: BufferingSpanExporter, collector: Collector):
+    exporter.buffer.save_destination(Destination(collector.url, None, _protobuf.CONTENT_TYPE))
+    spans = make_spans(3)
+
+    exporter.export(spans)
+
+    # The backlog was encoded before the destination changed, and is sent as it was.
+    assert [headers['Content-Type'] for headers, _ in collector.requests] == [
+        otlp_json.CONTENT_TYPE,
+        _protobuf.CONTENT_TYPE,
+    ]
+    assert len(span_names(collector.requests[0][1])) == BACKLOG * 10
+    assert collector.requests[1][1] == _protobuf.encode_spans(spans)
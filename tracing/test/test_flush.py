@@ -0,0 +1,94 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import fcntl
+import pathlib
+import time
+from unittest.mock import patch
+
+import ops_tracing
+from ops_tracing import _backend, _export, _flush
+from ops_tracing._export import BufferingSpanExporter
+
+from .conftest import BACKLOG, Collector, make_spans, span_names
+
+
+def test_background_export_only_buffers(exporter: BufferingSpanExporter, collector: Collector):
+    collector.delay = 5
+    exporter.background = True
+
+    start = time.monotonic()
+    exporter.export(make_spans(1))
+
+    assert time.monotonic() - start < 1
+    assert not collector.requests
+    assert len(exporter.buffer.oldest(_export.MAX_REQUEST_SIZE)) == BACKLOG + 1
+
+
+def test_flush(exporter: BufferingSpanExporter, collector: Collector):
+    assert _flush.flush(exporter.buffer.path)
+
+    assert exporter.buffer.oldest(_export.MAX_REQUEST_SIZE) == []
+    assert sum(len(span_names(body)) for _, body in collector.requests) == BACKLOG * 10
+
+
+def test_flush_already_running(exporter: BufferingSpanExporter, collector: Collector):
+    lock_path = exporter.buffer.path.with_name(f'{exporter.buffer.path.name}.lock')
+    with lock_path.open('w') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        assert not _flush.flush(exporter.buffer.path)
+
+    assert not collector.requests
+    assert len(exporter.buffer.oldest(_export.MAX_REQUEST_SIZE)) == BACKLOG
+
+
+def test_spawn_with_slow_collector(exporter: BufferingSpanExporter, collector: Collector):
+    collector.delay = 1
+
+    start = time.monotonic()
+    _flush.spawn(exporter.buffer.path)
+    assert time.monotonic() - start < collector.delay
+
+    deadline = time.monotonic() + 30
+    while exporter.buffer.oldest(_export.MAX_REQUEST_SIZE):
+        assert time.monotonic() < deadline, 'The flusher did not drain the buffer'
+        time.sleep(0.1)
+    assert sum(len(span_names(body)) for _, body in collector.requests) == BACKLOG * 10
+
+
+def test_shutdown_spawns_flusher(setup_tracing: None, collector: Collector):
+    assert _backend._exporter
+    ops_tracing.set_destination(collector.url, None)
+    _backend.set_background_export(True)
+    try:
+        with patch.object(_flush, 'spawn') as mock_spawn:
+            ops_tracing._shutdown()
+    finally:
+        _backend.set_background_export(False)
+
+    mock_spawn.assert_called_once_with(_backend._exporter.buffer.path)
+    assert not collector.requests
+
+
+def test_shutdown_without_destination(setup_tracing: None, tmp_path: pathlib.Path):
+    _backend.set_background_export(True)
+    try:
+        with patch.object(_flush, 'spawn') as mock_spawn:
+            ops_tracing._shutdown()
+    finally:
+        _backend.set_background_export(False)
+
+    mock_spawn.assert_not_called()
@@ -0,0 +1,206 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import json
+import struct
+from typing import Any
+
+import pytest
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.trace import SpanKind, StatusCode
+
+from ops_tracing import _protobuf
+from ops_tracing.vendor import otlp_json
+
+
+def fields(data: bytes) -> list[tuple[int, Any]]:
+    """Decode one level of a protobuf message into (field number, raw value) pairs."""
+    rv: list[tuple[int, Any]] = []
+    pos = 0
+
+    def varint() -> int:
+        nonlocal pos
+        value = shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            value |= (byte & 0x7F) << shift
+            shift += 7
+            if byte < 0x80:
+                return value
+
+    while pos < len(data):
+        key = varint()
+        number, wire_type = key >> 3, key & 7
+        if wire_type == 0:
+            rv.append((number, varint()))
+        elif wire_type == 1:
+            rv.append((number, data[pos : pos + 8]))
+            pos += 8
+        elif wire_type == 5:
+            rv.append((number, data[pos : pos + 4]))
+            pos += 4
+        else:
+            assert wire_type == 2
+            size = varint()
+            rv.append((number, data[pos : pos + size]))
+            pos += size
+    return rv
+
+
+def to_json(data: bytes) -> dict[str, Any]:
+    """Convert an encoded request to the structure the OTLP/JSON encoder produces."""
+
+    def value(data: bytes) -> dict[str, Any]:
+        ((number, raw),) = fields(data)
+        if number == 1:
+            return {'stringValue': raw.decode()}
+        if number == 2:
+            return {'boolValue': bool(raw)}
+        if number == 3:
+            return {'intValue': str(raw - 2**64 if raw >= 2**63 else raw)}
+        if number == 4:
+            return {'doubleValue': struct.unpack('<d', raw)[0]}
+        assert number == 5
+        return {'arrayValue': {'values': [value(v) for _, v in fields(raw)]}}
+
+    def attributes(data: bytes, number: int) -> list[dict[str, Any]]:
+        rv: list[dict[str, Any]] = []
+        for n, raw in fields(data):
+            if n == number:
+                kv = dict(fields(raw))
+                rv.append({'key': kv[1].decode(), 'value': value(kv[2])})
+        return rv
+
+    def span(data: bytes) -> dict[str, Any]:
+        f = dict(fields(data))
+        rv: dict[str, Any] = {
+            'name': f[5].decode(),
+            'kind': f[6],
+            'traceId': f[1].hex(),
+            'spanId': f[2].hex(),
+            'flags': struct.unpack('<I', f[16])[0],
+            'startTimeUnixNano': str(struct.unpack('<Q', f[7])[0]),
+            'endTimeUnixNano': str(struct.unpack('<Q', f[8])[0]),
+            'status': {},
+        }
+        if 15 in f:
+            status = dict(fields(f[15]))
+            if 3 in status:
+                rv['status']['code'] = status[3]
+            if 2 in status:
+                rv['status']['message'] = status[2].decode()
+        if attrs := attributes(data, 9):
+            rv['attributes'] = attrs
+        if 4 in f:
+            rv['parentSpanId'] = f[4].hex()
+        events = [
+            {
+                'name': dict(fields(e))[2].decode(),
+                'timeUnixNano': str(struct.unpack('<Q', dict(fields(e))[1])[0]),
+                **({'attributes': attributes(e, 3)} if attributes(e, 3) else {}),
+            }
+            for n, e in fields(data)
+            if n == 11
+        ]
+        if events:
+            rv['events'] = events
+        return rv
+
+    resource_spans: list[dict[str, Any]] = []
+    for _, rs in fields(data):
+        scope_spans: list[dict[str, Any]] = []
+        resource: dict[str, Any] = {}
+        for n, raw in fields(rs):
+            if n == 1:
+                if attrs := attributes(raw, 1):
+                    resource['attributes'] = attrs
+            else:
+                scope = dict(fields(dict(fields(raw))[1]))
+                scope_json = {'name': scope[1].decode()}
+                if 2 in scope:
+                    scope_json['version'] = scope[2].decode()
+                spans = [span(s) for n, s in fields(raw) if n == 2]
+                scope_spans.append({'scope': scope_json, 'spans': spans})
+        resource_spans.append({'resource': resource, 'scopeSpans': scope_spans})
+    return {'resourceSpans': resource_spans}
+
+
+@pytest.fixture
+def spans() -> list[ReadableSpan]:
+    provider = TracerProvider(resource=Resource({'service.name': 'app', 'unit': 42}))
+    tracer = provider.get_tracer('ops', '3.0')
+    rv: list[ReadableSpan] = []
+    with tracer.start_as_current_span('parent') as parent:
+        parent.set_attributes({
+            'str': 'value',
+            'unicode': 'héllo',
+            'int': 2**40,
+            'negative': -1,
+            'float': 0.5,
+            'bool': True,
+            'list': [1, 2, 3],
+            'long': 'x' * 300,
+        })
+        parent.add_event('event', {'count': 1})
+        with tracer.start_as_current_span('child') as child:
+            child.set_status(StatusCode.ERROR, 'failed')
+        rv.append(child)  # type: ignore
+    rv.append(parent)  # type: ignore
+    other = provider.get_tracer('lib')
+    with other.start_as_current_span('lib') as span:
+        pass
+    rv.append(span)  # type: ignore
+    return rv
+
+
+def test_encode_spans_like_json(spans: list[ReadableSpan]):
+    expected = json.loads(otlp_json.encode_spans(spans))
+    actual = to_json(_protobuf.encode_spans(spans))
+
+    def by_scope(request: dict[str, Any]):
+        return {
+            ss['scope']['name']: ss for rs in request['resourceSpans'] for ss in rs['scopeSpans']
+        }
+
+    assert actual['resourceSpans'][0]['resource'] == expected['resourceSpans'][0]['resource']
+    assert by_scope(actual) == by_scope(expected)
+
+
+def test_encode_span_kind():
+    tracer = TracerProvider().get_tracer('test')
+    with tracer.start_as_current_span('server', kind=SpanKind.SERVER) as span:
+        pass
+
+    request = to_json(_protobuf.encode_spans([span]))  # type: ignore
+    # SPAN_KIND_SERVER in the OTLP protocol.
+    assert request['resourceSpans'][0]['scopeSpans'][0]['spans'][0]['kind'] == 2
+
+
+def test_encoded_requests_merge_by_concatenation(spans: list[ReadableSpan]):
+    merged = to_json(_protobuf.encode_spans(spans[:2]) + _protobuf.encode_spans(spans[2:]))
+    names = [
+        span['name']
+        for rs in merged['resourceSpans']
+        for ss in rs['scopeSpans']
+        for span in ss['spans']
+    ]
+    assert names == ['child', 'parent', 'lib']
+
+
+def test_encode_no_spans():
+    assert _protobuf.encode_spans([]) == b''
@@ -0,0 +1,137 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import ops
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from ops_tracing import _backend
+from ops_tracing._sampling import PolicySampler, SamplingPolicy
+
+
+@pytest.fixture
+def sampler() -> PolicySampler:
+    return PolicySampler()
+
+
+@pytest.fixture
+def exporter(sampler: PolicySampler) -> InMemorySpanExporter:
+    return InMemorySpanExporter()
+
+
+@pytest.fixture
+def tracer(sampler: PolicySampler, exporter: InMemorySpanExporter):
+    provider = TracerProvider(sampler=sampler, span_limits=sampler.span_limits)
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return provider.get_tracer('test')
+
+
+def dispatch(tracer: ...) -> None:
+    """Create spans like a dispatch does."""
+    with tracer.start_as_current_span('ops.main'):
+        for _ in range(5):
+            with tracer.start_as_current_span('relation-get'):  # noqa: SIM117
+                with tracer.start_as_current_span('nested'):
+                    pass
+        with tracer.start_as_current_span('pebble push') as span:
+            span.set_attribute('path', 'x' * 100)
+
+
+def span_names(exporter: InMemorySpanExporter) -> list[str]:
+    return [span.name for span in exporter.get_finished_spans()]
+
+
+def test_default_policy(tracer: ..., exporter: InMemorySpanExporter):
+    dispatch(tracer)
+
+    assert len(span_names(exporter)) == 12
+
+
+def test_disabled(tracer: ..., sampler: PolicySampler, exporter: InMemorySpanExporter):
+    sampler.set_policy(SamplingPolicy(enabled=False))
+
+    with tracer.start_as_current_span('ops.main') as span:
+        assert not span.is_recording()
+    dispatch(tracer)
+
+    assert span_names(exporter) == []
+
+
+@pytest.mark.parametrize('ratio', [0.0, 0.5, 1.0])
+def test_head_sampling(
+    tracer: ..., sampler: PolicySampler, exporter: InMemorySpanExporter, ratio: float
+):
+    sampler.set_policy(SamplingPolicy(ratio=ratio))
+
+    for _ in range(200):
+        dispatch(tracer)
+
+    # Whole dispatches are sampled, never parts of one.
+    names = span_names(exporter)
+    assert len(names) % 12 == 0
+    sampled = names.count('ops.main')
+    assert sampled == {0.0: 0, 1.0: 200}.get(ratio, sampled)
+    assert 50 < sampled < 150 or ratio != 0.5
+
+
+def test_span_limits(tracer: ..., sampler: PolicySampler, exporter: InMemorySpanExporter):
+    sampler.set_policy(SamplingPolicy(span_limits={'relation-get': 2}, default_span_limit=3))
+
+    dispatch(tracer)
+
+    # Spans under a span over the limit are not recorded either.
+    names = span_names(exporter)
+    assert names.count('relation-get') == 2
+    assert names.count('nested') == 2
+    assert names.count('pebble push') == 1
+
+    sampler.reset()
+    dispatch(tracer)
+    assert span_names(exporter).count('relation-get') == 4
+
+
+def test_max_attribute_length(tracer: ..., sampler: PolicySampler, exporter: InMemorySpanExporter):
+    sampler.set_policy(SamplingPolicy(max_attribute_length=10))
+    dispatch(tracer)
+    sampler.set_policy(SamplingPolicy())
+    dispatch(tracer)
+
+    capped, uncapped = [
+        span.attributes['path']  # type: ignore
+        for span in exporter.get_finished_spans()
+        if span.name == 'pebble push'
+    ]
+    assert capped == 'x' * 10
+    assert uncapped == 'x' * 100
+
+
+def test_invalid_ratio():
+    with pytest.raises(ValueError):
+        SamplingPolicy(ratio=1.5)
+
+
+def test_policy_saved_for_next_dispatch(setup_tracing: None, juju_context: ops.JujuContext):
+    policy = SamplingPolicy(ratio=0.25, span_limits={'relation-get': 10})
+    try:
+        _backend.set_sampling_policy(policy)
+        assert _backend._sampler.policy == policy
+
+        _backend._sampler.set_policy(SamplingPolicy())
+        assert _backend._load_sampling_policy() == policy
+    finally:
+        _backend.set_sampling_policy(SamplingPolicy())